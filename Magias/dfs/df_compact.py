@@ -0,0 +1,192 @@
+"""Compact representation of the spells DataFrame.
+
+The list columns (e.g. 'escola' and 'tags') are stored as python lists in
+object columns, and some scalar columns (e.g. 'source') have only a few
+possible values. Since all the possible values are listed in `spells_values`,
+the spells DataFrame can be compacted:
+- each list column becomes an integer bitmask, where the bit `i` is set if
+the list contains the `i`-th possible value (or a set of boolean columns, one
+per possible value);
+- the scalar enum columns become pandas Categoricals.
+
+This reduces the memory per row and makes membership tests vectorized (see
+`contains_any`). Use `expand_spells_df` to go back to the lists, e.g. before
+printing the spells.
+"""
+
+# Python Standard Libraries
+from typing import Any
+
+# Third Party Libraries
+import pandas as pd
+
+# Local Folder Libraries
+from .spells_values import (
+    classes_possible_values,
+    dmg_effect_possible_values,
+    elementos_possible_values,
+    escola_possible_values,
+    source_possible_values,
+    tags_possible_values,
+)
+
+LIST_COLUMNS_POSSIBLE_VALUES = {
+    "escola": escola_possible_values,
+    "elementos": elementos_possible_values,
+    "classes": classes_possible_values,
+    "tags": tags_possible_values,
+}
+# None means that the categories are inferred from the values. Values which
+# aren't possible are appended to the categories.
+CATEGORICAL_COLUMNS_POSSIBLE_VALUES = {
+    "source": source_possible_values,
+    "dmg_effect": dmg_effect_possible_values,
+    "attack_save": None,
+}
+BOOLEAN_COLUMN_SEPARATOR = ":"
+
+
+def compact_spells_df(
+    spells_df: pd.DataFrame, boolean_columns: bool = False
+) -> pd.DataFrame:
+    """Return the compact representation of the spells DataFrame.
+
+    Parameters
+    ----------
+    spells_df : pd.DataFrame
+        The spells DataFrame, with the schema asserted.
+    boolean_columns : bool, default=False
+        If True, each list column becomes a set of boolean columns named
+        'column:value' instead of a bitmask column.
+    """
+    compact_df = spells_df.copy()
+
+    for column, possible_values in LIST_COLUMNS_POSSIBLE_VALUES.items():
+        if column not in compact_df.columns:
+            continue
+        bitmask = to_bitmask(compact_df[column], possible_values)
+        if not boolean_columns:
+            compact_df[column] = bitmask
+            continue
+
+        position = compact_df.columns.get_loc(column)
+        compact_df = compact_df.drop(columns=column)
+        for bit, value in enumerate(possible_values):
+            compact_df.insert(
+                position + bit,
+                f"{column}{BOOLEAN_COLUMN_SEPARATOR}{value}",
+                (bitmask & (1 << bit)) != 0,
+            )
+
+    for column, categories in CATEGORICAL_COLUMNS_POSSIBLE_VALUES.items():
+        if column not in compact_df.columns:
+            continue
+        if categories is not None:
+            # keep the invalid values too, so the conversion is lossless
+            invalid_values = set(compact_df[column]) - set(categories)
+            categories = categories + sorted(invalid_values)
+        compact_df[column] = pd.Categorical(
+            compact_df[column], categories=categories
+        )
+
+    return compact_df
+
+
+def expand_spells_df(compact_df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a compact spells DataFrame back into lists and strings.
+
+    The lists values are in the same order as their possible values in
+    `spells_values`, which might not be their original order.
+    """
+    spells_df = compact_df.copy()
+
+    for column, possible_values in LIST_COLUMNS_POSSIBLE_VALUES.items():
+        boolean_columns = [
+            f"{column}{BOOLEAN_COLUMN_SEPARATOR}{value}"
+            for value in possible_values
+        ]
+        if column in spells_df.columns:
+            spells_df[column] = from_bitmask(spells_df[column], possible_values)
+        elif set(boolean_columns).issubset(spells_df.columns):
+            bitmask = pd.Series(0, index=spells_df.index, dtype="int64")
+            for bit, boolean_column in enumerate(boolean_columns):
+                is_set = spells_df[boolean_column].astype("int64")
+                bitmask |= is_set * (1 << bit)
+            position = spells_df.columns.get_loc(boolean_columns[0])
+            spells_df = spells_df.drop(columns=boolean_columns)
+            spells_df.insert(
+                position, column, from_bitmask(bitmask, possible_values)
+            )
+
+    for column in CATEGORICAL_COLUMNS_POSSIBLE_VALUES:
+        if column in spells_df.columns:
+            spells_df[column] = spells_df[column].astype("str")
+
+    return spells_df
+
+
+def to_bitmask(series: pd.Series, possible_values: list[Any]) -> pd.Series:
+    """Convert a Series of lists into a Series of integer bitmasks.
+
+    The bit `i` of a bitmask is set if its list contains possible_values[i].
+    Raises a ValueError if any list has a value that isn't possible.
+    """
+    exploded = pd.Series(series.to_numpy()).explode().dropna()
+
+    invalid_values = set(exploded) - set(possible_values)
+    if invalid_values:
+        raise ValueError(
+            f"Column '{series.name}' has invalid values: {invalid_values}."
+        )
+
+    value_bits = {value: 1 << bit for bit, value in enumerate(possible_values)}
+    # drop repeated values in a list, so their bits are summed only once
+    pairs = pd.DataFrame(
+        {"row": exploded.index, "value": exploded.to_numpy()}
+    ).drop_duplicates()
+    bitmask = (
+        pairs["value"]
+        .map(value_bits)
+        .groupby(pairs["row"])
+        .sum()
+        .reindex(range(len(series)), fill_value=0)
+        .astype("int64")
+    )
+    bitmask.index = series.index
+    bitmask.name = series.name
+    return bitmask
+
+
+def from_bitmask(bitmask: pd.Series, possible_values: list[Any]) -> pd.Series:
+    """Convert a Series of integer bitmasks back into a Series of lists."""
+    lists = {
+        mask: [
+            value
+            for bit, value in enumerate(possible_values)
+            if mask & (1 << bit)
+        ]
+        for mask in bitmask.unique()
+    }
+    # copy the lists, so the rows don't share the same list
+    return bitmask.map(lambda mask: list(lists[mask])).astype("object")
+
+
+def get_bitmask(values: list[Any], possible_values: list[Any]) -> int:
+    """Return the bitmask of a list of values."""
+    bitmask = 0
+    for value in values:
+        bitmask |= 1 << possible_values.index(value)
+    return bitmask
+
+
+def contains_any(
+    compact_df: pd.DataFrame, column: str, values: Any | list[Any]
+) -> pd.Series:
+    """Return whether the list column of each row contains any of the values.
+
+    The column must be a bitmask column of a compact spells DataFrame.
+    """
+    if not isinstance(values, list):
+        values = [values]
+    bitmask = get_bitmask(values, LIST_COLUMNS_POSSIBLE_VALUES[column])
+    return (compact_df[column] & bitmask) != 0
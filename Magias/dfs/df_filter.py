@@ -1,11 +1,15 @@
 """Filter any DataFrame using different filters."""
 
 # Python Standard Libraries
+from concurrent.futures import ThreadPoolExecutor
 import json
 from typing import Any
 
 # Third Party Libraries
+from dfs.df_index import normalize_filter_value, SpellsIndex
+from dfs.df_query import get_query_mask, LIST_COLUMNS
 import dfs.df_reader as reader
+import numpy as np
 import pandas as pd
 
 
@@ -19,7 +23,9 @@ class DFFilter:
 
     @staticmethod
     def filter_df(
-        df: pd.DataFrame, filter_dict: dict[str, Any]
+        df: pd.DataFrame,
+        filter_dict: dict[str, Any],
+        index: SpellsIndex | None = None,
     ) -> pd.DataFrame:
         """Filter a DataFrame using a dictionary of filters.
 
@@ -32,22 +38,31 @@ class DFFilter:
                 ...
                 "column_nameN": "filter_valueN",
             }
+
+        The filter is compiled into a `FilterPlan` (see `compile_filter`). If
+        the inverted `index` of the DataFrame is given (see
+        `df_index.SpellsIndex`), the indexed columns are filtered using it,
+        and repeated filters are cached. Otherwise, the columns are scanned.
         """
-        for column, filter_value in filter_dict.items():
-            is_list_column = isinstance(df[column].iloc[0], list)
-            if is_list_column:
-                df = DFFilter._filter_list_column(df, column, filter_value)
-            else:
-                df = DFFilter._filter_value_column(df, column, filter_value)
+        return DFFilter.compile_filter(filter_dict).apply(df, index)
+
+    @staticmethod
+    def compile_filter(filter_dict: dict[str, Any]) -> "FilterPlan":
+        """Compile a dictionary of filters into a reusable `FilterPlan`.
 
-        return df
+        The filter_dict must have the same format as in `filter_df`.
+        """
+        return FilterPlan(filter_dict)
 
     @staticmethod
-    def filter_df_using_json(df: pd.DataFrame, json_path: str) -> pd.DataFrame:
+    def filter_df_using_json(
+        df: pd.DataFrame, json_path: str, index: SpellsIndex | None = None
+    ) -> pd.DataFrame:
         """Filter a DataFrame using a json file.
 
         Receives a DataFrame and a json file path, then filter the
-        DataFrame using all filter mutually.
+        DataFrame using all filter mutually. The inverted `index` of the
+        DataFrame might be given, as in `filter_df`.
 
         The json file must have the following format:
             {
@@ -59,7 +74,7 @@ class DFFilter:
         with open(json_path, "r", encoding="utf8") as file:
             filter_dict = json.load(file)
 
-        return DFFilter.filter_df(df, filter_dict)
+        return DFFilter.filter_df(df, filter_dict, index)
 
     @staticmethod
     def filter_spells_df(
@@ -78,7 +93,10 @@ class DFFilter:
             }
         """
         spells_df = reader.get_asserted_spells_df(*args, **kwargs)
-        return DFFilter.filter_df(spells_df, filter_dict)
+        # the loaded DataFrame is only used here, so it's safe to index it
+        return DFFilter.filter_df(
+            spells_df, filter_dict, SpellsIndex(spells_df)
+        )
 
     @staticmethod
     def filter_spells_df_using_json(
@@ -97,7 +115,9 @@ class DFFilter:
             }
         """
         spells_df = reader.get_asserted_spells_df(*args, **kwargs)
-        return DFFilter.filter_df_using_json(spells_df, json_path)
+        return DFFilter.filter_df_using_json(
+            spells_df, json_path, SpellsIndex(spells_df)
+        )
 
     @staticmethod
     def _filter_value_column(
@@ -108,13 +128,8 @@ class DFFilter:
         Receives a DataFrame, a column to filter and a list of filter values to
         filter by and returns a copy of the DataFrame filtered by that value.
         """
-        if not isinstance(filter_values, list):
-            filter_values = [filter_values]
-
-        filter_query = " | ".join(
-            [f"{column} == {value}" for value in filter_values]
-        )
-        return df.query(filter_query).copy()
+        is_filtered = DFFilter._get_value_column_mask(df, column, filter_values)
+        return df[is_filtered].copy()
 
     @staticmethod
     def _filter_list_column(
@@ -126,6 +141,25 @@ class DFFilter:
         values to filter by. Then, returns all the rows where list of that
         column contains the filter_value.
         """
+        is_filtered = DFFilter._get_list_column_mask(df, column, filter_values)
+        return df[is_filtered].copy()
+
+    @staticmethod
+    def _get_value_column_mask(
+        df: pd.DataFrame, column: str, filter_values: list[Any]
+    ) -> pd.Series:
+        """Return which rows of the column have any of the filter values."""
+        if not isinstance(filter_values, list):
+            filter_values = [filter_values]
+
+        filter_values = list(map(normalize_filter_value, filter_values))
+        return df[column].isin(filter_values)
+
+    @staticmethod
+    def _get_list_column_mask(
+        df: pd.DataFrame, column: str, filter_values: list[Any]
+    ) -> pd.Series:
+        """Return which rows of the list column contain any filter value."""
         if not isinstance(filter_values, list):
             filter_values = [filter_values]
 
@@ -135,7 +169,80 @@ class DFFilter:
                     return True
             return False
 
-        return df[df[column].apply(query_function)].copy()
+        return df[column].apply(query_function).astype(bool)
+
+
+class FilterPlan:
+    """A compiled dictionary of filters, reusable over many DataFrames.
+
+    The filter is normalized (e.g. scalar values become lists, and the order
+    of the columns and values doesn't matter). When it's applied with the
+    inverted index of the DataFrame and all of its columns are indexed, the
+    rows matching it are cached by the index (see
+    `df_index.SpellsIndex.get_filter_positions`). The other filters scan the
+    DataFrame, so they aren't cached.
+
+    Parameters
+    ----------
+    filter_dict : dict[str, Any]
+        The dictionary of filters, in the same format as in
+        `DFFilter.filter_df`.
+    """
+
+    def __init__(self, filter_dict: dict[str, Any]):
+        normalized_filter = dict()
+        for column, filter_values in filter_dict.items():
+            if not isinstance(filter_values, list):
+                filter_values = [filter_values]
+            filter_values = set(map(normalize_filter_value, filter_values))
+            normalized_filter[column] = sorted(filter_values, key=repr)
+
+        self.filter_dict = normalized_filter
+        self.key = tuple(
+            (column, tuple(filter_values))
+            for column, filter_values in sorted(normalized_filter.items())
+        )
+
+    def apply(
+        self, df: pd.DataFrame, index: SpellsIndex | None = None
+    ) -> pd.DataFrame:
+        """Return a copy of the DataFrame rows matching the filter.
+
+        The `index` must be the inverted index of the DataFrame, built after
+        its last modification. If it's None, the columns are scanned.
+        """
+        if index is None:
+            return df.iloc[np.flatnonzero(self._get_mask(df))].copy()
+        if index.length != len(df):
+            raise ValueError("The index doesn't match the DataFrame.")
+
+        if index.can_filter(self.filter_dict):
+            positions = index.get_filter_positions(self.key)
+        else:
+            positions = np.flatnonzero(self._get_mask(df, index))
+        return df.iloc[positions].copy()
+
+    def _get_mask(
+        self, df: pd.DataFrame, index: SpellsIndex | None = None
+    ) -> np.ndarray:
+        """Return which rows match the filter.
+
+        The filters of the indexed columns are evaluated using the index (if
+        any) and the others are evaluated scanning their columns.
+        """
+        mask = np.ones(len(df), dtype=bool)
+        for column, filter_values in self.filter_dict.items():
+            if index is not None and index.can_filter({column: filter_values}):
+                mask &= index.get_column_bitset(column, filter_values)
+            elif len(df) > 0 and isinstance(df[column].iloc[0], list):
+                mask &= DFFilter._get_list_column_mask(
+                    df, column, filter_values
+                ).to_numpy()
+            else:
+                mask &= DFFilter._get_value_column_mask(
+                    df, column, filter_values
+                ).to_numpy()
+        return mask
 
 
 class DFQuerrier:
@@ -144,26 +251,40 @@ class DFQuerrier:
     Querying a DataFrame means you can pass any query string to the Pandas query
     function. This query can be as complex as you want. Thus, this is more
     flexible than filtering, but can be more complex to use.
+
+    The list columns (e.g. 'elementos') also accept membership predicates,
+    like `'fogo' in elementos` or `classes contains 'mago'` (see `df_query`).
     """
 
     @staticmethod
-    def query_df(df: pd.DataFrame, query: str) -> pd.DataFrame:
+    def query_df(
+        df: pd.DataFrame, query: str, index: SpellsIndex | None = None
+    ) -> pd.DataFrame:
         """Query a DataFrame using a query string.
 
         Receives a DataFrame and a query string, then query the DataFrame using
-        the query string.
+        the query string. The membership predicates use the inverted `index`
+        of the DataFrame, if given (see `DFFilter.filter_df`).
         """
-        return df.query(query).copy()
+        try:
+            mask = get_query_mask(df, query, index)
+        except SyntaxError:
+            # e.g. backticks or '@' variables, which only Pandas understands
+            return DFQuerrier._query_joined_df(df, query)
+        return df[mask].copy()
 
     @staticmethod
-    def query_df_from_file(df: pd.DataFrame, file_path: str) -> pd.DataFrame:
+    def query_df_from_file(
+        df: pd.DataFrame, file_path: str, index: SpellsIndex | None = None
+    ) -> pd.DataFrame:
         """Query a DataFrame using a query file.
 
         Receives a DataFrame and a query file path, then query the DataFrame
-        using the query file.
+        using the query file. The inverted `index` of the DataFrame might be
+        given, as in `query_df`.
         """
         query = DFQuerrier._read_query_file(file_path)
-        return DFQuerrier.query_df(df, query)
+        return DFQuerrier.query_df(df, query, index)
 
     @staticmethod
     def query_spells_df(query: str, *args, **kwargs) -> pd.DataFrame:
@@ -173,10 +294,7 @@ class DFQuerrier:
         then query the DataFrame using the query string.
         """
         spells_df = reader.get_asserted_spells_df(*args, **kwargs)
-        spells_df = DFQuerrier._preprocess_spells_df(spells_df)
-        spells_df = DFQuerrier.query_df(spells_df, query)
-        spells_df = DFQuerrier._postprocess_spells_df(spells_df)
-        return spells_df
+        return DFQuerrier.query_df(spells_df, query, SpellsIndex(spells_df))
 
     @staticmethod
     def query_spells_df_from_file(
@@ -188,10 +306,9 @@ class DFQuerrier:
         DataFrame, then query the DataFrame using the query file.
         """
         spells_df = reader.get_asserted_spells_df(*args, **kwargs)
-        spells_df = DFQuerrier._preprocess_spells_df(spells_df)
-        spells_df = DFQuerrier.query_df_from_file(spells_df, file_path)
-        spells_df = DFQuerrier._postprocess_spells_df(spells_df)
-        return spells_df
+        return DFQuerrier.query_df_from_file(
+            spells_df, file_path, SpellsIndex(spells_df)
+        )
 
     @staticmethod
     def _read_query_file(file_path: str) -> str:
@@ -202,6 +319,17 @@ class DFQuerrier:
         query = " ".join(multiline_query)
         return query
 
+    @staticmethod
+    def _query_joined_df(df: pd.DataFrame, query: str) -> pd.DataFrame:
+        """Query a DataFrame using Pandas, with its list columns joined.
+
+        The list columns are joined into strings (as in "fogo, água") to be
+        queried, and split back into lists afterwards.
+        """
+        df = DFQuerrier._preprocess_spells_df(df)
+        df = df.query(query)
+        return DFQuerrier._postprocess_spells_df(df)
+
     @staticmethod
     def _preprocess_spells_df(spells_df: pd.DataFrame) -> pd.DataFrame:
         """Preprocess the spells DataFrame to be queried.
@@ -210,9 +338,9 @@ class DFQuerrier:
         """
         spells_df = spells_df.copy()
 
-        list_columns = ["escola", "elementos", "classes", "tags"]
-        for list_column in list_columns:
-            spells_df[list_column] = spells_df[list_column].str.join(", ")
+        for list_column in LIST_COLUMNS:
+            if list_column in spells_df.columns:
+                spells_df[list_column] = spells_df[list_column].str.join(", ")
 
         return spells_df
 
@@ -224,8 +352,96 @@ class DFQuerrier:
         """
         spells_df = spells_df.copy()
 
-        list_columns = ["escola", "elementos", "classes", "tags"]
-        for list_column in list_columns:
-            spells_df[list_column] = spells_df[list_column].str.split(", ")
+        for list_column in LIST_COLUMNS:
+            if list_column in spells_df.columns:
+                spells_df[list_column] = spells_df[list_column].str.split(", ")
 
         return spells_df
+
+
+class DFBatch:
+    """Filter and query the same DataFrame many times.
+
+    The `*_spells_df` methods of `DFFilter` and `DFQuerrier` load and validate
+    the spells DataFrame on every call. Here, the spells DataFrame is loaded
+    and validated only once, and then all the filters and queries are
+    evaluated over it, e.g. to generate one handout per class.
+    """
+
+    @staticmethod
+    def batch_df(
+        df: pd.DataFrame,
+        filters: dict[str, dict[str, Any]] | None = None,
+        queries: dict[str, str] | None = None,
+        workers: int | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Filter and query a DataFrame using many filters and queries.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            The DataFrame to filter and query.
+        filters : dict[str, dict[str, Any]] | None, default=None
+            The filter dictionaries (see `DFFilter.filter_df`) by their names.
+        queries : dict[str, str] | None, default=None
+            The query strings (see `DFQuerrier.query_df`) by their names.
+        workers : int | None, default=None
+            The number of threads used to evaluate the filters and queries.
+            If None, they are evaluated serially.
+
+        Returns
+        -------
+        dict[str, pd.DataFrame]
+            The filtered or queried DataFrame of each name, in the same order
+            as the filters and then the queries. A query with the same name
+            as a filter replaces it.
+        """
+        # the index is built once and shared by all the filters and queries
+        index = SpellsIndex(df)
+        tasks = dict()
+        for name, filter_dict in (filters or dict()).items():
+            plan = DFFilter.compile_filter(filter_dict)
+            tasks[name] = (plan.apply, df, index)
+        for name, query in (queries or dict()).items():
+            tasks[name] = (DFQuerrier.query_df, df, query, index)
+
+        if workers is None or len(tasks) <= 1:
+            return {name: task[0](*task[1:]) for name, task in tasks.items()}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                name: executor.submit(*task) for name, task in tasks.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+
+    @staticmethod
+    def batch_spells_df_from_files(
+        *,
+        filter_paths: list[str] | None = None,
+        query_paths: list[str] | None = None,
+        batch_workers: int | None = None,
+        **kwargs,
+    ) -> dict[str, pd.DataFrame]:
+        """Filter and query the spells DataFrame using many files.
+
+        Receives the filter json files (see `DFFilter.filter_df_using_json`),
+        the query files (see `DFQuerrier.query_df_from_file`), the number of
+        threads used to evaluate them (see `batch_df`) and the keyword
+        parameters to get the spells DataFrame (e.g. its `workers`, which
+        read the files).
+
+        Returns the filtered or queried spells DataFrame of each file path.
+        """
+        filters = dict()
+        for json_path in filter_paths or list():
+            with open(json_path, "r", encoding="utf8") as file:
+                filters[json_path] = json.load(file)
+        queries = {
+            query_path: DFQuerrier._read_query_file(query_path)
+            for query_path in query_paths or list()
+        }
+
+        spells_df = reader.get_asserted_spells_df(**kwargs)
+        return DFBatch.batch_df(
+            spells_df, filters, queries, workers=batch_workers
+        )
@@ -0,0 +1,138 @@
+"""Inverted index of the spells DataFrame.
+
+The index maps each value of the indexed columns to the bitset of the rows
+which have that value (or, for the list columns, which lists contain it). So,
+a whole filter dictionary is evaluated with unions and intersections of
+bitsets, instead of scanning the DataFrame once for each filter.
+"""
+
+# Python Standard Libraries
+import ast
+from collections import OrderedDict
+import threading
+from typing import Any
+
+# Third Party Libraries
+import numpy as np
+import pandas as pd
+
+INDEXED_COLUMNS = ["escola", "elementos", "classes", "tags", "nivel", "source"]
+
+
+class SpellsIndex:
+    """Inverted index of a spells DataFrame.
+
+    The rows are identified by their position in the DataFrame, and each
+    bitset is a boolean numpy array with one element per row. The index is a
+    snapshot of the DataFrame, so it must be built again if the DataFrame is
+    modified. The rows matching each filter are cached in a LRU cache of the
+    index (see `get_filter_positions`), so they're dropped with it.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The spells DataFrame.
+    columns : list[str], default=INDEXED_COLUMNS
+        The columns to index. Missing columns are ignored. A column is a list
+        column if its first value is a list (as in `DFFilter`).
+    """
+
+    cache_size = 1024
+
+    def __init__(self, df: pd.DataFrame, columns: list[str] = INDEXED_COLUMNS):
+        self.length = len(df)
+        self._bitsets: dict[str, dict[Any, np.ndarray]] = dict()
+        # normalized filter -> positions of the rows matching it
+        self._results: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        # the index might be shared by many threads (see `df_filter.DFBatch`)
+        self._results_lock = threading.Lock()
+
+        for column in columns:
+            if column not in df.columns:
+                continue
+            values = pd.Series(df[column].to_numpy())
+            if len(values) > 0 and isinstance(values.iloc[0], list):
+                values = values.explode().dropna()
+            self._bitsets[column] = self._get_value_bitsets(values)
+
+    def can_filter(self, filter_dict: dict[str, Any]) -> bool:
+        """Return whether all columns of the filter are indexed."""
+        return all(column in self._bitsets for column in filter_dict)
+
+    def get_filter_bitset(self, filter_dict: dict[str, Any]) -> np.ndarray:
+        """Return the bitset of the rows matching the filter dictionary.
+
+        The rows must match all filters, and a row matches a filter if its
+        value (or any value of its list) is one of the filter values.
+        """
+        bitset = np.ones(self.length, dtype=bool)
+        for column, filter_values in filter_dict.items():
+            bitset &= self.get_column_bitset(column, filter_values)
+        return bitset
+
+    def get_filter_positions(
+        self, filter_key: tuple[tuple[str, tuple[Any, ...]], ...]
+    ) -> np.ndarray:
+        """Return the positions of the rows matching a normalized filter.
+
+        The filter is a tuple of (column, filter values) pairs of indexed
+        columns, e.g. the `key` of a `df_filter.FilterPlan`. The results only
+        depend on the index, so they're cached. The returned array is
+        read-only, since it's shared.
+        """
+        with self._results_lock:
+            positions = self._results.get(filter_key)
+            if positions is not None:
+                self._results.move_to_end(filter_key)
+                return positions
+
+        filter_dict = {column: list(values) for column, values in filter_key}
+        positions = np.flatnonzero(self.get_filter_bitset(filter_dict))
+        positions.flags.writeable = False
+        with self._results_lock:
+            self._results[filter_key] = positions
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return positions
+
+    def get_column_bitset(
+        self, column: str, filter_values: Any | list[Any]
+    ) -> np.ndarray:
+        """Return the bitset of the rows having any of the filter values."""
+        if not isinstance(filter_values, list):
+            filter_values = [filter_values]
+
+        bitset = np.zeros(self.length, dtype=bool)
+        value_bitsets = self._bitsets[column]
+        for value in map(normalize_filter_value, filter_values):
+            if value in value_bitsets:
+                bitset |= value_bitsets[value]
+        return bitset
+
+    def _get_value_bitsets(self, values: pd.Series) -> dict[Any, np.ndarray]:
+        """Return the bitset of each value.
+
+        The `values` index must be the position of the row of each value.
+        """
+        rows = values.index.to_numpy()
+        value_bitsets = dict()
+        for value, positions in values.groupby(values).indices.items():
+            bitset = np.zeros(self.length, dtype=bool)
+            bitset[rows[positions]] = True
+            value_bitsets[value] = bitset
+        return value_bitsets
+
+
+def normalize_filter_value(value: Any) -> Any:
+    """Unquote string filter values written as query literals (e.g. "'LDJ'").
+
+    `DFFilter` used to build query strings with the filter values, so string
+    values had to be quoted.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        literal = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+    return literal if isinstance(literal, (str, int, float, bool)) else value
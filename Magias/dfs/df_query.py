@@ -0,0 +1,243 @@
+"""Evaluate query strings over the spells DataFrame.
+
+The queries have the same syntax as the Pandas query function, plus
+membership predicates over the list columns (e.g. 'escola' and 'tags'):
+    'fogo' in elementos
+    'mago' not in classes
+    ['fogo', 'água'] in elementos    (any of the values)
+    classes contains 'mago'          (same as 'mago' in classes)
+
+The list column must be on the right of 'in'. As before, a list column on
+the left is joined into a string and compared by Pandas, so
+`elementos in ['fogo']` only matches the spells whose only element is 'fogo'.
+
+As in Pandas, '&' and '|' have a lower precedence than the comparisons, so
+`'fogo' in elementos & nivel > 2` needs no parentheses.
+
+The membership predicates are evaluated using the inverted index of the
+DataFrame (see `df_index`), or the bitmasks of a compact DataFrame (see
+`df_compact`), and the remaining predicates are evaluated by Pandas over the
+original DataFrame. A list column is only joined into strings (as in
+"fogo, água") if a predicate other than a membership uses it, like
+`elementos.str.contains('fogo')`, and only that column is joined.
+"""
+
+# Python Standard Libraries
+import ast
+import io
+import keyword
+import tokenize
+from typing import Any
+
+# Third Party Libraries
+import numpy as np
+import pandas as pd
+
+# Local Folder Libraries
+from .df_compact import contains_any
+from .df_index import SpellsIndex
+
+LIST_COLUMNS = ["escola", "elementos", "classes", "tags"]
+LIST_SEPARATOR = ", "
+
+# Pandas replaces these operators before parsing the query, which gives them
+# the precedence of 'and' and 'or'
+BOOLEAN_OPERATORS = {"&": "and", "|": "or"}
+
+
+def get_query_mask(
+    df: pd.DataFrame, query: str, index: SpellsIndex | None = None
+) -> pd.Series:
+    """Return which rows of the DataFrame match the query.
+
+    The membership predicates use the inverted `index` of the DataFrame, if
+    given, and otherwise an index of only their column is built.
+
+    Raises a SyntaxError if the query isn't a python expression (e.g. it uses
+    backticks or '@' variables), which should then be evaluated by Pandas.
+    """
+    tree = ast.parse(_rewrite_query(query).strip(), mode="eval")
+    mask = _evaluate(df, tree.body, index)
+    return pd.Series(mask, index=df.index, dtype=bool)
+
+
+def _rewrite_query(query: str) -> str:
+    """Rewrite a query into a python expression, as Pandas does.
+
+    The '&' and '|' operators become 'and' and 'or', and the `contains`
+    predicates become membership predicates. The query is tokenized, so the
+    strings inside it are kept as they are.
+    """
+    try:
+        tokens = [
+            (token.type, token.string)
+            for token in tokenize.generate_tokens(io.StringIO(query).readline)
+        ]
+    except tokenize.TokenError as e:
+        raise SyntaxError(f"Invalid query: {query}") from e
+
+    rewritten: list[tuple[int, str]] = list()
+    position = 0
+    while position < len(tokens):
+        token_type, token_string = tokens[position]
+        if token_type == tokenize.OP and token_string in BOOLEAN_OPERATORS:
+            rewritten.append((tokenize.NAME, BOOLEAN_OPERATORS[token_string]))
+        elif _is_contains(tokens, position):
+            # "column contains values" -> "(values in column)"
+            column = rewritten.pop()
+            end = _get_operand_end(tokens, position + 1)
+            rewritten += [
+                (tokenize.OP, "("),
+                *tokens[position + 1 : end],
+                (tokenize.NAME, "in"),
+                column,
+                (tokenize.OP, ")"),
+            ]
+            position = end
+            continue
+        else:
+            rewritten.append(tokens[position])
+        position += 1
+    return tokenize.untokenize(rewritten)
+
+
+def _is_contains(tokens: list[tuple[int, str]], position: int) -> bool:
+    """Return whether a token is the operator of a `contains` predicate."""
+    if tokens[position] != (tokenize.NAME, "contains") or position == 0:
+        return False
+    previous_type, previous_string = tokens[position - 1]
+    next_type, next_string = tokens[position + 1]
+    return (
+        previous_type == tokenize.NAME
+        and not keyword.iskeyword(previous_string)
+        and (next_type == tokenize.STRING or next_string in ("[", "("))
+    )
+
+
+def _get_operand_end(tokens: list[tuple[int, str]], start: int) -> int:
+    """Return the end of a string or bracketed operand starting at `start`."""
+    depth = 0
+    for position in range(start, len(tokens)):
+        token_type, token_string = tokens[position]
+        if token_type == tokenize.OP and token_string in "([{":
+            depth += 1
+        elif token_type == tokenize.OP and token_string in ")]}":
+            depth -= 1
+        if depth == 0:
+            return position + 1
+    return len(tokens)
+
+
+def _evaluate(
+    df: pd.DataFrame, node: ast.expr, index: SpellsIndex | None = None
+) -> np.ndarray:
+    """Evaluate a boolean expression node into a boolean array."""
+    if isinstance(node, ast.BoolOp):
+        masks = [_evaluate(df, value, index) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return np.logical_and.reduce(masks)
+        return np.logical_or.reduce(masks)
+
+    if (
+        isinstance(node, ast.UnaryOp)
+        and isinstance(node.op, (ast.Not, ast.Invert))
+        and _is_predicate(node.operand)
+    ):
+        return ~_evaluate(df, node.operand, index)
+
+    membership = _get_membership(df, node)
+    if membership is not None:
+        column, values, negate = membership
+        mask = _get_membership_mask(df, column, values, index)
+        return ~mask if negate else mask
+
+    return _evaluate_with_pandas(df, node)
+
+
+def _is_predicate(node: ast.expr) -> bool:
+    """Return whether a node is a boolean predicate (and not a value)."""
+    if isinstance(node, (ast.Compare, ast.BoolOp)):
+        return True
+    if isinstance(node, ast.UnaryOp):
+        return isinstance(node.op, (ast.Not, ast.Invert)) and _is_predicate(
+            node.operand
+        )
+    return False
+
+
+def _get_membership(
+    df: pd.DataFrame, node: ast.expr
+) -> tuple[str, list[Any], bool] | None:
+    """Return the list column, values and negation of a membership node.
+
+    Returns None if the node isn't a membership predicate over a list column.
+    """
+    if not (
+        isinstance(node, ast.Compare)
+        and len(node.ops) == 1
+        and isinstance(node.ops[0], (ast.In, ast.NotIn))
+    ):
+        return None
+
+    # with the list column on the left (e.g. `elementos in ['fogo']`), the
+    # joined column is compared to the values by Pandas, as it always was
+    values_node, column_node = node.left, node.comparators[0]
+    if not _is_list_column(df, column_node):
+        return None
+
+    try:
+        values = ast.literal_eval(values_node)
+    except ValueError:
+        return None
+    if not isinstance(values, (list, tuple, set)):
+        values = [values]
+
+    assert isinstance(column_node, ast.Name)  # This is to make mypy happy.
+    return column_node.id, list(values), isinstance(node.ops[0], ast.NotIn)
+
+
+def _is_list_column(df: pd.DataFrame, node: ast.expr) -> bool:
+    return (
+        isinstance(node, ast.Name)
+        and node.id in LIST_COLUMNS
+        and node.id in df.columns
+    )
+
+
+def _get_membership_mask(
+    df: pd.DataFrame,
+    column: str,
+    values: list[Any],
+    index: SpellsIndex | None = None,
+) -> np.ndarray:
+    """Return which lists of the column contain any of the values."""
+    if pd.api.types.is_integer_dtype(df[column]):
+        return contains_any(df, column, values).to_numpy()
+    if index is None or not index.can_filter({column: values}):
+        index = SpellsIndex(df, [column])
+    return index.get_column_bitset(column, values)
+
+
+def _evaluate_with_pandas(df: pd.DataFrame, node: ast.expr) -> np.ndarray:
+    """Evaluate an expression node using Pandas eval.
+
+    The list columns used by the expression are joined into strings, as
+    `DFQuerrier` used to do with the whole DataFrame.
+    """
+    used_list_columns = {
+        child.id
+        for child in ast.walk(node)
+        if isinstance(child, ast.Name) and _is_list_column(df, child)
+    }
+    joined_columns = {
+        column: df[column].str.join(LIST_SEPARATOR)
+        for column in used_list_columns
+    }
+
+    result = df.eval(
+        ast.unparse(node), engine="python", resolvers=[joined_columns]
+    )
+    if isinstance(result, pd.Series):
+        # the missing values (e.g. of `dmg.str.contains('d6')`) don't match
+        result = result.astype("boolean").fillna(False)
+    return np.asarray(result, dtype=bool)
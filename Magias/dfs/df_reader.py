@@ -5,97 +5,551 @@ and returns a DataFrame with the spells.
 
 It has two main functions, one to return the raw DataFrame and another to
 return the DataFrame with the schema asserted.
+
+The raw DataFrame is cached in a snapshot file inside the spells folder, which
+is reused while no .json file is added, removed or modified.
 """
 
 # Python Standard Libraries
-import glob
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 import json
+import os
 from pathlib import Path
-from typing import Any
+import pickle
+import tempfile
+from typing import Any, Callable, TYPE_CHECKING
 
 # Third Party Libraries
 import pandas as pd
-from pandera.errors import SchemaError
-from tqdm import tqdm
 
 # Local Folder Libraries
-from .spells_schema import spells_schema
+from . import spells_storage as storage
+from .validation_cache import get_rows_hash, ValidationCache
+
+if TYPE_CHECKING:
+    # pandera takes longer to import than pandas, so it's only imported when
+    # the spells are validated
+    from pandera import DataFrameSchema
+    from pandera.errors import SchemaError, SchemaErrors
+
+SNAPSHOT_FILE_NAME = ".spells_snapshot.pkl"
+SNAPSHOT_VERSION = 2
+UNIQUE_COLUMNS = ["nome", "name"]
 
 
 def get_spells_df(
     path_prefix: str = "./data/",
     sort_by: list[str] | None = None,
     verbose: bool = False,
+    use_cache: bool = True,
+    workers: int | None = None,
+    use_processes: bool = False,
+    columns: list[str] | None = None,
 ) -> pd.DataFrame:
     """Return the spells DataFrame from the .json files.
 
-    You might specify the path to the json files, the default is '../'.
+    You might specify the path to the json files, the default is '../'. It
+    might also be the path to a bundled JSON Lines or SQLite file (see
+    `spells_storage`), and the format is detected automatically.
+
+    If `use_cache` is True, the DataFrame is stored in a snapshot file inside
+    the `path_prefix` folder. The snapshot is keyed by the name, modification
+    time and size of every .json file, so it's loaded with a single read while
+    none of them change.
+
+    If `workers` is greater than one, the folder files are read in parallel
+    by a thread pool, which helps when the files are on a slow storage. If
+    `use_processes` is also True, the files are decoded by a process pool.
+
+    If `columns` is given, only those columns are returned. The snapshot
+    stores each column separately, so only these columns are decoded, and,
+    without the snapshot, the SQLite format only reads these columns. The
+    other columns can be loaded later with `load_deferred_columns`.
+    """
+    if sort_by is None:
+        sort_by = ["nivel", "nome"]
+
+    read_columns = None
+    if columns is not None:
+        read_columns = columns + [x for x in sort_by if x not in columns]
+
+    storage_format = storage.get_storage_format(path_prefix)
+    if storage_format == storage.FOLDER_FORMAT:
+        files = storage.get_spell_files(path_prefix)
+        fingerprint = _get_files_fingerprint(path_prefix, files, workers)
+    else:
+        fingerprint = _get_files_fingerprint("", [path_prefix])
+
+    spells_df = None
+    if use_cache:
+        spells_df = _load_snapshot(path_prefix, fingerprint, read_columns)
+        if spells_df is not None and verbose:
+            print("Spells loaded from snapshot.")
+
+    if spells_df is None:
+        # The snapshot must have all columns, so the projection can't be
+        # pushed down to the storage when it's going to be saved.
+        storage_columns = None if use_cache else read_columns
+        if storage_format == storage.FOLDER_FORMAT:
+            result, all_valid = _read_spell_files(
+                path_prefix, files, verbose, workers, use_processes
+            )
+            if storage_columns is not None:
+                result = [
+                    storage.project_spell(spell, storage_columns)
+                    for spell in result
+                ]
+        else:
+            spells, all_valid = storage.read_spells(
+                path_prefix, columns=storage_columns
+            )
+            result = list(spells.values())
+        spells_df = pd.DataFrame(result)
+        if use_cache and all_valid:
+            _save_snapshot(path_prefix, fingerprint, spells_df)
+        if read_columns is not None:
+            spells_df = spells_df[
+                [x for x in read_columns if x in spells_df.columns]
+            ]
+
+    result_df = spells_df.sort_values(by=sort_by).reset_index(drop=True)
+    if columns is not None:
+        result_df = result_df[[x for x in columns if x in result_df.columns]]
+    return result_df
+
+
+def load_deferred_columns(
+    spells_df: pd.DataFrame,
+    columns: list[str],
+    path_prefix: str = "./data/",
+    config_path: Path = Path("./dfs/schema_config.json"),
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Add columns to a spells DataFrame loaded with only a few columns.
+
+    It's meant to load the heavy columns (e.g. 'descricao') only for the
+    spells which survived a filter. The spells are matched by their 'nome',
+    and the default values of the new columns are filled as in
+    `get_asserted_spells_df`. The SQLite format reads only these spells,
+    using its 'nome' index.
+
+    Returns a copy of `spells_df` with the new columns.
+    """
+    read_columns = ["nome"] + [x for x in columns if x != "nome"]
+    names = list(spells_df["nome"])
+
+    if storage.get_storage_format(path_prefix) == storage.SQLITE_FORMAT:
+        spells, _ = storage.read_spells(
+            path_prefix, where={"nome": names}, columns=read_columns
+        )
+        deferred_df = pd.DataFrame(list(spells.values()), columns=read_columns)
+    else:
+        deferred_df = get_spells_df(
+            path_prefix, use_cache=use_cache, columns=read_columns
+        )
+
+    configs = json.load(open(config_path, "r"))
+    deferred_df = _prepare_spells_df(deferred_df, configs)
+    deferred_df = deferred_df.set_index("nome").reindex(names)
+
+    spells_df = spells_df.copy()
+    for column in read_columns[1:]:
+        spells_df[column] = deferred_df[column].to_numpy()
+    return spells_df
+
+
+def _read_spell_files(
+    path_prefix: str,
+    files: list[str],
+    verbose: bool = False,
+    workers: int | None = None,
+    use_processes: bool = False,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Read the spell .json files.
+
+    If `workers` is greater than one, the files are read and decoded by a
+    thread pool (or read by a thread pool and decoded by a process pool, if
+    `use_processes` is True). The spells are returned in the same order as
+    the files either way.
+
+    Returns the list of spells read and whether all the files were valid.
     """
-    files = glob.glob(f"{path_prefix}*.json")
-    path_prefix_len = len(path_prefix)
-    files = list(map(lambda x: x[path_prefix_len:], files))
-    files.remove("_Template.json")
+    paths = [f"{path_prefix}{file_name}" for file_name in files]
+    if workers is None or workers <= 1:
+        spell_getters = [partial(_load_spell_file, x) for x in paths]
+        return _collect_spells(files, spell_getters, verbose)
+
+    with ThreadPoolExecutor(max_workers=workers) as thread_pool:
+        if not use_processes:
+            futures = [thread_pool.submit(_load_spell_file, x) for x in paths]
+            spell_getters = [future.result for future in futures]
+            return _collect_spells(files, spell_getters, verbose)
+
+        contents = thread_pool.map(_read_file_bytes, paths)
+        with ProcessPoolExecutor(max_workers=workers) as process_pool:
+            futures = [process_pool.submit(json.loads, x) for x in contents]
+            spell_getters = [future.result for future in futures]
+            return _collect_spells(files, spell_getters, verbose)
+
+
+def _collect_spells(
+    files: list[str],
+    spell_getters: list[Callable[[], Any]],
+    verbose: bool = False,
+) -> tuple[list[dict[str, Any]], bool]:
+    """Collect the decoded spells, reporting the invalid files.
 
+    Each getter returns the decoded spell of the file in the same position,
+    or raises its decoding error.
+    """
+    files_getters = zip(files, spell_getters)
     if verbose:
-        files = tqdm(files, desc="Spells")
+        from tqdm import tqdm  # pylint: disable=import-outside-toplevel
+
+        files_getters = tqdm(files_getters, desc="Spells", total=len(files))
 
     result = list()
-    for file_name in files:
-        with open(f"{path_prefix}{file_name}", "r") as file:
-            try:
-                result.append(json.load(file))
-            except json.JSONDecodeError as e:
-                print(f"{file_name} is not a valid json file.")
-                print(e)
+    all_valid = True
+    for file_name, get_spell in files_getters:
+        try:
+            result.append(get_spell())
+        except json.JSONDecodeError as e:
+            print(f"{file_name} is not a valid json file.")
+            print(e)
+            all_valid = False
 
-    if sort_by is None:
-        sort_by = ["nivel", "nome"]
+    return result, all_valid
+
+
+def _load_spell_file(path: str) -> Any:
+    """Read and decode a spell .json file."""
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def _read_file_bytes(path: str) -> bytes:
+    """Read the raw content of a file."""
+    with open(path, "rb") as file:
+        return file.read()
 
-    result_df = (
-        pd.DataFrame(result).sort_values(by=sort_by).reset_index(drop=True)
+
+def _get_files_fingerprint(
+    path_prefix: str, files: list[str], workers: int | None = None
+) -> dict[str, tuple[int, int]]:
+    """Return the modification time and size of each file.
+
+    If `workers` is greater than one, the files are stat'ed by a thread pool.
+    """
+    paths = [f"{path_prefix}{file_name}" for file_name in files]
+    if workers is None or workers <= 1:
+        files_stat = map(os.stat, paths)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as thread_pool:
+            files_stat = list(thread_pool.map(os.stat, paths))
+
+    fingerprint = dict()
+    for file_name, file_stat in zip(files, files_stat):
+        fingerprint[file_name] = (file_stat.st_mtime_ns, file_stat.st_size)
+    return fingerprint
+
+
+def _get_snapshot_path(path_prefix: str) -> Path:
+    """Return the snapshot path of a spells folder or bundled file.
+
+    The snapshot of a folder is stored inside it, while the snapshot of a
+    bundled file is stored next to it.
+    """
+    path = Path(path_prefix)
+    if storage.get_storage_format(path_prefix) == storage.FOLDER_FORMAT:
+        return path / SNAPSHOT_FILE_NAME
+    return path.parent / f".{path.name}{SNAPSHOT_FILE_NAME}"
+
+
+def _load_snapshot(
+    path_prefix: str,
+    fingerprint: dict[str, tuple[int, int]],
+    columns: list[str] | None = None,
+) -> pd.DataFrame | None:
+    """Load the spells snapshot if it matches the fingerprint.
+
+    Each column is pickled separately in the snapshot, so only the given
+    `columns` (or all of them, if None) are unpickled.
+
+    Returns None if there is no snapshot or if it's outdated.
+    """
+    snapshot_path = _get_snapshot_path(path_prefix)
+    try:
+        with open(snapshot_path, "rb") as file:
+            snapshot = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+    if (
+        snapshot.get("version") != SNAPSHOT_VERSION
+        or snapshot.get("fingerprint") != fingerprint
+    ):
+        return None
+
+    pickled_columns = snapshot["columns"]
+    if columns is None:
+        columns = list(pickled_columns)
+
+    spells_df = pd.DataFrame(
+        {
+            column: pickle.loads(pickled_columns[column])
+            for column in columns
+            if column in pickled_columns
+        },
+        index=pd.RangeIndex(snapshot["length"]),
     )
-    return result_df
+    return spells_df
+
+
+def _save_snapshot(
+    path_prefix: str,
+    fingerprint: dict[str, tuple[int, int]],
+    spells_df: pd.DataFrame,
+) -> None:
+    """Save the spells snapshot inside the `path_prefix` folder.
+
+    The snapshot is written to a temporary file first, so a concurrent reader
+    never sees a partially written snapshot.
+    """
+    snapshot_path = _get_snapshot_path(path_prefix)
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": fingerprint,
+        "length": len(spells_df),
+        "columns": {
+            column: pickle.dumps(
+                spells_df[column], protocol=pickle.HIGHEST_PROTOCOL
+            )
+            for column in spells_df.columns
+        },
+    }
+    try:
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=snapshot_path.parent, delete=False
+        ) as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, snapshot_path)
+    except OSError as e:
+        print(f"Could not save the spells snapshot: {e}")
 
 
 def get_asserted_spells_df(
     *args,
     config_path: Path = Path("./dfs/schema_config.json"),
     verbose: bool = False,
+    use_validation_cache: bool = True,
+    validate: bool = True,
     **kwargs,
 ) -> pd.DataFrame:
     """Return the spells DataFrame from the .json files with the schema
     asserted.
+
+    If `use_validation_cache` is True, only the spells which didn't pass the
+    validation before (or which changed since then) are validated by the
+    schema (see `validation_cache`).
+
+    If `validate` is False, the schema isn't validated (and pandera isn't
+    imported), and the validation cache is trusted instead: only the spells
+    which didn't pass the validation before are reported (see
+    `_check_spells_df_using_cache`).
     """
     configs = json.load(open(config_path, "r"))
 
     spells_df = get_spells_df(*args, **kwargs)
-    spells_df = _fill_columns_with_default_values(spells_df, configs)
-    spells_df = _convert_column_to_list(spells_df, "escola")
+    spells_df = _prepare_spells_df(spells_df, configs)
+    if not validate:
+        _check_spells_df_using_cache(spells_df, config_path, verbose)
+    elif kwargs.get("columns") is not None:
+        # only the loaded columns are validated, without the cache
+        from .spells_schema import (  # pylint: disable=import-outside-toplevel
+            spells_schema,
+        )
+
+        schema = spells_schema.select_columns(list(spells_df.columns))
+        _validate_spells_df(spells_df, schema, verbose)
+    elif use_validation_cache:
+        _validate_spells_df_using_cache(spells_df, config_path, verbose)
+    else:
+        _validate_spells_df(spells_df, verbose=verbose)
+
+    return spells_df
+
+
+def _prepare_spells_df(
+    spells_df: pd.DataFrame, config: dict[str, Any]
+) -> pd.DataFrame:
+    """Fill the default values and convert the scalar columns to lists.
+
+    Only the columns present in the DataFrame are prepared, so it also works
+    for DataFrames loaded with only a few columns.
+    """
+    config = {
+        **config,
+        "columns_default_values": {
+            column: default_value
+            for column, default_value in config[
+                "columns_default_values"
+            ].items()
+            if column in spells_df.columns
+        },
+    }
+    spells_df = _fill_columns_with_default_values(spells_df, config)
+    if "escola" in spells_df.columns:
+        spells_df = _convert_column_to_list(spells_df, "escola")
+    return spells_df
+
+
+def _validate_spells_df(
+    spells_df: pd.DataFrame,
+    schema: "DataFrameSchema | None" = None,
+    verbose: bool = False,
+) -> bool:
+    """Validate the spells DataFrame and print the failure cases, if any.
+
+    The default schema is the whole `spells_schema`. Returns whether the
+    DataFrame is valid.
+    """
+    # pylint: disable=import-outside-toplevel
+    from pandera.errors import SchemaError
 
+    from .spells_schema import spells_schema
+
+    if schema is None:
+        schema = spells_schema
     try:
         if verbose:
             print("Validating schema...")
-        spells_schema.validate(spells_df)
+        schema.validate(spells_df)
         if verbose:
             print("Schema validated.")
     except SchemaError as err:
         _print_schema_error_message(err, spells_df)
+        return False
+    return True
+
+
+def _validate_spells_df_using_cache(
+    spells_df: pd.DataFrame, config_path: Path, verbose: bool = False
+) -> bool:
+    """Validate only the spells which aren't in the validation cache.
+
+    The uniqueness of the unique columns is still checked for all spells,
+    since it depends on all of them. Then, the valid spells are saved in the
+    cache. The validation is lazy, so all invalid spells are reported (and
+    not only the ones failing the first failed check).
+
+    Returns whether the DataFrame is valid.
+    """
+    from .spells_schema import (  # pylint: disable=import-outside-toplevel
+        spells_schema,
+    )
+
+    cache = ValidationCache(config_path)
+    rows_hash = get_rows_hash(spells_df)
+    is_validated = cache.is_validated(rows_hash)
+    if verbose:
+        print(f"{(~is_validated).sum()} spells to validate.")
+
+    invalid_index = set()
+    if not is_validated.all():
+        invalid_index |= _get_invalid_index(
+            spells_df[~is_validated], spells_schema, verbose
+        )
+    if is_validated.any():
+        unique_columns_schema = spells_schema.select_columns(UNIQUE_COLUMNS)
+        invalid_index |= _get_invalid_index(spells_df, unique_columns_schema)
+
+    is_valid = ~spells_df.index.isin(list(invalid_index))
+    if set(rows_hash[is_valid]) != cache.rows_hash:
+        cache.save(rows_hash[is_valid])
+    return bool(is_valid.all())
+
+
+def _check_spells_df_using_cache(
+    spells_df: pd.DataFrame, config_path: Path, verbose: bool = False
+) -> bool:
+    """Check the spells using only the validation cache.
+
+    It's the fast path of `get_asserted_spells_df`, which doesn't import
+    pandera: the spells which passed the validation before are trusted, and
+    the other ones are reported, but not validated. The unique columns are
+    still checked for all spells, using pandas.
+
+    Returns whether all the spells are trusted and unique.
+    """
+    cache = ValidationCache(config_path)
+    is_validated = cache.is_validated(get_rows_hash(spells_df))
+    if not is_validated.all():
+        print(
+            f"{(~is_validated).sum()} spells didn't pass the validation "
+            "before, and they weren't validated now."
+        )
+        if verbose:
+            print(", ".join(spells_df.loc[~is_validated, "nome"]))
+    elif verbose:
+        print("All spells were validated before.")
+
+    is_unique = True
+    for column in UNIQUE_COLUMNS:
+        duplicated = spells_df[column].duplicated(keep=False)
+        if duplicated.any():
+            print(
+                f"Duplicated {column}: "
+                f"{', '.join(sorted(set(spells_df.loc[duplicated, column])))}."
+            )
+            is_unique = False
+    return bool(is_validated.all()) and is_unique
 
-    return spells_df
+
+def _get_invalid_index(
+    spells_df: pd.DataFrame, schema: "DataFrameSchema", verbose: bool = False
+) -> set[Any]:
+    """Validate lazily the spells DataFrame and print the failure cases.
+
+    Returns the index of the invalid rows. If a failure can't be traced back
+    to rows, all rows are considered invalid.
+    """
+    from pandera.errors import (  # pylint: disable=import-outside-toplevel
+        SchemaErrors,
+    )
+
+    try:
+        if verbose:
+            print("Validating schema...")
+        schema.validate(spells_df, lazy=True)
+        if verbose:
+            print("Schema validated.")
+    except SchemaErrors as err:
+        _print_schema_error_message(err, spells_df)
+        invalid_index = set(err.failure_cases["index"])
+        if pd.isna(list(invalid_index)).any():
+            return set(spells_df.index)
+        return invalid_index
+    return set()
 
 
 def _print_schema_error_message(
-    err: SchemaError, spells_df: pd.DataFrame
+    err: "SchemaError | SchemaErrors", spells_df: pd.DataFrame
 ) -> None:
     assert err.failure_cases is not None  # This is to make mypy happy.
 
     print("Schema errors.")
+    if not isinstance(err.failure_cases, pd.DataFrame):
+        # e.g. a missing column, which fails the whole DataFrame
+        print(err.failure_cases)
+        return
+
     failure_index = list(err.failure_cases["index"])
-    if failure_index[0] is None:
+    if pd.isna(failure_index).any():
         print("No failure cases. This library sucks.")
         return
 
-    failure_spell_names = list(spells_df.iloc[failure_index].nome)
+    failure_spell_names = list(spells_df.loc[failure_index].nome)
     failure_cases = list(err.failure_cases["failure_case"])
 
     failure_report = pd.DataFrame(
@@ -0,0 +1,242 @@
+"""Watch the spells files, waiting until any of them changes.
+
+The `FileWatcher` watches files (e.g. a filter file) and folders (e.g. the
+spells folder, where only the .json files count). It uses inotify, through
+the C library, and falls back to polling the modification times where inotify
+isn't available:
+
+    with FileWatcher(["./data/", "./filter.json"]) as watcher:
+        while True:
+            changed_paths = watcher.wait()  # e.g. {"./data/"}
+            ...
+
+The editors save a file in many steps (e.g. writing a temporary file and
+renaming it), so the changes are debounced: `wait` only returns after no
+change happens for a while.
+"""
+
+# Python Standard Libraries
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import time
+
+DEBOUNCE_SECONDS = 0.3
+POLL_SECONDS = 0.5
+FOLDER_PATTERN = "*.json"
+
+# the inotify events of a file written, created, deleted or renamed
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+_event_struct = struct.Struct("iIII")
+
+
+class FileWatcher:
+    """Wait for changes of some files and folders.
+
+    Parameters
+    ----------
+    paths : list[str]
+        The files and folders to watch. Inside a folder, only the files
+        matching `pattern` (and which aren't hidden) are watched, so the
+        caches written inside it don't count as changes.
+    pattern : str, default=FOLDER_PATTERN
+        The pattern of the watched files inside the folders.
+    debounce : float, default=DEBOUNCE_SECONDS
+        The seconds without any change before `wait` returns.
+    poll_interval : float, default=POLL_SECONDS
+        The seconds between two scans, when inotify isn't available.
+    use_inotify : bool, default=True
+        If False, the files are always polled.
+    """
+
+    def __init__(
+        self,
+        paths: list[str],
+        pattern: str = FOLDER_PATTERN,
+        debounce: float = DEBOUNCE_SECONDS,
+        poll_interval: float = POLL_SECONDS,
+        use_inotify: bool = True,
+    ):
+        self.paths = paths
+        self.pattern = pattern
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._inotify_fd: int | None = None
+        # watch descriptor -> watched folder
+        self._watched_folders: dict[int, str] = dict()
+
+        if use_inotify:
+            self._inotify_fd = self._start_inotify()
+        if self._inotify_fd is None:
+            self._fingerprint = self._scan()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether the changes are notified by inotify, instead of polled."""
+        return self._inotify_fd is not None
+
+    def wait(self) -> set[str]:
+        """Wait for a burst of changes and return the changed paths.
+
+        The returned paths are the ones given to the watcher, e.g. a watched
+        folder is returned if any of its files changed.
+        """
+        if self._inotify_fd is not None:
+            return self._wait_inotify()
+        return self._wait_polling()
+
+    def close(self) -> None:
+        """Stop watching the files."""
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _start_inotify(self) -> int | None:
+        """Watch the folders of the paths with inotify.
+
+        Returns the inotify file descriptor, or None if inotify isn't
+        available (e.g. outside Linux).
+        """
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            inotify_fd = libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if inotify_fd < 0:
+            return None
+
+        # the folder of each file is watched, since the editors replace the
+        # files instead of writing into them
+        folders = {self._get_watched_folder(path) for path in self.paths}
+        for folder in folders:
+            watch_descriptor = libc.inotify_add_watch(
+                inotify_fd, os.fsencode(folder), WATCH_MASK
+            )
+            if watch_descriptor < 0:
+                os.close(inotify_fd)
+                return None
+            self._watched_folders[watch_descriptor] = folder
+        return inotify_fd
+
+    def _wait_inotify(self) -> set[str]:
+        changed_paths: set[str] = set()
+        timeout = None
+        while True:
+            readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+            if not readable:
+                if changed_paths:
+                    return changed_paths
+                timeout = None
+                continue
+
+            changed_paths |= self._read_inotify_events()
+            # after the first change, wait until the changes stop
+            timeout = self.debounce
+
+    def _read_inotify_events(self) -> set[str]:
+        """Return the watched paths changed by the pending events."""
+        buffer = os.read(self._inotify_fd, 64 * 1024)
+        changed_paths = set()
+        offset = 0
+        while offset < len(buffer):
+            watch_descriptor, mask, _, name_length = _event_struct.unpack_from(
+                buffer, offset
+            )
+            offset += _event_struct.size
+            name = buffer[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                # some events were lost, so everything might have changed
+                changed_paths |= set(self.paths)
+                continue
+            folder = self._watched_folders.get(watch_descriptor)
+            if folder is not None:
+                changed_paths |= self._get_changed_paths(
+                    folder, os.fsdecode(name)
+                )
+        return changed_paths
+
+    def _get_changed_paths(self, folder: str, file_name: str) -> set[str]:
+        """Return the watched paths including a file of a folder."""
+        file_path = os.path.join(folder, file_name)
+        changed_paths = set()
+        for path in self.paths:
+            if os.path.isdir(path):
+                if os.path.abspath(path) == folder and self._is_watched_file(
+                    file_name
+                ):
+                    changed_paths.add(path)
+            elif os.path.abspath(path) == file_path:
+                changed_paths.add(path)
+        return changed_paths
+
+    def _wait_polling(self) -> set[str]:
+        changed_paths: set[str] = set()
+        interval = self.poll_interval
+        while True:
+            time.sleep(interval)
+            fingerprint = self._scan()
+            new_changed_paths = {
+                path
+                for path in self.paths
+                if fingerprint[path] != self._fingerprint[path]
+            }
+            self._fingerprint = fingerprint
+            if new_changed_paths:
+                changed_paths |= new_changed_paths
+                # after the first change, wait until the changes stop
+                interval = self.debounce
+            elif changed_paths:
+                return changed_paths
+
+    def _scan(self) -> dict[str, object]:
+        """Return the modification time and size of the watched files."""
+        fingerprint: dict[str, object] = dict()
+        for path in self.paths:
+            if os.path.isdir(path):
+                fingerprint[path] = {
+                    entry.name: _get_stat(entry.path)
+                    for entry in os.scandir(path)
+                    if self._is_watched_file(entry.name)
+                }
+            else:
+                fingerprint[path] = _get_stat(path)
+        return fingerprint
+
+    def _is_watched_file(self, file_name: str) -> bool:
+        return not file_name.startswith(".") and fnmatch.fnmatch(
+            file_name, self.pattern
+        )
+
+    @staticmethod
+    def _get_watched_folder(path: str) -> str:
+        if os.path.isdir(path):
+            return os.path.abspath(path)
+        return os.path.dirname(os.path.abspath(path))
+
+
+def _get_stat(path: str) -> tuple[int, int] | None:
+    """Return the modification time and size of a file, or None if missing."""
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return (file_stat.st_mtime_ns, file_stat.st_size)
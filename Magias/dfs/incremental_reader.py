@@ -0,0 +1,284 @@
+"""Keep the spells DataFrame in memory and reload only the changed files.
+
+The `IncrementalSpellsReader` returns the same DataFrame as
+`df_reader.get_asserted_spells_df`, but it remembers the last DataFrame and a
+fingerprint (modification time, size and hash) of every .json file. Then, each
+new call only parses, fills the default values and validates the spells whose
+files were added or modified, and drops the spells whose files were removed.
+While nothing changes, the same DataFrame is returned.
+
+The other long-lived readers of the spell files (e.g. the watch mode of
+`export_filtered_spells` and `text_search.SpellsSearchIndex`) use it too,
+through `read_changed_spells`.
+"""
+
+# Python Standard Libraries
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+# Third Party Libraries
+import pandas as pd
+
+# Local Folder Libraries
+from . import df_reader as reader
+from . import spells_storage as storage
+
+
+class IncrementalSpellsReader:
+    """Read the spells DataFrame reloading only the changed .json files.
+
+    Parameters
+    ----------
+    path_prefix : str, default="./data/"
+        The spells folder or bundled file. A bundled file is read at once, so
+        all of its spells are reloaded whenever it changes.
+    config_path : Path, default=Path("./dfs/schema_config.json")
+        The path to the schema configuration file. If it changes, all the
+        spells are reloaded.
+    sort_by : list[str] | None, default=None
+        The list of columns to sort the DataFrame by. The default is
+        ['nivel', 'nome'].
+    verbose : bool, default=False
+        If True, prints which files were reloaded.
+    validate : bool, default=True
+        If False, the schema isn't validated, and the validation cache is
+        trusted instead (see `df_reader.get_asserted_spells_df`).
+
+    Attributes
+    ----------
+    files_fingerprint : dict[str, tuple[int, int, str]]
+        The modification time, size and hash of each spell file read. The
+        spells of a bundled file share the fingerprint of the bundled file.
+        It might be restored, e.g. from a saved search index, so the files
+        which didn't change since then aren't read again.
+    """
+
+    def __init__(
+        self,
+        path_prefix: str = "./data/",
+        config_path: Path = Path("./dfs/schema_config.json"),
+        sort_by: list[str] | None = None,
+        verbose: bool = False,
+        validate: bool = True,
+    ):
+        self.path_prefix = path_prefix
+        self.config_path = config_path
+        self.sort_by = sort_by if sort_by is not None else ["nivel", "nome"]
+        self.verbose = verbose
+        self.validate = validate
+
+        self._config_hash: str | None = None
+        self._config: dict[str, Any] = dict()
+        self.files_fingerprint: dict[str, tuple[int, int, str]] = dict()
+        # prepared spells indexed by their file name
+        self._spells_df: pd.DataFrame | None = None
+        # the last returned DataFrame (None while outdated)
+        self._sorted_df: pd.DataFrame | None = None
+
+    def get_asserted_spells_df(self) -> pd.DataFrame:
+        """Return the spells DataFrame with the schema asserted.
+
+        Only the files that changed since the last call are read again. The
+        same DataFrame is returned while nothing changes, so it must not be
+        modified in place.
+        """
+        self._reload_config()
+        changed_spells, outdated_files = self.read_changed_spells()
+        if self.verbose:
+            removed_files = outdated_files - set(changed_spells)
+            print(
+                f"Spells reloaded: {len(changed_spells)} changed, "
+                f"{len(removed_files)} removed."
+            )
+        if self._sorted_df is not None and not outdated_files:
+            return self._sorted_df
+
+        is_merge = self._spells_df is not None and bool(outdated_files)
+        self._update_spells_df(outdated_files, changed_spells)
+
+        assert self._spells_df is not None  # This is to make mypy happy.
+        if self._spells_df.empty:
+            # there are no spells (and maybe no columns) to sort or validate
+            spells_df = self._spells_df.reindex(
+                columns=self._spells_df.columns.union(
+                    self._config["column_names"], sort=False
+                )
+            )
+            self._sorted_df = spells_df.reset_index(drop=True)
+            return self._sorted_df
+
+        spells_df = self._spells_df.sort_values(by=self.sort_by)
+        spells_df = spells_df.reset_index(drop=True)
+
+        if not self.validate:
+            reader._check_spells_df_using_cache(
+                spells_df, self.config_path, self.verbose
+            )
+        elif is_merge:
+            # the uniqueness can only be checked against all the spells
+            # pylint: disable-next=import-outside-toplevel
+            from .spells_schema import spells_schema
+
+            reader._validate_spells_df(
+                spells_df,
+                schema=spells_schema.select_columns(reader.UNIQUE_COLUMNS),
+            )
+        self._sorted_df = spells_df
+        return spells_df
+
+    def read_changed_spells(self) -> tuple[dict[str, Any], set[str]]:
+        """Read the spells whose files changed since the last call.
+
+        The files whose modification time and size didn't change aren't
+        read, and the ones whose content didn't change aren't parsed. The
+        invalid .json files are reported and forgotten, so they're read again
+        even if they don't change.
+
+        Returns
+        -------
+        tuple[dict[str, Any], set[str]]
+            The changed spells by their file name, and the outdated files
+            (i.e. the changed, removed and invalid ones), whose previous
+            spells must be dropped.
+        """
+        if (
+            storage.get_storage_format(self.path_prefix)
+            != storage.FOLDER_FORMAT
+        ):
+            return self._read_changed_bundle()
+
+        files = storage.get_spell_files(self.path_prefix)
+        files_stat = reader._get_files_fingerprint(self.path_prefix, files)
+
+        removed_files = set(self.files_fingerprint) - set(files_stat)
+        for file_name in removed_files:
+            del self.files_fingerprint[file_name]
+
+        changed_spells = dict()
+        invalid_files = set()
+        for file_name, file_stat in files_stat.items():
+            old_fingerprint = self.files_fingerprint.get(file_name)
+            if old_fingerprint is not None and old_fingerprint[:2] == file_stat:
+                continue
+
+            with open(f"{self.path_prefix}{file_name}", "rb") as file:
+                content = file.read()
+            content_hash = hashlib.sha1(content).hexdigest()
+            self.files_fingerprint[file_name] = (*file_stat, content_hash)
+            if (
+                old_fingerprint is not None
+                and old_fingerprint[2] == content_hash
+            ):
+                continue
+
+            try:
+                changed_spells[file_name] = json.loads(content)
+            except json.JSONDecodeError as e:
+                print(f"{file_name} is not a valid json file.")
+                print(e)
+                del self.files_fingerprint[file_name]
+                invalid_files.add(file_name)
+
+        outdated_files = removed_files | invalid_files | set(changed_spells)
+        return changed_spells, outdated_files
+
+    def _read_changed_bundle(self) -> tuple[dict[str, Any], set[str]]:
+        """Read all the spells of the bundled file, if it changed."""
+        file_stat = reader._get_files_fingerprint("", [self.path_prefix])[
+            self.path_prefix
+        ]
+        old_fingerprints = set(self.files_fingerprint.values())
+        if old_fingerprints and {x[:2] for x in old_fingerprints} == {
+            file_stat
+        }:
+            return dict(), set()
+
+        with open(self.path_prefix, "rb") as file:
+            content_hash = hashlib.sha1(file.read()).hexdigest()
+        if {x[2] for x in old_fingerprints} == {content_hash}:
+            self.files_fingerprint = {
+                file_name: (*file_stat, content_hash)
+                for file_name in self.files_fingerprint
+            }
+            return dict(), set()
+
+        spells, _ = storage.read_spells(self.path_prefix)
+        outdated_files = set(self.files_fingerprint) | set(spells)
+        self.files_fingerprint = {
+            file_name: (*file_stat, content_hash) for file_name in spells
+        }
+        return spells, outdated_files
+
+    def _reload_config(self) -> None:
+        """Reload the schema configuration and forget all spells if changed."""
+        with open(self.config_path, "rb") as file:
+            content = file.read()
+        config_hash = hashlib.sha1(content).hexdigest()
+
+        if config_hash != self._config_hash:
+            self._config_hash = config_hash
+            self._config = json.loads(content)
+            self.files_fingerprint = dict()
+            self._spells_df = None
+            self._sorted_df = None
+
+    def _update_spells_df(
+        self, outdated_files: set[str], changed_spells: dict[str, Any]
+    ) -> None:
+        """Drop the outdated spells and add the prepared changed spells."""
+        delta_df = pd.DataFrame(list(changed_spells.values()))
+        if not delta_df.empty:
+            if self._spells_df is not None:
+                # a changed spell might miss a column of the other spells, as
+                # it would be missing in the whole DataFrame
+                delta_df = delta_df.reindex(
+                    columns=delta_df.columns.union(
+                        self._spells_df.columns, sort=False
+                    )
+                )
+            delta_df = self._prepare_delta_df(delta_df)
+            if self.validate:
+                reader._validate_spells_df(delta_df, verbose=self.verbose)
+        delta_df.index = pd.Index(list(changed_spells), dtype="object")
+
+        if self._spells_df is None:
+            self._spells_df = delta_df
+            return
+
+        spells_df = self._spells_df.drop(
+            index=list(outdated_files & set(self._spells_df.index))
+        )
+        if not delta_df.empty:
+            delta_df = self._match_string_dtypes(delta_df, spells_df)
+            spells_df = pd.concat([spells_df, delta_df])
+        self._spells_df = spells_df
+
+    @staticmethod
+    def _match_string_dtypes(
+        delta_df: pd.DataFrame, spells_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Cast the changed spells string columns to the loaded dtypes.
+
+        Otherwise, a column filled with default values in the changed spells
+        would turn the whole column into an object column after the concat.
+        """
+        string_dtypes = {
+            column: dtype
+            for column, dtype in spells_df.dtypes.items()
+            if column in delta_df.columns and isinstance(dtype, pd.StringDtype)
+        }
+        return delta_df.astype(string_dtypes)
+
+    def _prepare_delta_df(self, delta_df: pd.DataFrame) -> pd.DataFrame:
+        """Fill the default values of the changed spells.
+
+        A few changed spells might not have all the optional columns, so the
+        missing ones are created before filling them.
+        """
+        delta_df = delta_df.copy()
+        for column in self._config["columns_default_values"]:
+            if column not in delta_df.columns:
+                delta_df[column] = None
+        return reader._prepare_spells_df(delta_df, self._config)
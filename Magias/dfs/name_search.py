@@ -0,0 +1,153 @@
+"""Fuzzy lookup of spells by their names.
+
+The players type the spells names with typos, and either in portuguese
+('nome') or in english ('name'). The `SpellNameIndex` is a trigram index of
+both names, so a lookup only compares the query with the names sharing at
+least one trigram with it, instead of computing the edit distance to every
+name:
+
+    index = SpellNameIndex(spells_df)
+    index.lookup("bola de fgo")  # [(position, score), ...]
+"""
+
+# Python Standard Libraries
+from collections import Counter
+
+# Third Party Libraries
+import numpy as np
+import pandas as pd
+
+# Local Folder Libraries
+from .text_search import normalize_text
+
+NAME_COLUMNS = ["nome", "name"]
+# the score of a name containing the whole query (e.g. 'bola' in 'Bola de
+# Fogo'), so partial names still find the spells. Shorter queries (e.g. 'a')
+# are contained by too many names, so they're only scored by their trigrams.
+CONTAINED_SCORE = 0.9
+MIN_CONTAINED_LENGTH = 3
+MIN_SCORE = 0.3
+
+
+def get_trigrams(name: str) -> set[str]:
+    """Return the trigrams of a normalized name, padded with spaces."""
+    padded_name = f"  {' '.join(normalize_text(name).split())} "
+    return {padded_name[i : i + 3] for i in range(len(padded_name) - 2)}
+
+
+class SpellNameIndex:
+    """Trigram index of the spells names.
+
+    The spells are identified by their position in the DataFrame. The index
+    is a snapshot of the DataFrame, so it must be built again if the names
+    change.
+
+    Parameters
+    ----------
+    spells_df : pd.DataFrame
+        The spells DataFrame.
+    columns : list[str], default=NAME_COLUMNS
+        The name columns to index. Missing columns are ignored.
+    """
+
+    def __init__(
+        self, spells_df: pd.DataFrame, columns: list[str] = NAME_COLUMNS
+    ):
+        # each entry is a name of a spell
+        self._positions: list[int] = list()
+        self._names: list[str] = list()
+        self._n_trigrams: list[int] = list()
+        # trigram -> entries having it
+        self._postings: dict[str, list[int]] = dict()
+
+        for column in columns:
+            if column not in spells_df.columns:
+                continue
+            for position, name in enumerate(spells_df[column]):
+                if not isinstance(name, str):
+                    continue
+                entry = len(self._names)
+                trigrams = get_trigrams(name)
+                self._positions.append(position)
+                self._names.append(" ".join(normalize_text(name).split()))
+                self._n_trigrams.append(len(trigrams))
+                for trigram in trigrams:
+                    self._postings.setdefault(trigram, list()).append(entry)
+
+    def lookup(
+        self, name: str, limit: int | None = 5, min_score: float = MIN_SCORE
+    ) -> list[tuple[int, float]]:
+        """Return the spells whose names best match the given name.
+
+        The score of a name is the Dice coefficient of its trigrams and the
+        query trigrams, or `CONTAINED_SCORE` if it contains the whole query
+        and the query has at least `MIN_CONTAINED_LENGTH` characters.
+        The score of a spell is the best score of its names.
+
+        Returns
+        -------
+        list[tuple[int, float]]
+            The position and score of the `limit` best spells (or of all of
+            them, if `limit` is None) scoring at least `min_score`, from the
+            best to the worst.
+        """
+        trigrams = get_trigrams(name)
+        normalized_name = " ".join(normalize_text(name).split())
+        if not normalized_name:
+            return list()
+
+        shared_trigrams: Counter[int] = Counter()
+        for trigram in trigrams:
+            shared_trigrams.update(self._postings.get(trigram, ()))
+
+        is_containable = len(normalized_name) >= MIN_CONTAINED_LENGTH
+        scores: dict[int, float] = dict()
+        for entry, n_shared in shared_trigrams.items():
+            score = 2 * n_shared / (len(trigrams) + self._n_trigrams[entry])
+            if is_containable and normalized_name in self._names[entry]:
+                score = max(score, CONTAINED_SCORE)
+            position = self._positions[entry]
+            if score >= min_score and score > scores.get(position, 0):
+                scores[position] = score
+
+        return sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limit]
+
+    def lookup_spells_df(
+        self,
+        spells_df: pd.DataFrame,
+        name: str,
+        limit: int | None = 5,
+        min_score: float = MIN_SCORE,
+    ) -> pd.DataFrame:
+        """Return the rows of the spells matching the given name.
+
+        The `spells_df` must be the indexed DataFrame. All the spells whose
+        names contain the given name (case insensitive, as the old substring
+        search) are returned, from the best to the worst match, followed by
+        the `limit` other spells best matching it (e.g. with typos).
+        """
+        is_contained = np.zeros(len(spells_df), dtype=bool)
+        for column in NAME_COLUMNS:
+            if column in spells_df.columns:
+                is_contained |= (
+                    spells_df[column]
+                    .str.contains(name, case=False, na=False)
+                    .to_numpy(dtype=bool)
+                )
+
+        matches = self.lookup(name, limit=None, min_score=0)
+        scores = dict(matches)
+        contained_positions = sorted(
+            np.flatnonzero(is_contained).tolist(),
+            key=lambda x: -scores.get(x, 0),
+        )
+        suggested_positions = [
+            position
+            for position, score in matches
+            if score >= min_score and not is_contained[position]
+        ][:limit]
+
+        positions = np.array(
+            contained_positions + suggested_positions, dtype=int
+        )
+        return spells_df.iloc[positions].copy()
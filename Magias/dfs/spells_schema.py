@@ -10,102 +10,18 @@ from re import Pattern
 from typing import Any
 
 # Third Party Libraries
+import pandas as pd
 from pandera import Check, Column, DataFrameSchema
 
-escola_possible_values = [
-    "elemental",
-    "necromancia",
-    "psíquica",
-    "ilusionista",
-    "invocação",
-    "espiritual",
-    "atrativa",
-    "musical",
-    "pura",
-    "receita",
-]
-elementos_possible_values = [
-    "ar",
-    "fogo",
-    "luz",
-    "metal",
-    "relâmpago",
-    "sombras",
-    "terra",
-    "veneno",
-    "água",
-]
-tags_possible_values = [
-    "area",
-    "buff",
-    "debuff",
-    "controle",
-    "utilidade",
-    "dano",
-    "defesa",
-    "cura",
-    "distância",
-    "corpo-a-corpo",
-    "toque",
-    "arma",
-    "comunicação",
-    "social",
-    "detecção",
-    "exploração",
-]
-classes_possible_values = [
-    "arqueiro",
-    "bardo",
-    "monge",
-    "ladino",
-    "guerreiro",
-    "mago",
-    "xamã",
-]
-dmg_effect_possible_values = [
-    "N/A",
-    # elements and schools
-    "ar",
-    "fogo",
-    "luz",
-    "metal",
-    "relâmpago",
-    "sombras",
-    "terra",
-    "veneno",
-    "água",
-    "elemental",
-    "psíquico",
-    "necrótico",
-    "energia",
-    # weapon damages
-    "concussão",
-    "perfurante",
-    "cortante",
-    # conditions
-    "cego",
-    "enfeitiçado",
-    "surdo",
-    "amedrontado",
-    "agarrado",
-    "incapacitado",
-    "invisível",
-    "paralisado",
-    "petrificado",
-    "envenenado",
-    "caído",
-    "contido",
-    "estunado",
-    "inconsciente",
-    "exausto",
-]
-source_possible_values = [
-    "LDJ",
-    "Tasha",
-    "Xanathar",
-    "Etc.",
-    "Homebrew",
-]
+# Local Folder Libraries
+from .spells_values import (
+    classes_possible_values,
+    dmg_effect_possible_values,
+    elementos_possible_values,
+    escola_possible_values,
+    source_possible_values,
+    tags_possible_values,
+)
 
 
 def check_list_values_are_valid(
@@ -128,8 +44,39 @@ def check_list_values_are_valid(
     return True
 
 
+def check_series_lists_are_valid(
+    series: pd.Series, possible_values: list[Any]
+) -> pd.Series:
+    """Check if all values in each list of a Series are valid.
+
+    It's the vectorized version of `check_list_values_are_valid`. The lists
+    are exploded, so each value is checked using `isin`, and then the results
+    are grouped back by the Series index. Empty lists and empty strings are
+    valid (the latter, because `check_list_values_are_valid` iterates over
+    the characters of a string), and the other values which aren't lists
+    (e.g. a single string) are invalid.
+
+    Unlike the element-wise check, which raises a TypeError for a value that
+    isn't iterable (e.g. a number), so the whole column fails with that
+    error, such a value is only an invalid row.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Series of lists to be checked. Its index must be unique.
+    possible_values : list[Any]
+        List of possible values.
+    """
+    # `explode` keeps the scalars as they are, so they must be rejected here
+    is_list = series.map(lambda x: isinstance(x, list))
+    is_empty = series.map(lambda x: isinstance(x, (list, str)) and not x)
+    is_valid = series.explode().isin(possible_values)
+    is_valid = is_valid.groupby(level=0, sort=False).all() & is_list
+    return is_valid | is_empty
+
+
 def CheckValidList(  # pylint: disable=invalid-name
-    possible_values: list[Any],
+    possible_values: list[Any], element_wise: bool = False
 ) -> Check:
     """Check if all values in a list are valid.
 
@@ -139,24 +86,49 @@ def CheckValidList(  # pylint: disable=invalid-name
     ----------
     possible_values : list[Any]
         List of possible values.
+    element_wise : bool, default=False
+        If True, the check runs a python function for each list. Otherwise,
+        all lists are checked at once using `check_series_lists_are_valid`.
     """
+    if element_wise:
+        check_fn = lambda x: check_list_values_are_valid(  # noqa
+            x, possible_values
+        )
+    else:
+        check_fn = lambda x: check_series_lists_are_valid(  # noqa
+            x, possible_values
+        )
+
     return Check(
-        lambda x: check_list_values_are_valid(x, possible_values),
+        check_fn,
         name="valid_list",
         error="Invalid list values.",
-        element_wise=True,
+        element_wise=element_wise,
         title="Valid List",
         description="Check if all values in a list are valid.",
     )
 
 
-def CheckRegex(regex: str | Pattern) -> Check:  # pylint: disable=invalid-name
-    """Check if a string matches a regex."""
+def CheckRegex(  # pylint: disable=invalid-name
+    regex: str | Pattern, element_wise: bool = False
+) -> Check:
+    """Check if a string matches a regex.
+
+    If `element_wise` is False, all strings are checked at once using
+    `Series.str.fullmatch`, and the values which aren't strings don't match,
+    so each of them is a failure case. The element-wise check raises a
+    TypeError for them instead, so the whole column fails with that error.
+    """
+    if element_wise:
+        check_fn = lambda x: bool(re.fullmatch(regex, x))  # noqa
+    else:
+        check_fn = lambda x: x.str.fullmatch(regex, na=False)  # noqa
+
     return Check(
-        lambda x: bool(re.fullmatch(regex, x)),
+        check_fn,
         name="regex",
         error="Regex failed.",
-        element_wise=True,
+        element_wise=element_wise,
         title="Regex",
         description="Check if a string matches a regex.",
     )
@@ -193,115 +165,128 @@ attack_save_regex = re.compile(
     r"$"
 )
 
-columns = {
-    "nome": Column(
-        dtype="str",
-        unique=True,
-    ),
-    "name": Column(
-        dtype="str",
-        unique=True,
-    ),
-    "nivel": Column(
-        dtype="int64",
-        checks=[
-            Check.greater_than_or_equal_to(min_value=0.0),
-            Check.less_than_or_equal_to(max_value=9.0),
-        ],
-    ),
-    "escola": Column(
-        dtype="object",
-        checks=[
-            CheckValidList(escola_possible_values),
-        ],
-    ),
-    "ritual": Column(
-        dtype="bool",
-    ),
-    "elementos": Column(
-        dtype="object",
-        checks=[
-            CheckValidList(elementos_possible_values),
-        ],
-    ),
-    "tempo_conjuracao": Column(
-        dtype="object",
-        checks=[
-            CheckRegex(tempo_conjuracao_regex),
-        ],
-    ),
-    "alcance_area": Column(
-        dtype="object",
-        checks=[
-            CheckRegex(alcance_regex),
-        ],
-    ),
-    "componentes": Column(
-        dtype="object",
-        checks=[
-            CheckRegex(componentes_regex),
-        ],
-    ),
-    "mana": Column(
-        dtype="int64",
-        checks=[
-            Check.greater_than_or_equal_to(min_value=0.0),
-        ],
-    ),
-    "duracao": Column(
-        dtype="str",
-        checks=[
-            CheckRegex(duracao_regex),
-        ],
-    ),
-    "attack_save": Column(
-        dtype="str",
-        checks=[
-            CheckRegex(attack_save_regex),
-        ],
-    ),
-    "dmg_effect": Column(
-        dtype="str",
-        checks=[
-            Check.isin(dmg_effect_possible_values),
-        ],
-    ),
-    "dmg": Column(
-        dtype="str",
-    ),
-    "classes": Column(
-        dtype="object",
-        checks=[
-            CheckValidList(classes_possible_values),
-        ],
-    ),
-    "tags": Column(
-        dtype="object",
-        checks=[
-            CheckValidList(tags_possible_values),
-        ],
-    ),
-    "descricao": Column(
-        dtype="str",
-    ),
-    "source": Column(
-        dtype="str",
-        checks=[
-            Check.isin(source_possible_values),
-        ],
-    ),
-    "mana_adicional": Column(
-        dtype="str",
-    ),
-    "magia_rara": Column(
-        dtype="bool",
-    ),
-}
-
-
-spells_schema = DataFrameSchema(
-    columns=columns,
-    coerce=True,
-)
 
-__all__ = ["spells_schema"]
+def get_spells_schema(element_wise: bool = False) -> DataFrameSchema:
+    """Return the spells schema.
+
+    Parameters
+    ----------
+    element_wise : bool, default=False
+        If True, the regex and list checks run a python function for each
+        value. Otherwise, they're vectorized. Both report the same failure
+        cases.
+    """
+    columns = {
+        "nome": Column(
+            dtype="str",
+            unique=True,
+        ),
+        "name": Column(
+            dtype="str",
+            unique=True,
+        ),
+        "nivel": Column(
+            dtype="int64",
+            checks=[
+                Check.greater_than_or_equal_to(min_value=0.0),
+                Check.less_than_or_equal_to(max_value=9.0),
+            ],
+        ),
+        "escola": Column(
+            dtype="object",
+            checks=[
+                CheckValidList(escola_possible_values, element_wise),
+            ],
+        ),
+        "ritual": Column(
+            dtype="bool",
+        ),
+        "elementos": Column(
+            dtype="object",
+            checks=[
+                CheckValidList(elementos_possible_values, element_wise),
+            ],
+        ),
+        "tempo_conjuracao": Column(
+            dtype="object",
+            checks=[
+                CheckRegex(tempo_conjuracao_regex, element_wise),
+            ],
+        ),
+        "alcance_area": Column(
+            dtype="object",
+            checks=[
+                CheckRegex(alcance_regex, element_wise),
+            ],
+        ),
+        "componentes": Column(
+            dtype="object",
+            checks=[
+                CheckRegex(componentes_regex, element_wise),
+            ],
+        ),
+        "mana": Column(
+            dtype="int64",
+            checks=[
+                Check.greater_than_or_equal_to(min_value=0.0),
+            ],
+        ),
+        "duracao": Column(
+            dtype="str",
+            checks=[
+                CheckRegex(duracao_regex, element_wise),
+            ],
+        ),
+        "attack_save": Column(
+            dtype="str",
+            checks=[
+                CheckRegex(attack_save_regex, element_wise),
+            ],
+        ),
+        "dmg_effect": Column(
+            dtype="str",
+            checks=[
+                Check.isin(dmg_effect_possible_values),
+            ],
+        ),
+        "dmg": Column(
+            dtype="str",
+        ),
+        "classes": Column(
+            dtype="object",
+            checks=[
+                CheckValidList(classes_possible_values, element_wise),
+            ],
+        ),
+        "tags": Column(
+            dtype="object",
+            checks=[
+                CheckValidList(tags_possible_values, element_wise),
+            ],
+        ),
+        "descricao": Column(
+            dtype="str",
+        ),
+        "source": Column(
+            dtype="str",
+            checks=[
+                Check.isin(source_possible_values),
+            ],
+        ),
+        "mana_adicional": Column(
+            dtype="str",
+        ),
+        "magia_rara": Column(
+            dtype="bool",
+        ),
+    }
+
+    return DataFrameSchema(
+        columns=columns,
+        coerce=True,
+    )
+
+
+spells_schema = get_spells_schema()
+
+__all__ = ["get_spells_schema", "spells_schema"]
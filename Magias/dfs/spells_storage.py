@@ -0,0 +1,293 @@
+"""Read and write the spells in the different storage formats.
+
+The spells can be stored in three formats:
+- folder: one .json file per spell inside a folder (e.g. './data/').
+- jsonl: all spells in a single JSON Lines file, one spell per line.
+- sqlite: all spells in a single SQLite file, one spell per row.
+
+The format is detected from the path, so every function here receives just a
+path. The bundled formats keep the name of the .json file of each spell, so
+the spells can be converted back and forth between all formats using
+`convert_spells`:
+
+    python -m dfs.spells_storage ./data/ ./spells.sqlite
+"""
+
+# Python Standard Libraries
+import argparse
+import glob
+import json
+import os
+from pathlib import Path
+import sqlite3
+from typing import Any
+
+FOLDER_FORMAT = "folder"
+JSONL_FORMAT = "jsonl"
+SQLITE_FORMAT = "sqlite"
+
+TEMPLATE_FILE_NAME = "_Template.json"
+JSONL_SUFFIXES = [".jsonl"]
+SQLITE_SUFFIXES = [".sqlite", ".sqlite3", ".db"]
+SQLITE_TABLE = "spells"
+SQLITE_INDEXED_COLUMNS = ["nome", "nivel"]
+# the spell keys in their original order
+SQLITE_KEYS_COLUMN = "_keys"
+
+
+def get_storage_format(path: str) -> str:
+    """Return the storage format of the spells in `path`.
+
+    Raises a ValueError if the path is neither a folder nor a bundled file.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in JSONL_SUFFIXES:
+        return JSONL_FORMAT
+    if suffix in SQLITE_SUFFIXES:
+        return SQLITE_FORMAT
+    if path.endswith("/") or os.path.isdir(path):
+        return FOLDER_FORMAT
+
+    raise ValueError(
+        f"'{path}' is not a spells folder nor a {JSONL_SUFFIXES} or"
+        f" {SQLITE_SUFFIXES} file."
+    )
+
+
+def get_spell_files(path_prefix: str) -> list[str]:
+    """Return the names of the spell .json files inside `path_prefix`."""
+    files = glob.glob(f"{path_prefix}*.json")
+    path_prefix_len = len(path_prefix)
+    files = list(map(lambda x: x[path_prefix_len:], files))
+    if TEMPLATE_FILE_NAME in files:
+        files.remove(TEMPLATE_FILE_NAME)
+    return files
+
+
+def read_spells(
+    path: str,
+    where: dict[str, list[Any]] | None = None,
+    columns: list[str] | None = None,
+) -> tuple[dict[str, dict[str, Any]], bool]:
+    """Read the spells stored in `path`, in any format.
+
+    Parameters
+    ----------
+    path : str
+        The spells folder (with a trailing slash) or bundled file.
+    where : dict[str, list[Any]] | None, default=None
+        Only for the sqlite format. Read only the spells whose columns have
+        one of the given values (e.g. {"nivel": [1, 2]}). The columns in
+        `SQLITE_INDEXED_COLUMNS` are indexed.
+    columns : list[str] | None, default=None
+        Read only these columns of each spell. Only the sqlite format avoids
+        decoding the other columns.
+
+    Returns
+    -------
+    spells : dict[str, dict[str, Any]]
+        The spells keyed by their .json file name.
+    all_valid : bool
+        Whether all spells were valid json.
+    """
+    storage_format = get_storage_format(path)
+    if where is not None and storage_format != SQLITE_FORMAT:
+        raise ValueError("Only the sqlite format supports partial loads.")
+
+    if storage_format == SQLITE_FORMAT:
+        return _read_sqlite(path, where, columns)
+
+    if storage_format == JSONL_FORMAT:
+        spells, all_valid = _read_jsonl(path)
+    else:
+        spells, all_valid = _read_folder(path)
+
+    if columns is not None:
+        spells = {
+            file_name: project_spell(spell, columns)
+            for file_name, spell in spells.items()
+        }
+    return spells, all_valid
+
+
+def project_spell(spell: dict[str, Any], columns: list[str]) -> dict[str, Any]:
+    """Return only the given columns of a spell, if present."""
+    return {column: spell[column] for column in columns if column in spell}
+
+
+def write_spells(path: str, spells: dict[str, dict[str, Any]]) -> None:
+    """Write the spells, keyed by their .json file name, into `path`.
+
+    Bundled files are overwritten. In a folder, only the spells files are
+    overwritten.
+    """
+    storage_format = get_storage_format(path)
+    if storage_format == JSONL_FORMAT:
+        _write_jsonl(path, spells)
+    elif storage_format == SQLITE_FORMAT:
+        _write_sqlite(path, spells)
+    else:
+        _write_folder(path, spells)
+
+
+def convert_spells(source: str, destination: str) -> None:
+    """Convert the spells from the `source` format into `destination`."""
+    spells, all_valid = read_spells(source)
+    if not all_valid:
+        raise ValueError(f"'{source}' has invalid spells.")
+    write_spells(destination, spells)
+
+
+def _read_folder(path_prefix: str) -> tuple[dict[str, dict[str, Any]], bool]:
+    spells = dict()
+    all_valid = True
+    for file_name in get_spell_files(path_prefix):
+        with open(f"{path_prefix}{file_name}", "r") as file:
+            try:
+                spells[file_name] = json.load(file)
+            except json.JSONDecodeError as e:
+                print(f"{file_name} is not a valid json file.")
+                print(e)
+                all_valid = False
+    return spells, all_valid
+
+
+def _write_folder(path_prefix: str, spells: dict[str, dict[str, Any]]) -> None:
+    os.makedirs(path_prefix, exist_ok=True)
+    for file_name, spell in spells.items():
+        with open(
+            os.path.join(path_prefix, file_name), "w", encoding="utf-8"
+        ) as file:
+            json.dump(spell, file, indent=4, ensure_ascii=False)
+            file.write("\n")
+
+
+def _read_jsonl(path: str) -> tuple[dict[str, dict[str, Any]], bool]:
+    spells = dict()
+    all_valid = True
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            try:
+                line_dict = json.loads(line)
+                spells[line_dict["file_name"]] = line_dict["spell"]
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                print(f"Line {line_number} of {path} is not a valid spell.")
+                print(e)
+                all_valid = False
+    return spells, all_valid
+
+
+def _write_jsonl(path: str, spells: dict[str, dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for file_name, spell in spells.items():
+            line_dict = {"file_name": file_name, "spell": spell}
+            file.write(json.dumps(line_dict, ensure_ascii=False) + "\n")
+
+
+def _read_sqlite(
+    path: str,
+    where: dict[str, list[Any]] | None = None,
+    columns: list[str] | None = None,
+) -> tuple[dict[str, dict[str, Any]], bool]:
+    # Every spell value is stored as json text, so it keeps its python type,
+    # and the `_keys` column keeps the original order of the spell keys.
+    with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as connection:
+        table_info = connection.execute(f"PRAGMA table_info({SQLITE_TABLE})")
+        selected_columns = [
+            row[1]
+            for row in table_info
+            if columns is None
+            or row[1] in columns
+            or row[1] in ["file_name", SQLITE_KEYS_COLUMN]
+        ]
+        selected_sql = ", ".join(f'"{column}"' for column in selected_columns)
+
+        query = f"SELECT {selected_sql} FROM {SQLITE_TABLE}"
+        parameters: list[str] = list()
+        if where:
+            conditions = list()
+            for column, values in where.items():
+                placeholders = ", ".join("?" * len(values))
+                conditions.append(f'"{column}" IN ({placeholders})')
+                parameters += [
+                    json.dumps(value, ensure_ascii=False) for value in values
+                ]
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY rowid"
+
+        rows = connection.execute(query, parameters).fetchall()
+    connection.close()
+
+    spells = dict()
+    for row in rows:
+        row_dict = dict(zip(selected_columns, row))
+        keys = json.loads(row_dict[SQLITE_KEYS_COLUMN])
+        spells[row_dict["file_name"]] = {
+            key: json.loads(row_dict[key]) for key in keys if key in row_dict
+        }
+    return spells, True
+
+
+def _write_sqlite(path: str, spells: dict[str, dict[str, Any]]) -> None:
+    columns: list[str] = list()
+    for spell in spells.values():
+        columns += [column for column in spell if column not in columns]
+
+    columns_sql = ", ".join(f'"{column}" TEXT' for column in columns)
+    placeholders = ", ".join("?" * (len(columns) + 2))
+    rows = [
+        [file_name, json.dumps(list(spell), ensure_ascii=False)]
+        + [
+            json.dumps(spell[column], ensure_ascii=False)
+            if column in spell
+            else None
+            for column in columns
+        ]
+        for file_name, spell in spells.items()
+    ]
+
+    if os.path.exists(path):
+        os.remove(path)
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            f"CREATE TABLE {SQLITE_TABLE} "
+            f"(file_name TEXT PRIMARY KEY, {SQLITE_KEYS_COLUMN} TEXT,"
+            f" {columns_sql})"
+        )
+        for column in SQLITE_INDEXED_COLUMNS:
+            if column in columns:
+                connection.execute(
+                    f'CREATE INDEX "{SQLITE_TABLE}_{column}" '
+                    f'ON {SQLITE_TABLE} ("{column}")'
+                )
+        connection.executemany(
+            f"INSERT INTO {SQLITE_TABLE} VALUES ({placeholders})", rows
+        )
+    connection.close()
+
+
+def parse_input_args():
+    """Parse the input arguments.
+
+    Returns
+    -------
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            "Convert the spells between the folder, JSON Lines and SQLite "
+            "formats. The format is detected from the path: folders must end "
+            f"with a '/', JSON Lines files with {JSONL_SUFFIXES} and SQLite "
+            f"files with {SQLITE_SUFFIXES}."
+        )
+    )
+    parser.add_argument("source", type=str, help="The spells to convert.")
+    parser.add_argument(
+        "destination", type=str, help="Where to write the converted spells."
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_input_args()
+    convert_spells(args.source, args.destination)
@@ -0,0 +1,100 @@
+"""The possible values of the spells columns.
+
+They're kept apart from `spells_schema`, so the modules which only need the
+possible values (e.g. `df_compact`) don't import pandera.
+"""
+
+escola_possible_values = [
+    "elemental",
+    "necromancia",
+    "psíquica",
+    "ilusionista",
+    "invocação",
+    "espiritual",
+    "atrativa",
+    "musical",
+    "pura",
+    "receita",
+]
+elementos_possible_values = [
+    "ar",
+    "fogo",
+    "luz",
+    "metal",
+    "relâmpago",
+    "sombras",
+    "terra",
+    "veneno",
+    "água",
+]
+tags_possible_values = [
+    "area",
+    "buff",
+    "debuff",
+    "controle",
+    "utilidade",
+    "dano",
+    "defesa",
+    "cura",
+    "distância",
+    "corpo-a-corpo",
+    "toque",
+    "arma",
+    "comunicação",
+    "social",
+    "detecção",
+    "exploração",
+]
+classes_possible_values = [
+    "arqueiro",
+    "bardo",
+    "monge",
+    "ladino",
+    "guerreiro",
+    "mago",
+    "xamã",
+]
+dmg_effect_possible_values = [
+    "N/A",
+    # elements and schools
+    "ar",
+    "fogo",
+    "luz",
+    "metal",
+    "relâmpago",
+    "sombras",
+    "terra",
+    "veneno",
+    "água",
+    "elemental",
+    "psíquico",
+    "necrótico",
+    "energia",
+    # weapon damages
+    "concussão",
+    "perfurante",
+    "cortante",
+    # conditions
+    "cego",
+    "enfeitiçado",
+    "surdo",
+    "amedrontado",
+    "agarrado",
+    "incapacitado",
+    "invisível",
+    "paralisado",
+    "petrificado",
+    "envenenado",
+    "caído",
+    "contido",
+    "estunado",
+    "inconsciente",
+    "exausto",
+]
+source_possible_values = [
+    "LDJ",
+    "Tasha",
+    "Xanathar",
+    "Etc.",
+    "Homebrew",
+]
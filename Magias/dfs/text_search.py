@@ -0,0 +1,306 @@
+"""Full-text search over the spells names and descriptions.
+
+The `SpellsSearchIndex` is an inverted index of the 'nome', 'name' and
+'descricao' of every spell, which ranks the spells with BM25F, i.e. BM25 with
+each field normalized by its own length and weighted (so a term of a short
+name counts more than the same term in a long description). The text is
+normalized before being indexed, so the search is case and accent insensitive
+(e.g. 'acao' finds 'ação'), and a query term ending with '*' matches every
+term with that prefix (e.g. 'conjur*' finds 'conjurar' and 'conjuração').
+
+The index is stored next to the spells (as the spells snapshot, see
+`df_reader`) and, when it's loaded, only the spells whose files were added,
+modified or removed are indexed again:
+
+    index = SpellsSearchIndex("./data/")
+    index.search("bola de fogo")  # [("Bola de Fogo.json", 12.3), ...]
+"""
+
+# Python Standard Libraries
+import bisect
+from collections import Counter
+import math
+import os
+from pathlib import Path
+import pickle
+import re
+import tempfile
+from typing import Any
+import unicodedata
+
+# Third Party Libraries
+import pandas as pd
+
+# Local Folder Libraries
+from . import df_reader as reader
+from .incremental_reader import IncrementalSpellsReader
+
+SEARCH_INDEX_FILE_NAME = ".spells_search_index.pkl"
+SEARCH_INDEX_VERSION = 3
+# the terms of the names count more than the terms of the description
+FIELD_WEIGHTS = {"nome": 10.0, "name": 10.0, "descricao": 1.0}
+# the length normalization of each field
+FIELD_B = {"nome": 0.5, "name": 0.5, "descricao": 0.75}
+# the saturation of the weighted frequencies, high enough so a term of the
+# name still counts more than a few terms of the description
+BM25_K1 = 2.0
+PREFIX_MARK = "*"
+
+_term_regex = re.compile(r"[^\W_]+")
+_query_term_regex = re.compile(r"[^\W_]+\*?")
+
+
+def normalize_text(text: str) -> str:
+    """Return the text in lower case and without accents."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(x for x in text if not unicodedata.combining(x))
+    return text.casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """Return the normalized terms of a text."""
+    return _term_regex.findall(normalize_text(text))
+
+
+class SpellsSearchIndex:
+    """Inverted index of the spells names and descriptions.
+
+    Each spell is a document identified by its .json file name (which the
+    bundled formats also keep, see `spells_storage`).
+
+    Parameters
+    ----------
+    path_prefix : str, default="./data/"
+        The spells folder or bundled file.
+    use_cache : bool, default=True
+        If True, the index is loaded from and saved to a file next to the
+        spells, and only the changed spells are indexed again.
+    verbose : bool, default=False
+        If True, prints how many spells were indexed.
+    """
+
+    def __init__(
+        self,
+        path_prefix: str = "./data/",
+        use_cache: bool = True,
+        verbose: bool = False,
+    ):
+        self.path_prefix = path_prefix
+        self.use_cache = use_cache
+        self.verbose = verbose
+
+        # reads only the spell files changed since the index was updated
+        self._spells_reader = IncrementalSpellsReader(path_prefix)
+        # file name -> spell 'nome'
+        self._names: dict[str, str] = dict()
+        # file name -> field -> frequency of each term of the field
+        self._documents: dict[str, dict[str, dict[str, int]]] = dict()
+        # file name -> number of terms of each field
+        self._lengths: dict[str, dict[str, int]] = dict()
+        # term -> file name -> frequency of the term in each field
+        self._postings: dict[str, dict[str, dict[str, int]]] = dict()
+        # field -> number of terms of the field in all spells
+        self._total_lengths: Counter[str] = Counter()
+        # sorted terms, for the prefix queries (None while outdated)
+        self._terms: list[str] | None = None
+
+        if use_cache:
+            self._load()
+        self.update()
+
+    def update(self) -> bool:
+        """Index the spells added or modified, and drop the removed ones.
+
+        Returns whether the index changed. The index is saved if it did.
+        """
+        spells, outdated_files = self._spells_reader.read_changed_spells()
+        if not outdated_files:
+            return False
+
+        for file_name in outdated_files:
+            self._remove_document(file_name)
+        for file_name, spell in spells.items():
+            self._add_document(file_name, spell)
+
+        self._terms = None
+        if self.verbose:
+            n_removed = len(outdated_files - set(spells))
+            print(
+                f"{len(spells)} spells indexed and {n_removed} removed from "
+                "the search index."
+            )
+        if self.use_cache:
+            self._save()
+        return True
+
+    def search(
+        self, query: str, limit: int | None = 10
+    ) -> list[tuple[str, float]]:
+        """Return the spells matching any term of the query, by relevance.
+
+        A query term ending with '*' matches every term with that prefix.
+
+        Returns
+        -------
+        list[tuple[str, float]]
+            The file name and BM25 score of the `limit` best spells (or of all
+            of them, if `limit` is None), from the best to the worst.
+        """
+        scores: Counter[str] = Counter()
+        for query_term in _query_term_regex.findall(normalize_text(query)):
+            if query_term.endswith(PREFIX_MARK):
+                terms = self._get_prefix_terms(query_term[:-1])
+            else:
+                terms = [query_term]
+
+            # a prefix counts as a single term, scored by its best match
+            term_scores: dict[str, float] = dict()
+            for term in terms:
+                for file_name, score in self._get_term_scores(term).items():
+                    if score > term_scores.get(file_name, 0):
+                        term_scores[file_name] = score
+            scores.update(term_scores)
+
+        return sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limit]
+
+    def search_names(self, query: str, limit: int | None = 10) -> list[str]:
+        """Return the 'nome' of the best spells matching the query."""
+        return [
+            self._names[file_name] for file_name, _ in self.search(query, limit)
+        ]
+
+    def search_spells_df(
+        self, spells_df: pd.DataFrame, query: str, limit: int | None = 10
+    ) -> pd.DataFrame:
+        """Return the rows of the best spells matching the query.
+
+        The rows are matched by their 'nome', and sorted by relevance.
+        """
+        names = self.search_names(query, limit)
+        positions = pd.Index(spells_df["nome"]).get_indexer(names)
+        return spells_df.iloc[positions[positions >= 0]].copy()
+
+    def _get_term_scores(self, term: str) -> dict[str, float]:
+        """Return the BM25F score of the term for each spell having it.
+
+        The frequency of the term in each field is normalized by the field
+        length and weighted, and the sum of the fields is saturated once, so
+        a term repeated in many fields doesn't count as many terms.
+        """
+        postings = self._postings.get(term)
+        if not postings:
+            return dict()
+
+        n_documents = len(self._documents)
+        average_lengths = {
+            field: self._total_lengths[field] / n_documents
+            for field in FIELD_WEIGHTS
+        }
+        idf = math.log(
+            1 + (n_documents - len(postings) + 0.5) / (len(postings) + 0.5)
+        )
+
+        scores = dict()
+        for file_name, field_frequencies in postings.items():
+            lengths = self._lengths[file_name]
+            frequency = 0.0
+            for field, field_frequency in field_frequencies.items():
+                norm = (
+                    1
+                    - FIELD_B[field]
+                    + FIELD_B[field]
+                    * lengths.get(field, 0)
+                    / max(average_lengths[field], 1)
+                )
+                frequency += FIELD_WEIGHTS[field] * field_frequency / norm
+            scores[file_name] = (
+                idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1)
+            )
+        return scores
+
+    def _get_prefix_terms(self, prefix: str) -> list[str]:
+        """Return the indexed terms starting with the prefix."""
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\U0010ffff")
+        return self._terms[start:end]
+
+    def _add_document(self, file_name: str, spell: dict[str, Any]) -> None:
+        fields_frequencies = dict()
+        for field in FIELD_WEIGHTS:
+            value = spell.get(field)
+            if isinstance(value, str):
+                fields_frequencies[field] = dict(Counter(tokenize(value)))
+
+        self._names[file_name] = spell.get("nome", "")
+        self._index_document(file_name, fields_frequencies)
+
+    def _index_document(
+        self, file_name: str, fields_frequencies: dict[str, dict[str, int]]
+    ) -> None:
+        self._documents[file_name] = fields_frequencies
+        self._lengths[file_name] = {
+            field: sum(frequencies.values())
+            for field, frequencies in fields_frequencies.items()
+        }
+        self._total_lengths.update(self._lengths[file_name])
+        for field, frequencies in fields_frequencies.items():
+            for term, frequency in frequencies.items():
+                postings = self._postings.setdefault(term, dict())
+                postings.setdefault(file_name, dict())[field] = frequency
+
+    def _remove_document(self, file_name: str) -> None:
+        fields_frequencies = self._documents.pop(file_name, None)
+        if fields_frequencies is None:
+            return
+
+        del self._names[file_name]
+        self._total_lengths.subtract(self._lengths.pop(file_name))
+        for frequencies in fields_frequencies.values():
+            for term in frequencies:
+                postings = self._postings[term]
+                postings.pop(file_name, None)
+                if not postings:
+                    del self._postings[term]
+
+    def _get_index_path(self) -> Path:
+        snapshot_path = reader._get_snapshot_path(self.path_prefix)
+        return snapshot_path.with_name(
+            snapshot_path.name.replace(
+                reader.SNAPSHOT_FILE_NAME, SEARCH_INDEX_FILE_NAME
+            )
+        )
+
+    def _load(self) -> None:
+        """Load the index saved next to the spells, if any."""
+        try:
+            with open(self._get_index_path(), "rb") as file:
+                saved_index = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return
+        if saved_index.get("version") != SEARCH_INDEX_VERSION:
+            return
+
+        self._spells_reader.files_fingerprint = saved_index["fingerprint"]
+        self._names = saved_index["names"]
+        for file_name, fields_frequencies in saved_index["documents"].items():
+            self._index_document(file_name, fields_frequencies)
+
+    def _save(self) -> None:
+        """Save the index next to the spells, atomically."""
+        index_path = self._get_index_path()
+        saved_index = {
+            "version": SEARCH_INDEX_VERSION,
+            "fingerprint": self._spells_reader.files_fingerprint,
+            "names": self._names,
+            "documents": self._documents,
+        }
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=index_path.parent, delete=False
+            ) as file:
+                pickle.dump(saved_index, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(file.name, index_path)
+        except OSError as e:
+            print(f"Could not save the search index: {e}")
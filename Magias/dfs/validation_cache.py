@@ -0,0 +1,92 @@
+"""Remember which spells already passed the schema validation.
+
+Each spell row is identified by a hash of its contents, and the cache is only
+valid for a given version of the schema, which is the hash of the
+`spells_schema.py` and `spells_values.py` sources and of the schema
+configuration file. So, editing a spell, the schema or its configuration
+makes the affected rows be validated again.
+"""
+
+# Python Standard Libraries
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any
+
+# Third Party Libraries
+import pandas as pd
+
+VALIDATION_CACHE_FILE_NAME = ".spells_validation_cache.json"
+SPELLS_SCHEMA_PATH = Path(__file__).parent / "spells_schema.py"
+SPELLS_VALUES_PATH = Path(__file__).parent / "spells_values.py"
+
+
+def get_row_hash(row: dict[str, Any]) -> str:
+    """Return a stable hash of the contents of a spell row."""
+    row_json = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(row_json.encode("utf-8")).hexdigest()
+
+
+def get_rows_hash(spells_df: pd.DataFrame) -> pd.Series:
+    """Return the hash of each row of the spells DataFrame."""
+    rows_hash = map(get_row_hash, spells_df.to_dict("records"))
+    return pd.Series(list(rows_hash), index=spells_df.index, dtype="object")
+
+
+def get_schema_version(config_path: Path) -> str:
+    """Return the version of the schema and of its configuration file."""
+    schema_hash = hashlib.sha1()
+    for path in [SPELLS_SCHEMA_PATH, SPELLS_VALUES_PATH, Path(config_path)]:
+        with open(path, "rb") as file:
+            schema_hash.update(file.read())
+    return schema_hash.hexdigest()
+
+
+class ValidationCache:
+    """The hashes of the spell rows which passed the schema validation.
+
+    The cache is stored next to the schema configuration file, and it's
+    discarded if the schema version changes.
+
+    Parameters
+    ----------
+    config_path : Path
+        The path to the schema configuration file.
+    """
+
+    def __init__(self, config_path: Path):
+        self.path = Path(config_path).parent / VALIDATION_CACHE_FILE_NAME
+        self.version = get_schema_version(config_path)
+        self.rows_hash: set[str] = set()
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                cache = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        if cache.get("version") == self.version:
+            self.rows_hash = set(cache.get("rows_hash", []))
+
+    def is_validated(self, rows_hash: pd.Series) -> pd.Series:
+        """Return a boolean Series, True for the rows already validated."""
+        return rows_hash.isin(self.rows_hash)
+
+    def save(self, rows_hash: pd.Series) -> None:
+        """Save the given validated rows, replacing the cached ones.
+
+        Only the current rows are kept, so the cache doesn't grow with every
+        edit of a spell.
+        """
+        self.rows_hash = set(rows_hash)
+        cache = {"version": self.version, "rows_hash": sorted(self.rows_hash)}
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.path.parent, delete=False, encoding="utf-8"
+            ) as file:
+                json.dump(cache, file)
+            os.replace(file.name, self.path)
+        except OSError as e:
+            print(f"Could not save the validation cache: {e}")
@@ -1,5 +1,8 @@
 """Module for function that calculate the mean and standard deviation of a
 formula of dice.
+
+For the whole distribution of a formula (e.g. its percentiles and tails), see
+the `dice_distribution` module.
 """
 
 # Python Standard Libraries
@@ -7,6 +10,13 @@ from functools import reduce
 from operator import add
 import re
 
+# Local Folder Libraries
+try:
+    from .dice_distribution import parse_dice_formula
+except ImportError:
+    # imported from the 'dice' folder, as the Dice notebook does
+    from dice_distribution import parse_dice_formula
+
 
 def check_dice_format(formula: str) -> bool:
     """Returns true if a string is a valid dice formula.
@@ -66,10 +76,19 @@ def dice_sum_mean(dice_formula: str):
     return reduce(add, map(die_mean, dice))
 
 
+def die_variance(die_format: str):
+    """Return the variance for a given die format "XdY".
+
+    The dice are independent, so the variance of their sum is the sum of the
+    variance of each die, (Y^2 - 1) / 12.
+    """
+    num_dice, type_die = die_format_to_ints(die_format)
+    return num_dice * (type_die**2 - 1) / 12
+
+
 def die_std(die_format: str):
     """Return the standard deviation for a given die format "XdY"."""
-    num_dice, type_die = die_format_to_ints(die_format)
-    return ((num_dice**2) * (type_die**2 - 1) / 12) ** 0.5
+    return die_variance(die_format) ** 0.5
 
 
 def dice_sum_std(dice_formula: str):
@@ -77,7 +96,7 @@ def dice_sum_std(dice_formula: str):
     if not check_dice_format(dice_formula):
         return 0
     dice = [dice.strip() for dice in dice_formula.split("+")]
-    return reduce(add, map(die_std, dice))
+    return reduce(add, map(die_variance, dice)) ** 0.5
 
 
 def formula_to_mean_eval_str(str_formula: str):
@@ -88,19 +107,6 @@ def formula_to_mean_eval_str(str_formula: str):
     return eval_str
 
 
-def formula_to_std_eval_str(str_formula: str):
-    """Eval the standard deviation of a given formula of dice.
-
-    IMPORTANT: this function doesn't return the right value if there are
-    constants in the formula like "6d8 + 4", this will return the correct std
-    plus 4.
-    """
-    eval_str = re.sub(
-        r"\d+d\d+", lambda x: f"die_std('{x.group(0)}')", str_formula
-    )
-    return eval_str
-
-
 def get_dice_formula_mean(dice_formula):
     """Main function to calculate the mean of a dice formula. It checks the
     format and return the mean.
@@ -112,16 +118,19 @@ def get_dice_formula_mean(dice_formula):
 
 
 def get_dice_formula_std(dice_formula):
-    """Main function to calculate the mean of a dice formula. It checks the
-    format and return the mean.
+    """Main function to calculate the standard deviation of a dice formula.
 
-    IMPORTANT: this function doesn't return the right value if there are
-    constants in the formula like "6d8 + 4", this will return the correct std
-    plus 4. This must be fixed.
+    The dice of the formula are independent, so its variance is the sum of
+    the variances of its dice, whether they're summed or subtracted, and the
+    constants (e.g. the 4 of "6d8 + 4") don't change it.
     """
-    # TODO: change the eval to remove constants. Right now we're summing or
-    # subtracting constants from the std
-    if not check_dice_format(dice_formula):
+    try:
+        dice_terms, _ = parse_dice_formula(dice_formula)
+    except ValueError as e:
+        print(e)
         return 0
-    eval_str = formula_to_std_eval_str(dice_formula)
-    return eval(eval_str)  # pylint: disable=eval-used
+    variance = sum(
+        die_variance(f"{num_dice}d{type_die}")
+        for _, num_dice, type_die in dice_terms
+    )
+    return variance**0.5
@@ -0,0 +1,256 @@
+"""Module for the exact probability distribution of a formula of dice.
+
+The `dice_calculator` module only gives the mean and standard deviation of a
+formula, but balancing the spells damages needs their tails too (e.g. the
+chance of dealing at least 30 damage). Here, the probability mass function
+(PMF) of a formula such as "4d10 + 2d6 + 5" is computed exactly, by
+convolving the PMFs of its dice:
+
+    distribution = get_dice_distribution("4d10 + 2d6 + 5")
+    distribution.mean, distribution.std
+    distribution.prob_at_least([20, 30, 40])  # P(X >= k) for each k
+    distribution.percentile([5, 50, 95])
+
+The PMF of each number of dice of each kind is memoized, and so is the
+distribution of each formula, since many spells share the same damage.
+"""
+
+# Python Standard Libraries
+from functools import lru_cache
+import re
+
+# Third Party Libraries
+import numpy as np
+
+# the PMFs with at least this many values are convolved by FFT, and the
+# shorter ones directly, which is faster and has no rounding noise in the
+# tails
+FFT_MIN_LENGTH = 512
+# the tolerance of the cumulative probabilities, so the rounding errors
+# don't move a percentile to the next value
+CDF_TOLERANCE = 1e-12
+
+_term_regex = re.compile(r"\s*([+-])\s*(?:(\d*)d(\d+)|(\d+))\s*")
+
+
+def parse_dice_formula(
+    dice_formula: str,
+) -> tuple[tuple[tuple[int, int, int], ...], int]:
+    """Parse a formula of dice, such as "4d10 + 2d6 - 1d4 + 5".
+
+    The formula is a sum or subtraction of dice ("XdY", or "dY" for a
+    single die) and integer constants.
+
+    Returns
+    -------
+    tuple[tuple[tuple[int, int, int], ...], int]
+        The (sign, number of dice, die type) of each dice term, sorted, and
+        the sum of the constants.
+
+    Raises
+    ------
+    ValueError
+        If the formula isn't a valid formula of dice.
+    """
+    formula = dice_formula.strip()
+    if not formula.startswith(("+", "-")):
+        formula = f"+{formula}"
+
+    dice_terms = list()
+    constant = 0
+    position = 0
+    while position < len(formula):
+        match_obj = _term_regex.match(formula, position)
+        if match_obj is None:
+            raise ValueError(f"'{dice_formula}' is not a valid dice formula.")
+        sign_str, num_dice_str, type_die_str, constant_str = match_obj.groups()
+        sign = -1 if sign_str == "-" else 1
+        if constant_str is not None:
+            constant += sign * int(constant_str)
+        else:
+            num_dice = int(num_dice_str) if num_dice_str else 1
+            type_die = int(type_die_str)
+            if type_die < 1:
+                raise ValueError(f"'d{type_die}' is not a valid die.")
+            dice_terms.append((sign, num_dice, type_die))
+        position = match_obj.end()
+
+    return tuple(sorted(dice_terms)), constant
+
+
+def convolve(pmf_a: np.ndarray, pmf_b: np.ndarray) -> np.ndarray:
+    """Return the PMF of the sum of two independent variables.
+
+    Both PMFs start at the same offset (e.g. zero), and the result starts at
+    the sum of the offsets. The long PMFs are convolved by FFT.
+    """
+    if min(len(pmf_a), len(pmf_b)) < FFT_MIN_LENGTH:
+        return np.convolve(pmf_a, pmf_b)
+
+    length = len(pmf_a) + len(pmf_b) - 1
+    fft_length = 1 << (length - 1).bit_length()
+    pmf = np.fft.irfft(
+        np.fft.rfft(pmf_a, fft_length) * np.fft.rfft(pmf_b, fft_length),
+        fft_length,
+    )[:length]
+    # the FFT rounding errors might make the impossible sums negative
+    return np.clip(pmf, 0, None)
+
+
+@lru_cache(maxsize=None)
+def get_dice_pmf(num_dice: int, type_die: int) -> np.ndarray:
+    """Return the PMF of the sum of `num_dice` dice of `type_die` sides.
+
+    The position `i` of the PMF is the probability of the sum being
+    `num_dice + i`. The PMFs are memoized, and the halves of the dice are
+    convolved, so only about log2(num_dice) PMFs are computed for each die
+    type. The returned array is read-only, since it's shared.
+    """
+    if num_dice == 0:
+        pmf = np.ones(1)
+    elif num_dice == 1:
+        pmf = np.full(type_die, 1 / type_die)
+    else:
+        half = num_dice // 2
+        pmf = convolve(
+            get_dice_pmf(half, type_die),
+            get_dice_pmf(num_dice - half, type_die),
+        )
+    pmf.flags.writeable = False
+    return pmf
+
+
+class DiceDistribution:
+    """The exact probability distribution of a formula of dice.
+
+    Parameters
+    ----------
+    dice_formula : str
+        The formula of dice (see `parse_dice_formula`).
+
+    Attributes
+    ----------
+    min_value : int
+        The smallest possible result of the formula.
+    max_value : int
+        The largest possible result of the formula.
+    pmf : np.ndarray
+        The probability of each result, from `min_value` to `max_value`.
+    """
+
+    def __init__(self, dice_formula: str):
+        self.dice_formula = dice_formula
+        dice_terms, constant = parse_dice_formula(dice_formula)
+
+        pmf = np.ones(1)
+        min_value = constant
+        for sign, num_dice, type_die in dice_terms:
+            dice_pmf = get_dice_pmf(num_dice, type_die)
+            if sign > 0:
+                min_value += num_dice
+            else:
+                # subtracting dice reverses their PMF
+                dice_pmf = dice_pmf[::-1]
+                min_value -= num_dice * type_die
+            pmf = convolve(pmf, dice_pmf)
+
+        pmf = pmf / pmf.sum()
+        pmf.flags.writeable = False
+        self.pmf = pmf
+        self.min_value = min_value
+        self.max_value = min_value + len(pmf) - 1
+
+        # P(X >= min_value + i), with a trailing zero for the values above
+        # the maximum, and P(X < min_value + i), with a leading zero for the
+        # values below the minimum. Both are summed from their own tail, so
+        # the small probabilities of the tails are exact.
+        self._survival = np.append(np.cumsum(pmf[::-1])[::-1], 0.0)
+        self._cdf = np.append(0.0, np.cumsum(pmf))
+
+    @property
+    def values(self) -> np.ndarray:
+        """The possible results of the formula, in the order of the PMF."""
+        return np.arange(self.min_value, self.max_value + 1)
+
+    @property
+    def mean(self) -> float:
+        """The mean of the formula."""
+        return float(self.values @ self.pmf)
+
+    @property
+    def variance(self) -> float:
+        """The variance of the formula."""
+        return float(((self.values - self.mean) ** 2) @ self.pmf)
+
+    @property
+    def std(self) -> float:
+        """The standard deviation of the formula."""
+        return self.variance**0.5
+
+    def prob(self, k: int | np.ndarray) -> float | np.ndarray:
+        """Return P(X = k), vectorized over `k`."""
+        k = np.asarray(k)
+        in_range = (k >= self.min_value) & (k <= self.max_value)
+        positions = np.clip(k - self.min_value, 0, len(self.pmf) - 1)
+        return _to_scalar(np.where(in_range, self.pmf[positions], 0.0))
+
+    def prob_at_least(self, k: int | np.ndarray) -> float | np.ndarray:
+        """Return P(X >= k), vectorized over `k`."""
+        positions = np.clip(np.asarray(k) - self.min_value, 0, len(self.pmf))
+        return _to_scalar(self._survival[positions])
+
+    def prob_at_most(self, k: int | np.ndarray) -> float | np.ndarray:
+        """Return P(X <= k), vectorized over `k`."""
+        positions = np.clip(
+            np.asarray(k) - self.min_value + 1, 0, len(self.pmf)
+        )
+        return _to_scalar(self._cdf[positions])
+
+    def percentile(self, q: float | np.ndarray) -> int | np.ndarray:
+        """Return the `q`-th percentiles, vectorized over `q`.
+
+        The percentile is the smallest result whose cumulative probability is
+        at least `q` / 100, so it's always a possible result.
+        """
+        quantiles = np.asarray(q) / 100
+        positions = np.searchsorted(self._cdf[1:], quantiles - CDF_TOLERANCE)
+        positions = np.clip(positions, 0, len(self.pmf) - 1)
+        result = self.min_value + positions
+        if result.ndim == 0:
+            return int(result)
+        return result
+
+    def __repr__(self) -> str:
+        return (
+            f"DiceDistribution('{self.dice_formula}', mean={self.mean:.2f}, "
+            f"std={self.std:.2f})"
+        )
+
+
+@lru_cache(maxsize=None)
+def _get_dice_distribution(
+    dice_terms: tuple[tuple[int, int, int], ...], constant: int
+) -> DiceDistribution:
+    terms = [
+        f"{'-' if sign < 0 else '+'} {num_dice}d{type_die}"
+        for sign, num_dice, type_die in dice_terms
+    ]
+    if constant != 0 or not terms:
+        terms.append(f"{'-' if constant < 0 else '+'} {abs(constant)}")
+    return DiceDistribution(" ".join(terms).removeprefix("+ "))
+
+
+def get_dice_distribution(dice_formula: str) -> DiceDistribution:
+    """Return the distribution of a formula of dice, memoized.
+
+    The formulas with the same dice and constants (e.g. "2d6 + 1" and
+    "1 + 2d6") share the same distribution.
+    """
+    return _get_dice_distribution(*parse_dice_formula(dice_formula))
+
+
+def _to_scalar(array: np.ndarray) -> float | np.ndarray:
+    """Return a 0-dimensional array as a float."""
+    if array.ndim == 0:
+        return float(array)
+    return array
@@ -12,22 +12,128 @@ This script receives the following parameters:
 - sort_by: The list of columns to sort the DataFrame by. The default is
 ['nivel', 'name'].
 - verbose: If True, the progress bar will be shown. The default is False.
+- workers: The number of threads used to read the .json files. The default is
+None (i.e. the files are read serially).
+- render_workers: The number of processes used to render the spells into
+LaTeX. The default is None (i.e. the spells are rendered serially).
 - filter_json_path: The path to the .json file containing the filters. The
 default is None (i.e. no filter is performed).
 - output_tex_path: The path to the .tex file to export the spells. The default
 is 'latex_compilation/spells'. If the file already exists, it will be
 overwritten. The pdf file will be generated in the same folder with the same
 name.
+- manifest_path: The path to a .json file listing many handouts to export
+from the same spells (see `read_manifest`). The default is None (i.e. a
+single file is exported).
+- jobs: The number of handouts compiled at the same time, when a manifest is
+given. The default is None (i.e. the number of CPUs).
+- watch: If True, the spells are exported again whenever the spells, the
+filter or query file or the schema config change. The default is False.
+- no_validate: If True, the spells aren't validated, and the ones which
+didn't pass the validation before are only reported. The default is False.
+
+Most of the time of a small export is spent importing the libraries, so each
+function imports only what it uses, and pandera, tqdm and IPython are only
+imported when the spells are validated, the progress bar is shown or the
+spells are displayed in a notebook. With --verbose, the import time of each
+module imported until the spells are exported (or, with --watch, until the
+first export) is reported, as with `python -X importtime`, which also times
+the imports of this module.
 """
 
+# pylint: disable=import-outside-toplevel
+
 # Python Standard Libraries
 import argparse
+import builtins
+import contextlib
+import importlib.util
+import json
+from pathlib import Path
+import sys
+import time
+from typing import Any, Callable
+
+CONFIG_PATH = Path("./dfs/schema_config.json")
+# the imports faster than that aren't reported
+MIN_IMPORT_SECONDS = 0.01
+# the errors of an export caused by the inputs (e.g. an invalid filter file or
+# a query of an unknown column), which don't stop the watch
+WATCH_ERRORS = (OSError, ValueError, KeyError, NameError, SyntaxError)
+
+
+class ImportTimer:
+    """Time the modules imported while it's active, and report them at exit.
+
+    Like `python -X importtime`, the cumulative time of each module includes
+    the modules it imports, which are listed before it and indented. The
+    original `__import__` is restored at exit, so the imports after that
+    aren't slowed down.
+
+    Parameters
+    ----------
+    min_seconds : float, default=MIN_IMPORT_SECONDS
+        The imports faster than that aren't reported.
+    """
+
+    def __init__(self, min_seconds: float = MIN_IMPORT_SECONDS):
+        self.min_seconds = min_seconds
+        # (depth, module name, seconds) of each import, in the order they end
+        self.imports: list[tuple[int, str, float]] = list()
+        self._depth = 0
+        # the modules being imported, which might import themselves again
+        # (e.g. `from module import submodule`)
+        self._importing: set[str] = set()
+        self._original_import: Callable = builtins.__import__
+
+    def __enter__(self) -> "ImportTimer":
+        builtins.__import__ = self._timed_import
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        builtins.__import__ = self._original_import
+        self.print_report()
+
+    def print_report(self) -> None:
+        """Print the time of the slowest imports and the total import time."""
+        print("import time: cumulative [ms] | module")
+        for depth, name, seconds in self.imports:
+            if seconds >= self.min_seconds:
+                indent = "  " * depth
+                print(f"import time: {seconds * 1000:15.1f} | {indent}{name}")
+        total_seconds = sum(x[2] for x in self.imports if x[0] == 0)
+        print(f"Total import time: {total_seconds:.2f}s")
 
-# Third Party Libraries
-from dfs.df_filter import DFFilter, DFQuerrier
-import dfs.df_reader as reader
-import pandas as pd
-import spell.spell_exporter as exporter
+    def _timed_import(
+        self,
+        name: str,
+        import_globals: dict[str, Any] | None = None,
+        import_locals: dict[str, Any] | None = None,
+        fromlist: tuple[str, ...] = (),
+        level: int = 0,
+    ) -> Any:
+        args = (name, import_globals, import_locals, fromlist, level)
+        if level > 0:
+            package = (import_globals or {}).get("__package__")
+            try:
+                name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                return self._original_import(*args)
+        # only the first import of a module takes time
+        if name in sys.modules or name in self._importing:
+            return self._original_import(*args)
+
+        start_time = time.perf_counter()
+        self._depth += 1
+        self._importing.add(name)
+        try:
+            return self._original_import(*args)
+        finally:
+            self._importing.discard(name)
+            self._depth -= 1
+            self.imports.append(
+                (self._depth, name, time.perf_counter() - start_time)
+            )
 
 
 def parse_input_args():
@@ -50,7 +156,10 @@ def parse_input_args():
         "-i",
         type=str,
         default="./data/",
-        help="The path to the .json files. The default is './data/'.",
+        help=(
+            "The path to the .json files, or to a bundled .jsonl or .sqlite "
+            "file. The default is './data/'."
+        ),
     )
     parser.add_argument(
         "--sort_by",
@@ -69,6 +178,25 @@ def parse_input_args():
         default=False,
         help="If True, the progress bar will be shown. The default is False.",
     )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help=(
+            "The number of threads used to read the .json files. The default "
+            "is None (i.e. the files are read serially)."
+        ),
+    )
+    parser.add_argument(
+        "--render_workers",
+        type=int,
+        default=None,
+        help=(
+            "The number of processes used to render the spells into LaTeX. "
+            "The default is None (i.e. the spells are rendered serially)."
+        ),
+    )
     parser.add_argument(
         "--filter_path",
         "-F",
@@ -116,20 +244,231 @@ def parse_input_args():
         default=False,
         help="If True, deletes the .tex file. The default is False.",
     )
+    parser.add_argument(
+        "--manifest_path",
+        "-m",
+        type=str,
+        default=None,
+        help=(
+            "The path to a .json file listing many handouts to export from "
+            "the same spells. The default is None (i.e. a single file is "
+            "exported)."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help=(
+            "The number of handouts compiled at the same time, when a "
+            "manifest is given. The default is None (i.e. the number of "
+            "CPUs)."
+        ),
+    )
+    parser.add_argument(
+        "--no_validate",
+        "--no-validate",
+        action="store_true",
+        default=False,
+        help=(
+            "If True, the spells aren't validated (and pandera isn't "
+            "imported), and the ones which didn't pass the validation before "
+            "are only reported. The default is False."
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        "-W",
+        action="store_true",
+        default=False,
+        help=(
+            "If True, the spells are exported again whenever the spells, the "
+            "filter or query file or the schema config change. The default "
+            "is False."
+        ),
+    )
     args = parser.parse_args()
+    if args.watch and args.manifest_path is not None:
+        parser.error("--watch can't be used with --manifest_path.")
     return args
 
 
-def main() -> None:
-    """Execute main program."""
-    args = parse_input_args()
-    kwargs = {
-        "path_prefix": args.input_folder,
-        "sort_by": args.sort_by.split(","),
+def read_manifest(
+    manifest_path: str,
+) -> tuple[list[str], dict[str, dict[str, Any]], dict[str, str]]:
+    """Read the handouts of a manifest file.
+
+    The manifest must be a list of handouts with the following format:
+        [
+            {
+                "output_path": "handouts/wizard",
+                "filter": {"classes": ["mago"]},
+            },
+            {
+                "output_path": "handouts/fire",
+                "query_path": "queries/fire.txt",
+            },
+            ...
+        ]
+    where each handout may have either a "filter" dictionary, a
+    "filter_path", a "query" string or a "query_path". A handout without any
+    of them has all the spells.
+
+    Returns
+    -------
+    tuple[list[str], dict[str, dict[str, Any]], dict[str, str]]
+        The output paths of the handouts, and the filters and the queries by
+        the output paths of their handouts.
+    """
+    from dfs.df_filter import DFQuerrier
+
+    with open(manifest_path, "r", encoding="utf8") as file:
+        manifest = json.load(file)
+
+    output_paths = list()
+    filters = dict()
+    queries = dict()
+    for handout in manifest:
+        output_path = handout["output_path"]
+        output_paths.append(output_path)
+        if "filter" in handout:
+            filters[output_path] = handout["filter"]
+        elif "filter_path" in handout:
+            with open(handout["filter_path"], "r", encoding="utf8") as file:
+                filters[output_path] = json.load(file)
+        elif "query" in handout:
+            queries[output_path] = handout["query"]
+        elif "query_path" in handout:
+            queries[output_path] = DFQuerrier._read_query_file(
+                handout["query_path"]
+            )
+    return output_paths, filters, queries
+
+
+def export_manifest(args: argparse.Namespace, **kwargs) -> None:
+    """Export all the handouts of the manifest from the same spells.
+
+    The spells are read once, and the handouts are compiled concurrently,
+    each one in its own temporary folder. Exits with status 1 if any of them
+    fails.
+    """
+    from dfs.df_filter import DFBatch
+    import dfs.df_reader as reader
+    import spell.spell_exporter as exporter
+
+    output_paths, filters, queries = read_manifest(args.manifest_path)
+    spells_df = reader.get_asserted_spells_df(**kwargs)
+    # the handouts are filtered and exported by the same number of jobs,
+    # since `args.workers` is the number of threads reading the files
+    spells_dfs = DFBatch.batch_df(
+        spells_df, filters, queries, workers=args.jobs
+    )
+
+    handouts = {
+        output_path: spells_dfs.get(output_path, spells_df)
+        for output_path in output_paths
+    }
+    reports = exporter.export_handouts(
+        handouts, workers=args.jobs, verbose=True, delete_tex=args.delete_tex
+    )
+    if any(report["status"] != 0 for report in reports):
+        sys.exit(1)
+
+
+def watch_spells(
+    args: argparse.Namespace, startup: contextlib.ExitStack | None = None
+) -> None:
+    """Export the spells again whenever any of their inputs change.
+
+    The spells, the filter or query file and the schema config are watched
+    (see `FileWatcher`), and the spells are kept in memory between the
+    builds (see `IncrementalSpellsReader`), so each build only runs the
+    affected stages:
+    - a spell file changed: only that file is read and validated again, and
+    only its fragment is rendered again;
+    - the schema config changed: the spells are validated again;
+    - the filter or query file changed: the spells are filtered again.
+    The PDF file is only compiled again if its LaTeX changed (see
+    `spell_exporter.export_spells`).
+
+    The `startup` context (e.g. the `ImportTimer`) is closed after the first
+    export, so it isn't active while watching.
+    """
+    from dfs.df_filter import DFFilter, DFQuerrier
+    from dfs.df_index import SpellsIndex
+    from dfs.file_watcher import FileWatcher
+    from dfs.incremental_reader import IncrementalSpellsReader
+    import spell.spell_exporter as exporter
+
+    filter_path = args.filter_path or args.query_path
+    watched_paths = [args.input_folder, str(CONFIG_PATH)]
+    if filter_path is not None:
+        watched_paths.append(filter_path)
+
+    spells_reader = IncrementalSpellsReader(
+        args.input_folder,
+        CONFIG_PATH,
+        args.sort_by.split(","),
+        verbose=args.verbose,
+        validate=not args.no_validate,
+    )
+    export_kwargs = {
+        "filename": args.output_path,
         "verbose": args.verbose,
+        "delete_tex": args.delete_tex,
+        "workers": args.render_workers,
     }
 
-    spells_df: pd.DataFrame
+    with FileWatcher(watched_paths) as watcher:
+        if args.verbose and not watcher.uses_inotify:
+            print("inotify isn't available, polling the files instead.")
+
+        exported_df = None
+        indexed_df = None
+        changed_paths = set(watched_paths)
+        while True:
+            start_time = time.perf_counter()
+            try:
+                spells_df = spells_reader.get_asserted_spells_df()
+                if spells_df is not indexed_df:
+                    # the index (and its cached filters) is reused while the
+                    # spells don't change, e.g. when only the filter changes
+                    index = SpellsIndex(spells_df)
+                    indexed_df = spells_df
+                if spells_df is not exported_df or filter_path in changed_paths:
+                    if args.filter_path is not None:
+                        filtered_df = DFFilter.filter_df_using_json(
+                            spells_df, args.filter_path, index
+                        )
+                    elif args.query_path is not None:
+                        filtered_df = DFQuerrier.query_df_from_file(
+                            spells_df, args.query_path, index
+                        )
+                    else:
+                        filtered_df = spells_df
+                    exporter.export_spells(filtered_df, **export_kwargs)
+                    exported_df = spells_df
+                    print(
+                        f"{args.output_path}.pdf exported in "
+                        f"{time.perf_counter() - start_time:.2f}s."
+                    )
+            except WATCH_ERRORS as e:
+                # a broken spell, filter or query must not stop the watch
+                print(f"Could not export the spells: {e}")
+
+            if startup is not None:
+                startup.close()
+            print("Watching for changes...")
+            changed_paths = watcher.wait()
+
+
+def export_spells(args: argparse.Namespace, **kwargs) -> None:
+    """Export the filtered or queried spells into a single PDF file."""
+    from dfs.df_filter import DFFilter, DFQuerrier
+    import dfs.df_reader as reader
+    import spell.spell_exporter as exporter
+
     if args.filter_path is not None:
         spells_df = DFFilter.filter_spells_df_using_json(
             args.filter_path, **kwargs
@@ -146,9 +485,32 @@ def main() -> None:
         "verbose": args.verbose,
         "open_file": args.open_pdf,
         "delete_tex": args.delete_tex,
+        "workers": args.render_workers,
     }
     exporter.export_spells(spells_df, **kwargs)
 
 
+def main() -> None:
+    """Execute main program."""
+    args = parse_input_args()
+    kwargs = {
+        "path_prefix": args.input_folder,
+        "sort_by": args.sort_by.split(","),
+        "verbose": args.verbose,
+        "workers": args.workers,
+        "validate": not args.no_validate,
+    }
+
+    with contextlib.ExitStack() as startup:
+        if args.verbose:
+            startup.enter_context(ImportTimer())
+        if args.watch:
+            watch_spells(args, startup)
+        elif args.manifest_path is not None:
+            export_manifest(args, **kwargs)
+        else:
+            export_spells(args, **kwargs)
+
+
 if __name__ == "__main__":
     main()
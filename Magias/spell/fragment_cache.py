@@ -0,0 +1,163 @@
+"""This module caches the LaTeX fragment of each spell on disk.
+
+Rendering a spell is a pure function of its row, so each fragment is keyed by
+the hash of the row, of the kind of fragment (e.g. its description or its
+resume line) and of the renderer version. The renderer version is the hash of
+the modules which render the spells, so changing any of them invalidates all
+the fragments.
+
+Since the fragments are content addressed, editing a spell only renders that
+spell again. Each exported file has its own cache, stored next to it (see
+`get_fragment_cache_path`), which only keeps the fragments used by the last
+build of that file. All its fragments are stored in a single file, which is
+read once per build, since reading a file per fragment costs about as much as
+rendering it.
+"""
+
+# Python Standard Libraries
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+from typing import Any, Callable
+
+FRAGMENT_CACHE_SUFFIX = ".fragments.pkl"
+RENDERER_SOURCES = [
+    Path(__file__).parent / "spell_printer.py",
+    Path(__file__).parent / "spell_renderer.py",
+    Path(__file__).parent / "spell_format_converter.py",
+]
+
+
+def get_renderer_version() -> str:
+    """Return the hash of the sources of the modules rendering the spells."""
+    renderer_hash = hashlib.sha1()
+    for path in RENDERER_SOURCES:
+        with open(path, "rb") as file:
+            renderer_hash.update(file.read())
+    return renderer_hash.hexdigest()
+
+
+def get_fragment_cache_path(filename: str) -> Path:
+    """Return the path of the fragment cache of an exported file.
+
+    Parameters
+    ----------
+    filename : str
+        The file name without the .tex extension. The cache is a hidden file
+        in the same folder, so it doesn't depend on the working directory.
+    """
+    path = Path(filename)
+    return path.parent / f".{path.name}{FRAGMENT_CACHE_SUFFIX}"
+
+
+def get_fragment_key(kind: str, spell_row: dict[str, Any]) -> str:
+    """Return the key of a kind of fragment of a spell row.
+
+    The row values are python objects (e.g. str, int and lists of str), whose
+    repr is stable, and it's much faster than dumping the row to json.
+    """
+    row_repr = repr(sorted(spell_row.items()))
+    return hashlib.sha1(f"{kind}:{row_repr}".encode("utf-8")).hexdigest()
+
+
+class FragmentCache:
+    """On disk cache of the rendered fragments of the spells.
+
+    The fragments are loaded when the cache is created, and the ones used
+    since then are only written by `save`.
+
+    Parameters
+    ----------
+    cache_path : str | Path
+        The file where the fragments are stored (see
+        `get_fragment_cache_path`).
+    """
+
+    def __init__(self, cache_path: str | Path):
+        self.cache_path = Path(cache_path)
+        self.version = get_renderer_version()
+        self.hits = 0
+        self.misses = 0
+        # fragment key -> fragment
+        self._fragments: dict[str, str] = dict()
+        # the fragments looked up or stored since the cache was loaded
+        self._used_fragments: dict[str, str] = dict()
+
+        try:
+            with open(self.cache_path, "rb") as file:
+                cache = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return
+
+        if cache.get("version") == self.version:
+            self._fragments = cache["fragments"]
+
+    def get_fragment(
+        self,
+        kind: str,
+        spell_row: dict[str, Any],
+        render: Callable[[Any], str],
+    ) -> str:
+        """Return the cached fragment of a spell, rendering it if missing.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of fragment (e.g. 'description'), since the same row has
+            one fragment of each kind.
+        spell_row : dict[str, Any]
+            The spell row, whose content identifies the fragment.
+        render : Callable[[Any], str]
+            The function which renders the fragment from the spell row.
+        """
+        fragment = self.lookup(kind, spell_row)
+        if fragment is None:
+            fragment = render(spell_row)
+            self.store(kind, spell_row, fragment)
+        return fragment
+
+    def lookup(self, kind: str, spell_row: dict[str, Any]) -> str | None:
+        """Return the cached fragment of a spell, or None if it's missing."""
+        key = get_fragment_key(kind, spell_row)
+        fragment = self._fragments.get(key)
+        if fragment is not None:
+            self.hits += 1
+            self._used_fragments[key] = fragment
+        return fragment
+
+    def store(
+        self, kind: str, spell_row: dict[str, Any], fragment: str
+    ) -> None:
+        """Store the rendered fragment of a spell."""
+        key = get_fragment_key(kind, spell_row)
+        self.misses += 1
+        self._fragments[key] = fragment
+        self._used_fragments[key] = fragment
+
+    def save(self) -> None:
+        """Save the fragments used since the cache was loaded.
+
+        The other fragments (e.g. of deleted or edited spells, or of old
+        renderer versions) are dropped, so the cache only has the fragments of
+        the last build. It's only written if any fragment was rendered or
+        dropped, and it's written to a temporary file first, so a concurrent
+        build never sees a partially written cache.
+        """
+        if self.misses == 0 and len(self._used_fragments) == len(
+            self._fragments
+        ):
+            return
+
+        self._fragments = self._used_fragments
+        cache = {"version": self.version, "fragments": self._fragments}
+        try:
+            os.makedirs(self.cache_path.parent, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.cache_path.parent, delete=False
+            ) as file:
+                pickle.dump(cache, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(file.name, self.cache_path)
+        except OSError as e:
+            print(f"Could not save the spell fragments cache: {e}")
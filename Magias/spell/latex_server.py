@@ -0,0 +1,331 @@
+"""A long-lived LaTeX build server, which compiles the spells documents.
+
+Most of the time of a pdflatex run is spent loading the RPG_Adventure class
+and all of its packages. The server dumps the preamble of the documents (i.e.
+everything before '\\begin{document}', see `spell_exporter.LATEX_TEMPLATE`)
+into a precompiled format with mylatexformat, and compiles the documents
+using that format, so each compilation only typesets their body. The format
+is built again whenever the preamble or the class file changes.
+
+The server listens on a local socket, and it's started from the 'Magias'
+folder with:
+
+    python -m spell.latex_server
+
+Then `spell_exporter.compile_tex_file` submits its documents to the server
+(see `submit_job`), and it falls back to a plain pdflatex run while the
+server isn't running.
+"""
+
+# Python Standard Libraries
+import argparse
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import threading
+
+SOCKET_PATH = "./latex_compilation/.latex_server.sock"
+FORMAT_FOLDER = "./latex_compilation/"
+FORMAT_PREFIX = ".spells_preamble_"
+CLASS_FILE_NAME = "RPG_Adventure.cls"
+DOCUMENT_BEGIN = "\\begin{document}"
+# the seconds a client waits to connect to the server, and to get the answer
+# of a job without a timeout (or the extra seconds after its timeout)
+CONNECT_TIMEOUT = 1.0
+RESPONSE_TIMEOUT = 300.0
+
+
+def run_pdflatex(
+    filename: str,
+    options: list[str] | None = None,
+    verbose: bool = False,
+    timeout: float | None = None,
+) -> int:
+    """Run pdflatex over a LaTeX file, inside the folder of the file.
+
+    Parameters
+    ----------
+    filename : str
+        The file name without the .tex extension.
+    options : list[str] | None, default=None
+        Extra pdflatex options, e.g. the format to use.
+    verbose : bool, default=False
+        If True, prints the commands used.
+    timeout : float | None, default=None
+        The maximum seconds pdflatex might run. If it runs longer, it's killed
+        and a subprocess.TimeoutExpired is raised.
+
+    Returns
+    -------
+    int
+        The exit status of pdflatex, or 127 if it's not installed.
+    """
+    base_filename = os.path.basename(filename)
+    directory = os.path.dirname(filename) or "."
+
+    compile_cmd = [
+        "pdflatex",
+        *(options or list()),
+        "-no-file-line-error",
+        "-interaction",
+        "nonstopmode",
+        f"{base_filename}.tex",
+    ]
+    if verbose:
+        print(" ".join(compile_cmd))
+    try:
+        completed = subprocess.run(
+            compile_cmd,
+            cwd=directory,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
+            check=False,
+        )
+    except FileNotFoundError:
+        # the same exit status of a shell not finding the command
+        print("pdflatex was not found.")
+        return 127
+    finally:
+        # the .aux and .out files are kept, so the cross-references of the
+        # next compilation converge in a single pass
+        log_path = os.path.join(directory, f"{base_filename}.log")
+        if os.path.exists(log_path):
+            if verbose:
+                print(f"Deleting {log_path}")
+            os.remove(log_path)
+
+    return completed.returncode
+
+
+def get_preamble_hash(filename: str) -> str | None:
+    """Return the hash of the preamble of a LaTeX file and of its class.
+
+    Returns None if the file has no '\\begin{document}'.
+    """
+    with open(f"{filename}.tex", "r", encoding="utf-8") as file:
+        preamble = ""
+        for line in file:
+            if line.lstrip().startswith(DOCUMENT_BEGIN):
+                break
+            preamble += line
+        else:
+            return None
+
+    preamble_hash = hashlib.sha1(preamble.encode("utf-8"))
+    class_path = os.path.join(os.path.dirname(filename), CLASS_FILE_NAME)
+    if os.path.exists(class_path):
+        with open(class_path, "rb") as file:
+            preamble_hash.update(file.read())
+    return preamble_hash.hexdigest()
+
+
+class LatexBuildServer(socketserver.ThreadingUnixStreamServer):
+    """Compile the LaTeX files submitted through a local socket.
+
+    Each request is a json line with the file name (without the .tex
+    extension) and the timeout of the compilation, and it's answered with a
+    json line with the pdflatex exit status, or with whether it timed out.
+
+    Parameters
+    ----------
+    socket_path : str, default=SOCKET_PATH
+        The path of the socket where the server listens.
+    format_folder : str, default=FORMAT_FOLDER
+        The folder where the formats are dumped.
+    verbose : bool, default=False
+        If True, prints each compilation.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str = SOCKET_PATH,
+        format_folder: str = FORMAT_FOLDER,
+        verbose: bool = False,
+    ):
+        self.format_folder = os.path.abspath(format_folder)
+        self.verbose = verbose
+        # preamble hash -> format path (without the .fmt extension), or None
+        # if the format couldn't be built
+        self._formats: dict[str, str | None] = dict()
+        self._formats_lock = threading.Lock()
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _LatexJobHandler)
+
+    def compile(self, filename: str, timeout: float | None = None) -> int:
+        """Compile a LaTeX file using the format of its preamble.
+
+        If the format can't be built (e.g. mylatexformat isn't installed),
+        the file is compiled without it.
+        """
+        format_path = self.get_format(filename)
+        options = None if format_path is None else [f"-fmt={format_path}"]
+        return run_pdflatex(filename, options, self.verbose, timeout)
+
+    def get_format(self, filename: str) -> str | None:
+        """Return the format of the preamble of a file, building it once."""
+        preamble_hash = get_preamble_hash(filename)
+        if preamble_hash is None:
+            return None
+
+        with self._formats_lock:
+            if preamble_hash not in self._formats:
+                self._formats[preamble_hash] = self._build_format(
+                    filename, preamble_hash
+                )
+            return self._formats[preamble_hash]
+
+    def _build_format(self, filename: str, preamble_hash: str) -> str | None:
+        """Dump the preamble of a file into a format.
+
+        The format is built inside the folder of the file, so it finds the
+        same class file, and it's kept on disk, so a restarted server reuses
+        it.
+        """
+        format_name = f"{FORMAT_PREFIX}{preamble_hash[:16]}"
+        format_path = os.path.join(self.format_folder, format_name)
+        if os.path.exists(f"{format_path}.fmt"):
+            return format_path
+
+        build_cmd = [
+            "pdflatex",
+            "-ini",
+            "-interaction",
+            "nonstopmode",
+            f"-jobname={format_name}",
+            f"-output-directory={self.format_folder}",
+            "&pdflatex",
+            "mylatexformat.ltx",
+            f"{os.path.basename(filename)}.tex",
+        ]
+        if self.verbose:
+            print(" ".join(build_cmd))
+        try:
+            subprocess.run(
+                build_cmd,
+                cwd=os.path.dirname(filename) or ".",
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                check=False,
+            )
+        except FileNotFoundError:
+            return None
+
+        log_path = f"{format_path}.log"
+        if os.path.exists(log_path):
+            os.remove(log_path)
+        if not os.path.exists(f"{format_path}.fmt"):
+            print(f"Could not build the format of {filename}.tex.")
+            return None
+        return format_path
+
+
+class _LatexJobHandler(socketserver.StreamRequestHandler):
+    """Handle a compilation request of the `LatexBuildServer`."""
+
+    def handle(self):
+        request = json.loads(self.rfile.readline())
+        try:
+            response = {
+                "status": self.server.compile(
+                    request["filename"], request.get("timeout")
+                )
+            }
+        except subprocess.TimeoutExpired:
+            response = {"timeout": True}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def submit_job(
+    filename: str,
+    timeout: float | None = None,
+    socket_path: str = SOCKET_PATH,
+) -> int | None:
+    """Compile a LaTeX file using the build server.
+
+    Parameters
+    ----------
+    filename : str
+        The file name without the .tex extension.
+    timeout : float | None, default=None
+        The maximum seconds pdflatex might run. If it runs longer, a
+        subprocess.TimeoutExpired is raised.
+    socket_path : str, default=SOCKET_PATH
+        The path of the socket where the server listens.
+
+    Returns
+    -------
+    int | None
+        The exit status of pdflatex, or None if the server isn't running or
+        doesn't answer in time (see `RESPONSE_TIMEOUT`), so the file should
+        be compiled by `run_pdflatex`.
+    """
+    if not os.path.exists(socket_path):
+        return None
+
+    request = {"filename": os.path.abspath(filename), "timeout": timeout}
+    response_timeout = RESPONSE_TIMEOUT + (timeout or 0)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(socket_path)
+            client.settimeout(response_timeout)
+            client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with client.makefile("rb") as response_file:
+                response_line = response_file.readline()
+    except OSError:
+        # e.g. a stale socket file, or a server which is stuck
+        return None
+    if not response_line:
+        return None
+
+    response = json.loads(response_line)
+    if response.get("timeout"):
+        raise subprocess.TimeoutExpired("pdflatex", timeout)
+    return response["status"]
+
+
+def main() -> None:
+    """Run the build server until it's interrupted."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "A LaTeX build server, which compiles the spells documents using "
+            "a precompiled format of their preamble."
+        )
+    )
+    parser.add_argument(
+        "--socket_path",
+        "-s",
+        type=str,
+        default=SOCKET_PATH,
+        help=f"The path of the socket. The default is '{SOCKET_PATH}'.",
+    )
+    parser.add_argument(
+        "--verbose",
+        "-V",
+        "-v",
+        action="store_true",
+        default=False,
+        help="If True, prints each compilation. The default is False.",
+    )
+    args = parser.parse_args()
+
+    with LatexBuildServer(args.socket_path, verbose=args.verbose) as server:
+        print(f"Listening on {args.socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(args.socket_path)
+
+
+if __name__ == "__main__":
+    main()
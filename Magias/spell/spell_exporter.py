@@ -3,27 +3,34 @@ document, just using LaTeX markup language).
 """
 
 # Python Standard Libraries
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+from functools import partial
+import hashlib
+import itertools
+from operator import itemgetter
 import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Iterable, Iterator, TextIO
 
 # Third Party Libraries
-from IPython.display import clear_output
 from pandas import DataFrame
-from spell.spell_format_converter import get_latex_spells
-
-
-def export_tex_file(spells_df: DataFrame, filename: str, verbose: bool = False):
-    """Creates a LaTeX file with the spells contained in the dataframe.
-
-    Parameters
-    ----------
-    spells_df : DataFrame
-        A dataframe containing the spells.
-    filename : str
-        The file name without the .tex extension.
-    verbose : bool, default=False
-        If True, prints the commands used.
-    """
-    latex_tamplate = r"""
+from spell.fragment_cache import FragmentCache, get_fragment_cache_path
+import spell.latex_server as latex_server
+from spell.spell_format_converter import (
+    iter_latex_spells,
+    iter_latex_spells_description_parts,
+    iter_latex_spells_resume,
+)
+
+PARTS_FOLDER_SUFFIX = "_parts"
+# the hash of the inputs of the last successful compilation
+BUILD_HASH_SUFFIX = ".build_hash"
+LATEX_TEMPLATE = r"""
 %%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%
 
 \documentclass{RPG_Adventure}[2021/10/20]
@@ -49,80 +56,316 @@ def export_tex_file(spells_df: DataFrame, filename: str, verbose: bool = False):
 
 \end{document}
     """
+
+
+def export_tex_file(
+    spells_df: DataFrame,
+    filename: str,
+    verbose: bool = False,
+    use_cache: bool = True,
+    workers: int | None = None,
+    cache_filename: str | None = None,
+):
+    """Creates a LaTeX file with the spells contained in the dataframe.
+
+    Parameters
+    ----------
+    spells_df : DataFrame
+        A dataframe containing the spells.
+    filename : str
+        The file name without the .tex extension.
+    verbose : bool, default=False
+        If True, prints the commands used.
+    use_cache : bool, default=True
+        If True, the LaTeX of each spell is reused from the fragment cache
+        (see `fragment_cache`), and only the new or edited spells are
+        rendered.
+    workers : int | None, default=None
+        If greater than one, the spells are rendered by a process pool with
+        that many processes. The file is the same either way.
+    cache_filename : str | None, default=None
+        The file name whose fragment cache is used (see
+        `get_fragment_cache_path`). The default is `filename`.
+    """
     if verbose:
         print(f"Exporting {filename}.tex")
-
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+    # The spells are written between the template head and tail while they
+    # are converted, so the whole document is never held in memory.
+    template_head, template_tail = LATEX_TEMPLATE.replace("%%", "%").split("%s")
+    fragment_cache = None
+    if use_cache:
+        fragment_cache = FragmentCache(
+            get_fragment_cache_path(cache_filename or filename)
+        )
     with open(f"{filename}.tex", "w", encoding="utf-8") as file:
-        latex_text = get_latex_spells(spells_df)
-        latex_text = latex_tamplate % latex_text
-        file.write(latex_text)
-
+        file.write(template_head)
+        file.writelines(iter_latex_spells(spells_df, fragment_cache, workers))
+        file.write(template_tail)
+
+    if fragment_cache is not None:
+        fragment_cache.save()
+    if verbose and fragment_cache is not None:
+        print(
+            f"{fragment_cache.hits} spell fragments reused and "
+            f"{fragment_cache.misses} rendered."
+        )
 
-def compile_tex_file(filename: str, verbose: bool = False):
-    """Compiles a LaTeX file into a PDF file.
 
-    It's important to have the RPG_Adventure.cls file in the same folder as the
-    LaTeX file.
+def export_tex_parts(
+    spells_df: DataFrame,
+    filename: str,
+    verbose: bool = False,
+    use_cache: bool = True,
+    workers: int | None = None,
+    standalone_filename: str | None = None,
+) -> bool:
+    """Creates a LaTeX file which inputs one file per part of the spells.
+
+    The parts are the summary and the descriptions of each level (see
+    `iter_latex_spells_description_parts`), and they're written into the
+    '{filename}_parts' folder. Each file is only replaced if its content
+    changed, and the parts which no longer exist are deleted, so the files
+    are kept untouched while the spells don't change. As in
+    `export_tex_file`, the spells are written while they are converted.
 
     Parameters
     ----------
+    spells_df : DataFrame
+        A dataframe containing the spells.
     filename : str
         The file name without the .tex extension.
     verbose : bool, default=False
-        If True, prints the commands used.
+        If True, prints which files were written.
+    use_cache : bool, default=True
+        If True, the LaTeX of each spell is reused from the fragment cache.
+    workers : int | None, default=None
+        The number of processes used to render the spells.
+    standalone_filename : str | None, default=None
+        If given, a LaTeX file with the content of the parts (instead of
+        inputs of their files) is also written, with this file name without
+        the .tex extension.
+
+    Returns
+    -------
+    bool
+        Whether any part or input file was written or deleted.
+    """
+    parts_folder = f"{filename}{PARTS_FOLDER_SUFFIX}"
+    parts_folder_name = os.path.basename(parts_folder)
+    os.makedirs(parts_folder, exist_ok=True)
+    template_head, template_tail = LATEX_TEMPLATE.replace("%%", "%").split("%s")
+    fragment_cache = None
+    if use_cache:
+        fragment_cache = FragmentCache(get_fragment_cache_path(filename))
+
+    with contextlib.ExitStack() as stack:
+        standalone_file = None
+        if standalone_filename is not None:
+            if verbose:
+                print(f"Exporting {standalone_filename}.tex")
+            standalone_file = stack.enter_context(
+                open(f"{standalone_filename}.tex", "w", encoding="utf-8")
+            )
+            standalone_file.write(template_head)
+
+        part_names = list()
+        written_files = list()
+        for name, chunks in _iter_latex_parts(
+            spells_df, fragment_cache, workers
+        ):
+            part_path = os.path.join(parts_folder, f"{name}.tex")
+            if _write_if_changed(part_path, chunks, standalone_file):
+                written_files.append(part_path)
+            part_names.append(name)
+
+        if standalone_file is not None:
+            standalone_file.write(template_tail)
+
+    inputs = "\n".join(
+        r"\input{%s/%s}" % (parts_folder_name, name) for name in part_names
+    )
+    if _write_if_changed(f"{filename}.tex", [LATEX_TEMPLATE % inputs]):
+        written_files.append(f"{filename}.tex")
+
+    part_files = {f"{name}.tex" for name in part_names}
+    removed_files = set(os.listdir(parts_folder)) - part_files
+    for part_file in removed_files:
+        os.remove(os.path.join(parts_folder, part_file))
+
+    if fragment_cache is not None:
+        fragment_cache.save()
+    if verbose:
+        print(
+            f"Exporting {filename}.tex: {len(written_files)} files written "
+            f"and {len(removed_files)} removed."
+        )
+    return bool(written_files or removed_files)
+
+
+def _iter_latex_parts(
+    spells_df: DataFrame,
+    fragment_cache: FragmentCache | None = None,
+    workers: int | None = None,
+) -> Iterator[tuple[str, Iterator[str]]]:
+    """Yield the name and the LaTeX chunks of each part of the spells.
+
+    The chunks of each part must be consumed before the next part.
     """
-    base_filename = os.path.basename(filename)
-    directory = os.path.dirname(filename)
-    cwd = os.getcwd()
+    yield "sumario", iter_latex_spells_resume(spells_df, fragment_cache)
+    description_chunks = iter_latex_spells_description_parts(
+        spells_df, fragment_cache, workers
+    )
+    level_chunks = itertools.groupby(description_chunks, key=itemgetter(0))
+    for position, (level, chunks) in enumerate(level_chunks):
+        yield f"magias_{position:02d}_ciclo_{level}", map(itemgetter(1), chunks)
+
+
+def _write_if_changed(
+    path: str, chunks: Iterable[str], copy_file: TextIO | None = None
+) -> bool:
+    """Write the chunks into a file, unless it already has that content.
+
+    The chunks are written into a temporary file next to the file, which only
+    replaces it if the content changed. If `copy_file` is given, the chunks
+    are also written into it.
+
+    Returns whether the file was written.
+    """
+    content_hash = hashlib.sha1()
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=os.path.dirname(path) or ".", delete=False
+    ) as temp_file:
+        try:
+            for chunk in chunks:
+                chunk_bytes = chunk.encode("utf-8")
+                temp_file.write(chunk_bytes)
+                content_hash.update(chunk_bytes)
+                if copy_file is not None:
+                    copy_file.write(chunk)
+        except BaseException:
+            temp_file.close()
+            os.remove(temp_file.name)
+            raise
 
     try:
-        os.chdir(directory)
+        is_changed = _get_file_hash(path) != content_hash.digest()
+    except OSError:
+        is_changed = True
 
-        compile_cmd = (
-            "pdflatex -no-file-line-error -interaction nonstopmode"
-            f" {base_filename}.tex > /dev/null 2>&1"
-        )
-        rm_cmd = "rm *.out *.log *.aux"
+    if is_changed:
+        os.replace(temp_file.name, path)
+    else:
+        os.remove(temp_file.name)
+    return is_changed
 
-        if verbose:
-            print(compile_cmd)
-        os.system(compile_cmd)
 
+def _get_file_hash(path: str) -> bytes:
+    """Return the hash of a file, reading it in blocks."""
+    file_hash = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(partial(file.read, 1 << 20), b""):
+            file_hash.update(block)
+    return file_hash.digest()
+
+
+def _get_inputs_hash(filename: str) -> str:
+    """Return the hash of a LaTeX file and of its parts files."""
+    parts_folder = f"{filename}{PARTS_FOLDER_SUFFIX}"
+    paths = [f"{filename}.tex"]
+    if os.path.isdir(parts_folder):
+        paths += [
+            os.path.join(parts_folder, part_file)
+            for part_file in sorted(os.listdir(parts_folder))
+        ]
+
+    inputs_hash = hashlib.sha1()
+    for path in paths:
+        inputs_hash.update(path.encode("utf-8"))
+        inputs_hash.update(_get_file_hash(path))
+    return inputs_hash.hexdigest()
+
+
+def compile_tex_file_if_changed(filename: str, verbose: bool = False) -> int:
+    """Compiles a LaTeX file, unless it's the same as the last compiled one.
+
+    The hash of the file and of its parts (see `export_tex_parts`) is stored
+    after each successful compilation, and the compilation is skipped while
+    the hash doesn't change and the PDF file exists.
+
+    Returns the exit status of the compilation (see `compile_tex_file`), or
+    0 if it was skipped, so the PDF file is up to date if it's 0.
+    """
+    inputs_hash = _get_inputs_hash(filename)
+    build_hash_path = f"{filename}{BUILD_HASH_SUFFIX}"
+    try:
+        with open(build_hash_path, "r", encoding="utf-8") as file:
+            build_hash = file.read()
+    except OSError:
+        build_hash = None
+
+    if build_hash == inputs_hash and os.path.exists(f"{filename}.pdf"):
         if verbose:
-            print(rm_cmd)
-        os.system(rm_cmd)
-    finally:
-        os.chdir(cwd)
+            print(f"{filename}.pdf is up to date.")
+        return 0
 
+    status = compile_tex_file(filename, verbose)
+    if status == 0:
+        with open(build_hash_path, "w", encoding="utf-8") as file:
+            file.write(inputs_hash)
+    return status
 
-def open_pdf(filename: str, verbose: bool = False):
-    """Opens a PDF file.
+
+def compile_tex_file(
+    filename: str, verbose: bool = False, timeout: float | None = None
+) -> int:
+    """Compiles a LaTeX file into a PDF file.
+
+    It's important to have the RPG_Adventure.cls file in the same folder as the
+    LaTeX file.
+
+    If the LaTeX build server is running (see `latex_server`), the file is
+    compiled by it, using the precompiled format of its preamble. Otherwise,
+    pdflatex runs inside the folder of the file, without changing the working
+    directory of this process, so many files can be compiled concurrently.
 
     Parameters
     ----------
     filename : str
-        The file name without the .pdf extension.
+        The file name without the .tex extension.
     verbose : bool, default=False
-        If True, prints the commands used. The default is False.
+        If True, prints the commands used.
+    timeout : float | None, default=None
+        The maximum seconds pdflatex might run. If it runs longer, it's killed
+        and a subprocess.TimeoutExpired is raised.
+
+    Returns
+    -------
+    int
+        The exit status of pdflatex, or 127 if it's not installed.
     """
-    if verbose:
-        print(f"Opening {filename}.pdf")
-    os.system(f"zathura {filename}.pdf")
+    status = latex_server.submit_job(filename, timeout)
+    if status is not None:
+        if verbose:
+            print(f"{filename}.tex compiled by the build server")
+        return status
+    return latex_server.run_pdflatex(filename, verbose=verbose, timeout=timeout)
 
 
-def delete_tex_file(filename: str, verbose: bool = False):
-    """Deletes a LaTeX file.
+def open_pdf(filename: str, verbose: bool = False):
+    """Opens a PDF file.
 
     Parameters
     ----------
     filename : str
-        The file name.
+        The file name without the .pdf extension.
     verbose : bool, default=False
         If True, prints the commands used. The default is False.
     """
     if verbose:
-        print(f"Deleting {filename}.tex")
-    os.system(f"rm {filename}.tex")
+        print(f"Opening {filename}.pdf")
+    os.system(f"zathura {filename}.pdf")
 
 
 def export_spells(
@@ -131,12 +374,20 @@ def export_spells(
     verbose: bool = False,
     open_file: bool = False,
     delete_tex: bool = False,
+    use_cache: bool = True,
+    workers: int | None = None,
 ):
     """The main function of the module.
 
     It exports the spells contained in the dataframe into a LaTeX file and
     compiles it into a PDF file.
 
+    The build is incremental: the LaTeX file is split into parts inside the
+    'latex_compilation' folder (see `export_tex_parts`), which is kept
+    between runs, and the compilation is skipped if no part changed. The PDF
+    file and a standalone copy of the LaTeX file are copied to the folder of
+    `filename`.
+
     Also, it has options to open the PDF file and delete the LaTeX file.
 
     Parameters
@@ -150,24 +401,185 @@ def export_spells(
     open_file : bool, default=False
         If True, opens the PDF file. The default is False.
     delete_tex : bool, default=False
-        If True, deletes the LaTeX file. The default is False.
+        If True, the standalone LaTeX file isn't exported. The default is
+        False.
+    use_cache : bool, default=True
+        If True, reuses the LaTeX of the spells already rendered (see
+        `export_tex_file`). The default is True.
+    workers : int | None, default=None
+        The number of processes used to render the spells. The default is
+        None (i.e. the spells are rendered serially).
     """
     basename = os.path.basename(filename)
-    file_folder = os.path.dirname(filename)
+    file_folder = os.path.dirname(filename) or "."
     filename = f"latex_compilation/{basename}"
 
-    export_tex_file(spells_df, filename, verbose)
-    compile_tex_file(filename, verbose)
+    is_build_folder = os.path.abspath(file_folder) == os.path.abspath(
+        "latex_compilation"
+    )
+    if not is_build_folder:
+        os.makedirs(file_folder, exist_ok=True)
+    # the compiled LaTeX file inputs its parts, so a standalone LaTeX file is
+    # written along with them
+    standalone_filename = None
+    if not is_build_folder and not delete_tex:
+        standalone_filename = os.path.join(file_folder, basename)
+
+    export_tex_parts(
+        spells_df,
+        filename,
+        verbose,
+        use_cache,
+        workers,
+        standalone_filename=standalone_filename,
+    )
+    status = compile_tex_file_if_changed(filename, verbose)
+    if status != 0:
+        # the PDF file, if any, is from an earlier build
+        print(f"{filename}.tex couldn't be compiled (exit status {status}).")
 
     if open_file:
         open_pdf(filename, verbose)
 
-    if delete_tex:
-        delete_tex_file(filename, verbose)
-    else:
-        os.system(f"mv latex_compilation/{basename}.tex {file_folder}")
-
-    os.system(f"mv latex_compilation/{basename}.pdf {file_folder}")
+    if not is_build_folder and status == 0:
+        shutil.copy2(f"{filename}.pdf", file_folder)
 
     if not verbose:
+        _clear_notebook_output()
+
+
+def _clear_notebook_output() -> None:
+    """Clears the output of the notebook cell, when running in a notebook.
+
+    IPython is only imported if it's already loaded (i.e. this process is a
+    notebook or an IPython shell), so the command line doesn't pay for it.
+    """
+    if "IPython" in sys.modules:
+        from IPython.display import (  # pylint: disable=import-outside-toplevel
+            clear_output,
+        )
+
         clear_output()
+
+
+def export_handout(
+    spells_df: DataFrame,
+    filename: str,
+    delete_tex: bool = False,
+    use_cache: bool = True,
+    timeout: float | None = None,
+) -> dict[str, Any]:
+    """Exports the spells into a PDF file, using its own build folder.
+
+    Unlike `export_spells`, the LaTeX file is compiled inside a temporary
+    folder (with a copy of the RPG_Adventure.cls file), so many handouts can
+    be exported concurrently (see `export_handouts`).
+
+    Parameters
+    ----------
+    spells_df : DataFrame
+        The dataframe containing the spells.
+    filename : str
+        The filename without any extension. Its folder is created if needed.
+    delete_tex : bool, default=False
+        If True, only the PDF file is exported. The default is False.
+    use_cache : bool, default=True
+        If True, reuses the LaTeX of the spells already rendered for this
+        handout, whose fragment cache is kept next to it.
+    timeout : float | None, default=None
+        The maximum seconds pdflatex might run.
+
+    Returns
+    -------
+    dict[str, Any]
+        The report of the handout: its 'filename', number of 'spells', the
+        pdflatex exit 'status' (None if it timed out) and the elapsed
+        'seconds'.
+    """
+    start_time = time.perf_counter()
+    basename = os.path.basename(filename)
+    file_folder = os.path.dirname(filename) or "."
+    os.makedirs(file_folder, exist_ok=True)
+
+    status: int | None
+    with tempfile.TemporaryDirectory(prefix="spells_") as build_folder:
+        shutil.copy(
+            os.path.join("latex_compilation", "RPG_Adventure.cls"),
+            build_folder,
+        )
+        build_filename = os.path.join(build_folder, basename)
+        export_tex_file(
+            spells_df,
+            build_filename,
+            use_cache=use_cache,
+            cache_filename=filename,
+        )
+        try:
+            status = compile_tex_file(build_filename, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            status = None
+
+        if os.path.exists(f"{build_filename}.pdf"):
+            shutil.copy(f"{build_filename}.pdf", file_folder)
+        if not delete_tex:
+            shutil.copy(f"{build_filename}.tex", file_folder)
+
+    return {
+        "filename": filename,
+        "spells": len(spells_df),
+        "status": status,
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def export_handouts(
+    handouts: dict[str, DataFrame],
+    workers: int | None = None,
+    verbose: bool = False,
+    **kwargs,
+) -> list[dict[str, Any]]:
+    """Exports many handouts concurrently.
+
+    Parameters
+    ----------
+    handouts : dict[str, DataFrame]
+        The dataframe of spells of each handout, by its filename (without any
+        extension).
+    workers : int | None, default=None
+        The number of handouts exported at the same time. The default is None
+        (i.e. the number of CPUs).
+    verbose : bool, default=False
+        If True, prints the report of each handout when it's done.
+    **kwargs
+        The parameters passed to `export_handout` (e.g. `delete_tex`).
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        The report of each handout (see `export_handout`), in the same order
+        as the handouts.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(export_handout, spells_df, filename, **kwargs)
+            for filename, spells_df in handouts.items()
+        ]
+        reports = list()
+        for future in futures:
+            report = future.result()
+            if verbose:
+                print_handout_report(report)
+            reports.append(report)
+    return reports
+
+
+def print_handout_report(report: dict[str, Any]):
+    """Prints the report of a handout (see `export_handout`)."""
+    if report["status"] is None:
+        status_str = "timed out"
+    else:
+        status_str = f"exit status {report['status']}"
+    print(
+        f"{report['filename']}.pdf: {report['spells']} spells, {status_str}, "
+        f"{report['seconds']:.2f}s"
+    )
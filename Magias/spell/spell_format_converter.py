@@ -1,140 +1,238 @@
-"""This module converts the spell Markdown format into LaTeX format."""
+"""This module converts the spell Markdown format into LaTeX format.
+
+The `iter_*` functions yield the LaTeX in chunks, so a document can be
+written to a file while it's generated (see `spell_exporter`), and the
+`get_*` functions join these chunks. Given a `FragmentCache`, the LaTeX of
+each spell is reused from it instead of being rendered again.
+"""
 
 # Python Standard Libraries
-from functools import reduce
+from concurrent.futures import ProcessPoolExecutor
+import math
 import re
+from typing import Any, Callable, Iterator
 
 # Third Party Libraries
 from pandas import DataFrame, Series
-import spell.spell_printer as spell_printer
-
-
-def get_latex_spells(spells_df: DataFrame) -> str:
-    latex_text = ""
+from spell.fragment_cache import FragmentCache
+from spell.spell_renderer import LatexRenderer
 
-    latex_text += get_latex_spells_resume(spells_df)
-    latex_text += get_latex_spells_description(spells_df)
+_latex_renderer = LatexRenderer()
+_span_regex = re.compile(
+    r"<span"
+    r" style='color:(?P<color>.*);font-size:(?P<fontsize>.*)'>(?P<str>.*)"
+    r"<\/span>"
+)
 
-    return latex_text
 
+class _SpellRow(dict):
+    """A spell row whose values are accessed as items or attributes.
 
-def get_latex_spells_resume(spells_df: DataFrame) -> str:
-    latex_text = r"\chapter{Sumário}\n\n"
-    for level, group_df in spells_df.groupby("nivel"):
-        level = "Truques" if level == 0 else f"Ciclo {level}"
-        header = r"\noindent\textbf{%s}\jump" % level
-        latex_text += header
-        for _, spell_series in group_df.iterrows():
-            latex_spell = get_latex_spell_resume(spell_series)
-            latex_text += f"{latex_spell}\n"
-        latex_text += r"\jump"
-    return latex_text
+    It's a cheaper replacement for the Series built by `iterrows`.
+    """
 
+    def __getattr__(self, column: str) -> Any:
+        try:
+            return self[column]
+        except KeyError as e:
+            raise AttributeError(column) from e
 
-def get_latex_spell_resume(spell_series: Series) -> str:
-    rare_str = spell_printer._get_rare_str(spell_series)
-    part_str = f"{spell_series['nome']} _({spell_series['name']})_{rare_str}\n "
-    part_str = spell_printer.get_styled_str(part_str)
 
-    latex_text = get_latex_str_for_parts([part_str])
-    return latex_text
+def _iter_spell_rows(spells_df: DataFrame) -> Iterator[_SpellRow]:
+    columns = list(spells_df.columns)
+    arrays = [spells_df[column].tolist() for column in columns]
+    for values in zip(*arrays):
+        yield _SpellRow(zip(columns, values))
 
 
-def get_latex_spells_description(spells_df: DataFrame) -> str:
-    latex_text = r"\chapter{Magias}\n\n"
-    for _, spell_series in spells_df.iterrows():
-        latex_spell = get_latex_spell_description(spell_series)
-        latex_text += f"{latex_spell}\jump"
-    return latex_text
+def get_latex_spells(
+    spells_df: DataFrame,
+    fragment_cache: FragmentCache | None = None,
+    workers: int | None = None,
+) -> str:
+    return "".join(iter_latex_spells(spells_df, fragment_cache, workers))
 
 
-def get_latex_spell_description(spell_series: Series) -> str:
-    parts_str = spell_printer.get_spell_parts_str(spell_series)
-    latex_text = get_latex_str_for_parts(parts_str)
-    latex_text = r"\noindent" + latex_text
-    return latex_text
+def iter_latex_spells(
+    spells_df: DataFrame,
+    fragment_cache: FragmentCache | None = None,
+    workers: int | None = None,
+) -> Iterator[str]:
+    """Yield the LaTeX of the spells in chunks, so it can be streamed.
 
+    If `workers` is greater than one, the spells descriptions are rendered
+    by a process pool (see `iter_latex_spells_description`).
+    """
+    yield from iter_latex_spells_resume(spells_df, fragment_cache)
+    yield from iter_latex_spells_description(spells_df, fragment_cache, workers)
 
-def get_latex_str_for_parts(parts_str: list) -> str:
-    latex_parts = list()
-    for markdown_part in parts_str:
-        latex_part = _replace_all(markdown_part)
-        latex_parts.append(latex_part)
 
-    latex_text = reduce(lambda x, y: f"{x}\n{y}", latex_parts)
-    return latex_text
+def get_latex_spells_resume(
+    spells_df: DataFrame, fragment_cache: FragmentCache | None = None
+) -> str:
+    return "".join(iter_latex_spells_resume(spells_df, fragment_cache))
 
 
-def _replace_all(markdown_text: str) -> str:
-    latex_text = markdown_text
-    replacements = [
-        _replace_italics,
-        _replace_bold,
-        _replace_newlines,
-        _replace_tabs,
-        _replace_span,
-    ]
+def iter_latex_spells_resume(
+    spells_df: DataFrame, fragment_cache: FragmentCache | None = None
+) -> Iterator[str]:
+    yield r"\chapter{Sumário}\n\n"
+    for level, group_df in spells_df.groupby("nivel"):
+        level = "Truques" if level == 0 else f"Ciclo {level}"
+        yield r"\noindent\textbf{%s}\jump" % level
+        for spell_series in _iter_spell_rows(group_df):
+            yield _get_fragment(
+                fragment_cache, "resume", spell_series, get_latex_spell_resume
+            )
+            yield "\n"
+        yield r"\jump"
 
-    for func in replacements:
-        latex_text = func(latex_text)
-    return latex_text
 
+def get_latex_spell_resume(spell_series: Series) -> str:
+    return _latex_renderer.render_resume(spell_series)
 
-def _sub_all(pattern: str, repl: str, string: str) -> str:
-    for _ in range(10):
-        string = re.sub(pattern, repl, string, 1)
-    return string
 
+def get_latex_spells_description(
+    spells_df: DataFrame,
+    fragment_cache: FragmentCache | None = None,
+    workers: int | None = None,
+) -> str:
+    return "".join(
+        iter_latex_spells_description(spells_df, fragment_cache, workers)
+    )
 
-def _replace_italics(markdown_text: str) -> str:
-    string = markdown_text
-    for _ in range(10):
-        string = re.sub(r"(?P<tmp>_)", r"\\textit{", string, 1)
-        string = re.sub(r"_", r"}", string, 1)
-    return string
 
+def iter_latex_spells_description(
+    spells_df: DataFrame,
+    fragment_cache: FragmentCache | None = None,
+    workers: int | None = None,
+) -> Iterator[str]:
+    """Yield the LaTeX of the spells descriptions in chunks.
+
+    If `workers` is greater than one, the descriptions missing from the
+    fragment cache are rendered by a process pool, in shards of consecutive
+    spells, and they are yielded in the same order as the serial rendering.
+    The process pool only pays off for large spell books.
+    """
+    yield r"\chapter{Magias}\n\n"
+    for latex_spell in _iter_latex_descriptions(
+        spells_df, fragment_cache, workers
+    ):
+        yield latex_spell
+        yield r"\jump"
+
+
+def iter_latex_spells_description_parts(
+    spells_df: DataFrame,
+    fragment_cache: FragmentCache | None = None,
+    workers: int | None = None,
+) -> Iterator[tuple[Any, str]]:
+    """Yield the LaTeX of the spells descriptions in chunks, with their level.
+
+    The consecutive chunks with the same level (i.e. with the same 'nivel'
+    spells, which are consecutive if the spells are sorted by level first)
+    make a part, and the chapter header is in the first part. Joined, the
+    chunks are the same as `get_latex_spells_description`.
+    """
+    levels = spells_df["nivel"].tolist()
+    yield (levels[0] if levels else None), r"\chapter{Magias}\n\n"
+    latex_spells = _iter_latex_descriptions(spells_df, fragment_cache, workers)
+    for level, latex_spell in zip(levels, latex_spells):
+        yield level, latex_spell
+        yield level, r"\jump"
+
+
+def _iter_latex_descriptions(
+    spells_df: DataFrame,
+    fragment_cache: FragmentCache | None = None,
+    workers: int | None = None,
+) -> Iterator[str]:
+    """Yield the LaTeX description of each spell."""
+    spell_rows = _iter_spell_rows(spells_df)
+    if workers is None or workers <= 1:
+        for spell_series in spell_rows:
+            yield _get_fragment(
+                fragment_cache,
+                "description",
+                spell_series,
+                get_latex_spell_description,
+            )
+    else:
+        yield from _render_in_processes(
+            list(spell_rows),
+            "description",
+            get_latex_spell_description,
+            fragment_cache,
+            workers,
+        )
 
-def _replace_bold(markdown_text: str) -> str:
-    string = markdown_text
-    for _ in range(10):
-        string = re.sub(r"(?P<tmp>\*\*)", r"\\textbf{", string, 1)
-        string = re.sub(r"\*\*", r"}", string, 1)
-    return string
 
+def get_latex_spell_description(spell_series: Series) -> str:
+    latex_parts = _latex_renderer.render_parts(spell_series)
+    return r"\noindent" + "\n".join(latex_parts)
+
+
+def _get_fragment(
+    fragment_cache: FragmentCache | None,
+    kind: str,
+    spell_series: _SpellRow,
+    render: Callable[[Any], str],
+) -> str:
+    if fragment_cache is None:
+        return render(spell_series)
+    return fragment_cache.get_fragment(kind, spell_series, render)
+
+
+def _render_in_processes(
+    spell_rows: list[_SpellRow],
+    kind: str,
+    render: Callable[[Any], str],
+    fragment_cache: FragmentCache | None,
+    workers: int,
+) -> list[str]:
+    """Render the fragments of the spells using a process pool.
+
+    The cached fragments are taken from the cache, and only the others are
+    sent to the process pool. Returns the fragments in the same order as the
+    spell rows.
+    """
+    fragments: list[str | None] = [None] * len(spell_rows)
+    if fragment_cache is not None:
+        for position, spell_series in enumerate(spell_rows):
+            fragments[position] = fragment_cache.lookup(kind, spell_series)
+
+    missing_positions = [
+        position
+        for position, fragment in enumerate(fragments)
+        if fragment is None
+    ]
+    if not missing_positions:
+        return fragments
 
-def _replace_newlines(markdown_text: str) -> str:
-    latex_text = _sub_all(r"<br>", r"\\\\", markdown_text)
-    return latex_text
+    missing_rows = [spell_rows[position] for position in missing_positions]
+    # a few shards per worker, so the workers finish at about the same time
+    chunksize = max(1, math.ceil(len(missing_rows) / (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as process_pool:
+        rendered = process_pool.map(render, missing_rows, chunksize=chunksize)
+        for position, fragment in zip(missing_positions, rendered):
+            fragments[position] = fragment
+            if fragment_cache is not None:
+                fragment_cache.store(kind, spell_rows[position], fragment)
 
+    return fragments
 
-def _replace_tabs(markdown_text: str) -> str:
-    latex_text = _sub_all(r"&emsp;", r"\\t ", markdown_text)
-    return latex_text
 
+def get_latex_str_for_parts(parts_str: list) -> str:
+    latex_parts = map(_replace_all, parts_str)
+    return "\n".join(latex_parts)
 
-def _replace_size(string: str, font_size: str) -> str:
-    if font_size == "10px":
-        font_size = "\\tiny"
-    elif font_size == "11px":
-        font_size = "\\scriptsize"
-    elif font_size == "13px":
-        font_size = "\\small"
-    else:
-        font_size = "\\normalsize"
 
-    # pylint: disable=consider-using-f-string
-    sized_string = "{%s %s}" % (font_size, string)
-    return sized_string
+def _replace_all(markdown_text: str) -> str:
+    return _replace_span(markdown_text)
 
 
 def _replace_span(markdown_text: str) -> str:
-    pattern = (
-        r"<span"
-        r" style='color:(?P<color>.*);font-size:(?P<fontsize>.*)'>(?P<str>.*)"
-        r"<\/span>"
-    )
-
-    match_obj = re.match(pattern, markdown_text)
+    match_obj = _span_regex.match(markdown_text)
 
     if match_obj is None:
         raise ValueError("No string matched the pattern.")
@@ -143,10 +241,8 @@ def _replace_span(markdown_text: str) -> str:
     color = match_obj.group("color")
     font_size = match_obj.group("fontsize")
 
-    if color != "None":
-        # pylint: disable=consider-using-f-string
-        colored_string = "\\textcolor{%s}{%s}" % (color, string)
-    else:
-        colored_string = string
-    latex_text = _replace_size(colored_string, font_size)
-    return latex_text
+    return _latex_renderer.render(
+        string,
+        color=None if color == "None" else color,
+        size=None if font_size == "None" else font_size,
+    )
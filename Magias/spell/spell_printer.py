@@ -4,8 +4,15 @@ printed also using this module."""
 # Python Standard Libraries
 import re
 
-# Third Party Libraries
-from IPython.display import Markdown, display
+# The color and font size of each spell part
+PART_STYLES = {
+    "name": {"color": None, "size": None},
+    "header": {"color": None, "size": "13px"},
+    "desc": {"color": None, "size": None},
+    "tags": {"color": "gray", "size": "11px"},
+    "classes": {"color": "gray", "size": "11px"},
+    "source": {"color": "gray", "size": "10px"},
+}
 
 
 # === GENERAL FUNCTIONS ===
@@ -104,7 +111,7 @@ def _get_name_part_str(spell_series, styled=True):
         f"**{spell_series['nome']} _({spell_series['name']})_**{lvl_str}{ritual_str}{rare_str}\n"
     )
     if styled:
-        name_str = get_styled_str(name_str)
+        name_str = get_styled_str(name_str, **PART_STYLES["name"])
     return name_str
 
 
@@ -127,7 +134,7 @@ def _get_header_part_str(spell_series, styled=True):
         header_str += f"\t**Dmg/effect:** {spell_series.dmg_effect}\n"
 
     if styled:
-        header_str = get_styled_str(header_str, size="13px")
+        header_str = get_styled_str(header_str, **PART_STYLES["header"])
 
     return header_str
 
@@ -135,21 +142,23 @@ def _get_header_part_str(spell_series, styled=True):
 def _get_desc_part_str(spell_series, styled=True):
     desc_str = f"{spell_series.descricao}\n"
     if styled:
-        desc_str = get_styled_str(desc_str)
+        desc_str = get_styled_str(desc_str, **PART_STYLES["desc"])
     return desc_str
 
 
 def _get_tags_part_str(spell_series, styled=True):
     tags_str = _get_tags_str(spell_series)
     if styled:
-        tags_str = get_styled_str(tags_str, color="gray", size="11px")
+        tags_str = get_styled_str(tags_str, **PART_STYLES["tags"])
     return tags_str
 
 
 def _get_classes_part_str(spell_series, styled=True):
     classes_str = _get_classes_str(spell_series)
     if styled:
-        classes_str = get_styled_str(classes_str, color="gray", size="11px")
+        classes_str = get_styled_str(
+            classes_str, **PART_STYLES["classes"]
+        )
     return classes_str
 
 
@@ -157,13 +166,21 @@ def _get_source_part_str(spell_series, styled=True):
     source_str = f"_{spell_series.source}_"
 
     if styled:
-        source_str = get_styled_str(source_str, color="gray", size="10px")
+        source_str = get_styled_str(source_str, **PART_STYLES["source"])
     return source_str
 
 
 # === PUBLIC PRINT FUNCTIONS ===
 def print_markdown(string):
-    """Receives a string and print it using IPython Markdown style."""
+    """Receives a string and print it using IPython Markdown style.
+
+    IPython is only imported here, so the spells can be exported without it.
+    """
+    from IPython.display import (  # pylint: disable=import-outside-toplevel
+        Markdown,
+        display,
+    )
+
     display(Markdown(string))
 
 
@@ -243,12 +260,27 @@ def print_spells_for_df(spells_df, **kwargs):
         print_spell(row, **kwargs)
 
 
-def print_spells_by_name(spells_df, name, **kwargs):
-    """Receives a Pandas DataFrame of spells and a name and prints the spell
+def print_spells_by_name(
+    spells_df, name, limit=5, min_score=None, index=None, **kwargs
+):
+    """Receives a Pandas DataFrame of spells and a name and prints the spells
     with that name.
+
+    All the spells whose 'nome' or 'name' contain the name are printed, from
+    the most to the least similar, followed by at most `limit` suggestions of
+    spells with similar names (e.g. if the name has typos, see
+    `dfs.name_search`). The default `min_score` of the suggestions is the one
+    of `dfs.name_search`. A `SpellNameIndex` of the DataFrame might be given,
+    so it's reused between calls.
     """
-    spells_df = spells_df[
-        (spells_df["nome"].str.contains(name, case=False))
-        | (spells_df["name"].str.contains(name, case=False))
-    ]
+    # the name search is only imported here, so printing a spell doesn't
+    # import the readers of the search indexes
+    # pylint: disable-next=import-outside-toplevel
+    from dfs.name_search import MIN_SCORE, SpellNameIndex
+
+    if min_score is None:
+        min_score = MIN_SCORE
+    if index is None:
+        index = SpellNameIndex(spells_df)
+    spells_df = index.lookup_spells_df(spells_df, name, limit, min_score)
     print_spells_for_df(spells_df, **kwargs)
@@ -0,0 +1,285 @@
+"""This module renders the spell parts straight into a target format.
+
+Each spell part (name, header, description, tags, classes and source) is a
+Markdown string (see `spell_printer`), with a color and a font size given by
+`spell_printer.PART_STYLES`. A renderer converts the Markdown string and its
+style into its format:
+- `MarkdownRenderer`: Markdown with HTML styles, to be displayed in notebooks.
+- `LatexRenderer`: LaTeX, to be exported (see `spell_format_converter`).
+- `PlainTextRenderer`: plain text, without any style.
+"""
+
+# Python Standard Libraries
+from abc import ABC, abstractmethod
+import re
+
+# Third Party Libraries
+from pandas import Series
+import spell.spell_printer as spell_printer
+
+PART_FUNCTIONS = {
+    "name": spell_printer._get_name_part_str,
+    "header": spell_printer._get_header_part_str,
+    "desc": spell_printer._get_desc_part_str,
+    "tags": spell_printer._get_tags_part_str,
+    "classes": spell_printer._get_classes_part_str,
+    "source": spell_printer._get_source_part_str,
+}
+
+
+class SpellRenderer(ABC):
+    """Render the spell parts into a target format.
+
+    The subclasses implement `render`, which converts a Markdown string with
+    its style into the target format.
+    """
+
+    @abstractmethod
+    def render(
+        self,
+        markdown_text: str,
+        color: str | None = None,
+        size: str | None = None,
+    ) -> str:
+        """Render a Markdown string with a color and a font size."""
+
+    def render_parts(
+        self,
+        spell_series: Series,
+        name: bool = True,
+        header: bool = True,
+        desc: bool = True,
+        tags: bool = True,
+        classes: bool = True,
+        source: bool = True,
+    ) -> list[str]:
+        """Receives a spell row and returns its rendered parts.
+
+        As in `spell_printer.get_spell_parts_str`, we can choose which parts
+        will be returned, and by default all parts are returned.
+        """
+        is_rendered = {
+            "name": name,
+            "header": header,
+            "desc": desc,
+            "tags": tags,
+            "classes": classes,
+            "source": source,
+        }
+        return [
+            self.render(
+                PART_FUNCTIONS[part](spell_series, styled=False),
+                **spell_printer.PART_STYLES[part],
+            )
+            for part, rendered in is_rendered.items()
+            if rendered
+        ]
+
+
+class MarkdownRenderer(SpellRenderer):
+    """Render the spell parts into Markdown with HTML styles."""
+
+    def render(
+        self,
+        markdown_text: str,
+        color: str | None = None,
+        size: str | None = None,
+    ) -> str:
+        return spell_printer.get_styled_str(markdown_text, color, size)
+
+
+class LatexRenderer(SpellRenderer):
+    """Render the spell parts into LaTeX.
+
+    The parts of a spell row are rendered straight from its fields (see
+    `render_parts`), and only the free text of the fields (e.g. the
+    '**Melhorar Magia**' of a description) is converted from Markdown. The
+    Markdown is converted in a single scan, where each '_' and '**'
+    alternately opens and closes its LaTeX command. The HTML line breaks and
+    tabs (e.g. of an already styled string) are converted too.
+    """
+
+    TOGGLE_COMMANDS = {"_": r"\textit{", "**": r"\textbf{"}
+    REPLACEMENTS = {
+        "\n": r"\\",
+        "<br>": r"\\",
+        "\t": r"\t ",
+        "&emsp;": r"\t ",
+    }
+    FONT_SIZES = {"10px": r"\tiny", "11px": r"\scriptsize", "13px": r"\small"}
+    DEFAULT_FONT_SIZE = r"\normalsize"
+    LINE_BREAK = r"\\"
+    TAB = r"\t "
+
+    _markup_regex = re.compile(r"\*\*|_|\n|<br>|\t|&emsp;")
+    _componentes_regex = re.compile(r"\(.+\)")
+
+    def render(
+        self,
+        markdown_text: str,
+        color: str | None = None,
+        size: str | None = None,
+    ) -> str:
+        return self.style(self.render_markup(markdown_text), color, size)
+
+    def style(
+        self, latex_text: str, color: str | None = None, size: str | None = None
+    ) -> str:
+        """Apply a color and a font size to a LaTeX string."""
+        # pylint: disable=consider-using-f-string
+        if color is not None:
+            latex_text = r"\textcolor{%s}{%s}" % (color, latex_text)
+
+        font_size = LatexRenderer.FONT_SIZES.get(
+            size, LatexRenderer.DEFAULT_FONT_SIZE
+        )
+        return "{%s %s}" % (font_size, latex_text)
+
+    def render_markup(self, markdown_text: str) -> str:
+        """Convert the Markdown markup into LaTeX, without any style."""
+        is_open = {token: False for token in LatexRenderer.TOGGLE_COMMANDS}
+
+        def replace(match_obj: re.Match) -> str:
+            token = match_obj.group(0)
+            if token not in LatexRenderer.TOGGLE_COMMANDS:
+                return LatexRenderer.REPLACEMENTS[token]
+            is_open[token] = not is_open[token]
+            if is_open[token]:
+                return LatexRenderer.TOGGLE_COMMANDS[token]
+            return "}"
+
+        return LatexRenderer._markup_regex.sub(replace, markdown_text)
+
+    def render_parts(
+        self,
+        spell_series: Series,
+        name: bool = True,
+        header: bool = True,
+        desc: bool = True,
+        tags: bool = True,
+        classes: bool = True,
+        source: bool = True,
+    ) -> list[str]:
+        """Receives a spell row and returns its parts rendered into LaTeX.
+
+        Unlike the other renderers, the parts aren't built as Markdown first:
+        each part is rendered from the fields of the row.
+        """
+        part_functions = {
+            "name": (name, self._render_name_part),
+            "header": (header, self._render_header_part),
+            "desc": (desc, self._render_desc_part),
+            "tags": (tags, self._render_tags_part),
+            "classes": (classes, self._render_classes_part),
+            "source": (source, self._render_source_part),
+        }
+        return [
+            self.style(
+                render_part(spell_series), **spell_printer.PART_STYLES[part]
+            )
+            for part, (rendered, render_part) in part_functions.items()
+            if rendered
+        ]
+
+    def render_resume(self, spell_series: Series) -> str:
+        """Receives a spell row and returns its line of the summary."""
+        return self.style(
+            f"{self.render_markup(spell_series['nome'])} "
+            rf"\textit{{({self.render_markup(spell_series['name'])})}}"
+            f"{spell_printer._get_rare_str(spell_series)}"
+            f"{LatexRenderer.LINE_BREAK} "
+        )
+
+    def _render_name_part(self, spell_series: Series) -> str:
+        return (
+            rf"\textbf{{{self.render_markup(spell_series['nome'])} "
+            rf"\textit{{({self.render_markup(spell_series['name'])})}}}}"
+            f"{spell_printer._get_lvl_str(spell_series)}"
+            f"{spell_printer._get_ritual_str(spell_series)}"
+            f"{spell_printer._get_rare_str(spell_series)}"
+            f"{LatexRenderer.LINE_BREAK}"
+        )
+
+    def _render_header_part(self, spell_series: Series) -> str:
+        markup = self.render_markup
+        lines = [
+            (r"\textbf{Escola(s):} ", self._render_escola(spell_series)),
+            (
+                r"\textbf{Tempo conjuração:} ",
+                markup(spell_series.tempo_conjuracao),
+            ),
+            (r"\textbf{Alcance:} ", markup(spell_series.alcance_area)),
+            (
+                r"\textbf{Componentes:} ",
+                self._render_componentes(spell_series),
+            ),
+            (r"\textbf{Mana:} ", self._render_mana(spell_series)),
+            (r"\textbf{Duração:} ", markup(spell_series.duracao)),
+        ]
+        if spell_series.dmg != "N/A":
+            lines.append((r"\textbf{Dano}: ", markup(spell_series.dmg)))
+        if spell_series.attack_save != "N/A":
+            lines.append(
+                (r"\textbf{Attack/Save:} ", markup(spell_series.attack_save))
+            )
+        if spell_series.dmg_effect != "N/A":
+            lines.append(
+                (r"\textbf{Dmg/effect:} ", markup(spell_series.dmg_effect))
+            )
+
+        return "".join(
+            f"{LatexRenderer.TAB}{label}{value}{LatexRenderer.LINE_BREAK}"
+            for label, value in lines
+        )
+
+    def _render_escola(self, spell_series: Series) -> str:
+        escola_str = ", ".join(spell_series.escola)
+        if "elemental" not in spell_series.escola:
+            return escola_str
+        return rf"{escola_str} (\textit{{{', '.join(spell_series.elementos)}}})"
+
+    def _render_componentes(self, spell_series: Series) -> str:
+        componentes = spell_series.componentes
+        match_obj = LatexRenderer._componentes_regex.search(componentes)
+        if match_obj is None:
+            return componentes
+        return rf"{componentes.split(' ')[0]} \textit{{{match_obj.group(0)}}}"
+
+    def _render_mana(self, spell_series: Series) -> str:
+        if spell_series["mana_adicional"] == "N/A":
+            return f"{spell_series.mana}"
+        return (
+            rf"{spell_series.mana} (\textit{{+ {spell_series.mana_adicional}}})"
+        )
+
+    def _render_desc_part(self, spell_series: Series) -> str:
+        return self.render_markup(f"{spell_series.descricao}\n")
+
+    def _render_tags_part(self, spell_series: Series) -> str:
+        tags = ", ".join(sorted(spell_series.tags))
+        return f"[{tags}]{LatexRenderer.LINE_BREAK}"
+
+    def _render_classes_part(self, spell_series: Series) -> str:
+        classes = ", ".join(sorted(spell_series.classes))
+        return f"[{classes}]{LatexRenderer.LINE_BREAK}"
+
+    def _render_source_part(self, spell_series: Series) -> str:
+        return rf"\textit{{{spell_series.source}}}"
+
+
+class PlainTextRenderer(SpellRenderer):
+    """Render the spell parts into plain text, dropping the Markdown."""
+
+    REPLACEMENTS = {"**": "", "_": "", "<br>": "\n", "&emsp;": "\t"}
+
+    _markup_regex = re.compile(r"\*\*|_|<br>|&emsp;")
+
+    def render(
+        self,
+        markdown_text: str,
+        color: str | None = None,
+        size: str | None = None,
+    ) -> str:
+        return PlainTextRenderer._markup_regex.sub(
+            lambda x: PlainTextRenderer.REPLACEMENTS[x.group(0)], markdown_text
+        )
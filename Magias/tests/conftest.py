@@ -0,0 +1,41 @@
+"""Fixtures shared by the tests."""
+
+# Python Standard Libraries
+import json
+from pathlib import Path
+from typing import Callable
+
+# Third Party Libraries
+import dfs.df_reader as reader
+import pandas as pd
+import pytest
+
+MAGIAS_PATH = Path(__file__).parents[1]
+
+
+@pytest.fixture
+def read_data_spells() -> Callable[[list[str]], pd.DataFrame]:
+    """Return a function which prepares the given spell files of 'data'.
+
+    The spells are sorted and prepared as by `df_reader`, but they aren't
+    validated.
+    """
+    with open(MAGIAS_PATH / "dfs" / "schema_config.json", "r") as file:
+        config = json.load(file)
+
+    def read_spells(file_names: list[str]) -> pd.DataFrame:
+        spells = list()
+        for file_name in file_names:
+            with open(MAGIAS_PATH / "data" / file_name, "r") as file:
+                spells.append(json.load(file))
+
+        spells_df = pd.DataFrame(spells).sort_values(["nivel", "nome"])
+        spells_df = spells_df.reindex(
+            columns=spells_df.columns.union(
+                config["columns_default_values"], sort=False
+            )
+        )
+        spells_df = spells_df.reset_index(drop=True)
+        return reader._prepare_spells_df(spells_df, config)
+
+    return read_spells
@@ -0,0 +1,80 @@
+"""Tests of the compact representation of the spells DataFrame."""
+
+# Third Party Libraries
+from dfs.df_compact import (
+    LIST_COLUMNS_POSSIBLE_VALUES,
+    compact_spells_df,
+    contains_any,
+    expand_spells_df,
+    to_bitmask,
+)
+import pandas as pd
+import pytest
+
+SPELL_FILES = [
+    "Absorver Elementos.json",
+    "Ajuda.json",
+    "Alarme.json",
+    "Amizade.json",
+    "Arma Espiritual.json",
+    "Bafo de Dragão.json",
+]
+
+
+@pytest.fixture
+def spells_df(read_data_spells) -> pd.DataFrame:
+    return read_data_spells(SPELL_FILES)
+
+
+def sort_lists(spells_df: pd.DataFrame) -> pd.DataFrame:
+    """Sort the lists of the spells in the order of their possible values."""
+    spells_df = spells_df.copy()
+    for column, possible_values in LIST_COLUMNS_POSSIBLE_VALUES.items():
+        spells_df[column] = spells_df[column].map(
+            lambda x: sorted(x, key=possible_values.index)
+        )
+    return spells_df
+
+
+@pytest.mark.parametrize("boolean_columns", [False, True])
+def test_round_trip_keeps_the_spells(spells_df, boolean_columns):
+    compact_df = compact_spells_df(spells_df, boolean_columns)
+
+    expanded_df = expand_spells_df(compact_df)
+
+    pd.testing.assert_frame_equal(
+        expanded_df, sort_lists(spells_df), check_dtype=False
+    )
+
+
+def test_round_trip_keeps_values_which_arent_possible(spells_df):
+    spells_df.loc[0, "source"] = "Homebrew"
+
+    compact_df = compact_spells_df(spells_df)
+
+    assert compact_df.loc[0, "source"] == "Homebrew"
+    assert expand_spells_df(compact_df).loc[0, "source"] == "Homebrew"
+
+
+def test_bitmask_of_the_lists():
+    possible_values = ["fogo", "água", "ar"]
+    series = pd.Series(
+        [["fogo"], [], ["ar", "fogo", "ar"], ["água"]], index=[3, 1, 4, 2]
+    )
+
+    bitmask = to_bitmask(series, possible_values)
+
+    assert bitmask.to_dict() == {3: 0b001, 1: 0, 4: 0b101, 2: 0b010}
+    with pytest.raises(ValueError, match="terra"):
+        to_bitmask(pd.Series([["terra"]]), possible_values)
+
+
+def test_contains_any_matches_the_lists(spells_df):
+    compact_df = compact_spells_df(spells_df)
+    values = ["arqueiro", "xamã"]
+
+    is_contained = contains_any(compact_df, "classes", values)
+
+    expected = spells_df["classes"].map(lambda x: any(v in x for v in values))
+    assert is_contained.tolist() == expected.tolist()
+    assert is_contained.any() and not is_contained.all()
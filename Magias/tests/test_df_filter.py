@@ -0,0 +1,144 @@
+"""Tests of the filters of the spells DataFrame."""
+
+# Python Standard Libraries
+import json
+
+# Third Party Libraries
+from dfs.df_filter import DFBatch, DFFilter, DFQuerrier
+from dfs.df_index import SpellsIndex
+import dfs.df_reader as reader
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def spells_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "nome": ["Luz", "Bola de Fogo", "Escudo", "Relâmpago"],
+            "nivel": [0, 1, 1, 2],
+            "elementos": [["luz"], ["fogo"], [], ["relâmpago", "ar"]],
+            "classes": [["mago"], ["mago", "feiticeiro"], ["clérigo"], []],
+        }
+    )
+
+
+def test_filter_df_sees_in_place_modifications(spells_df):
+    assert DFFilter.filter_df(spells_df, {"nivel": 1})["nome"].tolist() == [
+        "Bola de Fogo",
+        "Escudo",
+    ]
+
+    spells_df["nivel"] = spells_df["nivel"] + 1
+
+    filtered_df = DFFilter.filter_df(spells_df, {"nivel": 1})
+    assert filtered_df["nome"].tolist() == ["Luz"]
+
+
+def test_filter_df_using_index_matches_scan(spells_df):
+    index = SpellsIndex(spells_df)
+    filter_dict = {"nivel": [1, 2], "classes": "mago", "nome": "Bola de Fogo"}
+
+    filtered_df = DFFilter.filter_df(spells_df, filter_dict, index)
+
+    pd.testing.assert_frame_equal(
+        filtered_df, DFFilter.filter_df(spells_df, filter_dict)
+    )
+    assert filtered_df["nome"].tolist() == ["Bola de Fogo"]
+
+
+def test_filter_df_rejects_index_of_another_df(spells_df):
+    index = SpellsIndex(spells_df.iloc[:2])
+
+    with pytest.raises(ValueError):
+        DFFilter.filter_df(spells_df, {"nivel": 1}, index)
+
+
+def test_batch_df_filters_and_queries(spells_df):
+    spells_dfs = DFBatch.batch_df(
+        spells_df,
+        filters={"mago": {"classes": "mago"}},
+        queries={"fogo": "'fogo' in elementos", "nivel": "nivel > 0"},
+        workers=2,
+    )
+
+    assert spells_dfs["mago"]["nome"].tolist() == ["Luz", "Bola de Fogo"]
+    assert spells_dfs["fogo"]["nome"].tolist() == ["Bola de Fogo"]
+    assert spells_dfs["nivel"]["nome"].tolist() == [
+        "Bola de Fogo",
+        "Escudo",
+        "Relâmpago",
+    ]
+
+
+def test_filter_results_are_cached_by_the_index(spells_df):
+    index = SpellsIndex(spells_df)
+    DFFilter.filter_df(spells_df, {"classes": "mago"}, index)
+
+    spells_df["classes"] = [[], [], ["mago"], ["mago"]]
+    new_index = SpellsIndex(spells_df)
+
+    filtered_df = DFFilter.filter_df(spells_df, {"classes": "mago"}, new_index)
+    assert filtered_df["nome"].tolist() == ["Escudo", "Relâmpago"]
+
+
+def test_filter_df_using_json_uses_the_index(spells_df, tmp_path):
+    json_path = tmp_path / "filter.json"
+    json_path.write_text(json.dumps({"classes": "mago"}))
+    index = SpellsIndex(spells_df)
+
+    filtered_df = DFFilter.filter_df_using_json(spells_df, json_path, index)
+
+    assert filtered_df["nome"].tolist() == ["Luz", "Bola de Fogo"]
+    assert len(index._results) == 1
+
+
+@pytest.mark.parametrize(
+    "filter_spells",
+    [
+        lambda: DFFilter.filter_spells_df({"classes": "mago"}),
+        lambda: DFQuerrier.query_spells_df("'mago' in classes"),
+    ],
+)
+def test_spells_entry_points_index_the_loaded_df(
+    spells_df, monkeypatch, filter_spells
+):
+    monkeypatch.setattr(reader, "get_asserted_spells_df", lambda: spells_df)
+    indexes = list()
+    init = SpellsIndex.__init__
+
+    def spy_init(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        indexes.append(self)
+
+    monkeypatch.setattr(SpellsIndex, "__init__", spy_init)
+
+    filtered_df = filter_spells()
+
+    assert filtered_df["nome"].tolist() == ["Luz", "Bola de Fogo"]
+    assert len(indexes) == 1
+
+
+def test_batch_spells_df_from_files_keeps_the_workers_apart(
+    spells_df, monkeypatch, tmp_path
+):
+    json_path = tmp_path / "filter.json"
+    json_path.write_text(json.dumps({"nivel": 1}))
+    reader_kwargs = dict()
+
+    def get_asserted_spells_df(**kwargs):
+        reader_kwargs.update(kwargs)
+        return spells_df
+
+    monkeypatch.setattr(
+        reader, "get_asserted_spells_df", get_asserted_spells_df
+    )
+
+    spells_dfs = DFBatch.batch_spells_df_from_files(
+        filter_paths=[json_path], batch_workers=2, workers=8
+    )
+
+    assert spells_dfs[json_path]["nome"].tolist() == ["Bola de Fogo", "Escudo"]
+    assert reader_kwargs == {"workers": 8}
+    with pytest.raises(TypeError):
+        DFBatch.batch_spells_df_from_files([json_path])
@@ -0,0 +1,81 @@
+"""Tests of the query strings over the spells DataFrame."""
+
+# Third Party Libraries
+from dfs.df_filter import DFQuerrier
+from dfs.df_query import get_query_mask
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def spells_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "nome": ["Luz", "Bola de Fogo", "Onda", "Tempestade", "Chamas"],
+            "nivel": [0, 3, 1, 5, 1],
+            "elementos": [["luz"], ["fogo"], ["água"], ["água", "ar"], []],
+            "classes": [["mago"], ["mago"], ["druida"], ["druida"], ["mago"]],
+            "dmg": pd.Series(
+                [np.nan, "8d6", np.nan, "10d10", "1d6"], dtype="object"
+            ),
+        }
+    )
+
+
+def _query_names(spells_df: pd.DataFrame, query: str) -> list[str]:
+    return spells_df[get_query_mask(spells_df, query)]["nome"].tolist()
+
+
+def test_unparenthesized_or_has_pandas_precedence(spells_df):
+    names = _query_names(spells_df, "'fogo' in elementos | 'água' in elementos")
+
+    assert names == ["Bola de Fogo", "Onda", "Tempestade"]
+
+
+def test_unparenthesized_and_has_pandas_precedence(spells_df):
+    names = _query_names(spells_df, "'fogo' in elementos & nivel > 2")
+
+    assert names == ["Bola de Fogo"]
+
+
+def test_unparenthesized_query_matches_pandas(spells_df):
+    query = "nivel > 2 & nome != 'Luz' | nivel == 0"
+
+    names = _query_names(spells_df, query)
+
+    assert names == spells_df.query(query)["nome"].tolist()
+
+
+def test_contains_predicate(spells_df):
+    names = _query_names(spells_df, "classes contains 'druida' & nivel < 5")
+
+    assert names == ["Onda"]
+
+
+def test_contains_inside_strings_is_kept(spells_df):
+    spells_df.loc[4, "nome"] = "classes contains 'mago'"
+
+    names = _query_names(spells_df, "nome == \"classes contains 'mago'\"")
+
+    assert names == ["classes contains 'mago'"]
+
+
+def test_backticks_are_queried_by_pandas(spells_df):
+    queried_df = DFQuerrier.query_df(spells_df, "`nivel` == 1")
+
+    assert queried_df["nome"].tolist() == ["Onda", "Chamas"]
+
+
+def test_list_column_on_the_left_matches_the_joined_string(spells_df):
+    # the saved queries compare the joined lists, as Pandas always did
+    assert _query_names(spells_df, "elementos in ['água']") == ["Onda"]
+    assert _query_names(spells_df, "elementos in ['água, ar']") == [
+        "Tempestade"
+    ]
+
+
+def test_missing_values_dont_match(spells_df):
+    names = _query_names(spells_df, "dmg.str.contains('d6')")
+
+    assert names == ["Bola de Fogo", "Chamas"]
@@ -0,0 +1,68 @@
+"""Tests of the reading of the spells DataFrame and of its snapshot."""
+
+# Python Standard Libraries
+import json
+from pathlib import Path
+import shutil
+
+# Third Party Libraries
+import dfs.df_reader as reader
+import pandas as pd
+import pytest
+
+MAGIAS_PATH = Path(__file__).parents[1]
+SPELL_FILES = ["Absorver Elementos.json", "Ajuda.json", "Alarme.json"]
+
+
+@pytest.fixture
+def spells_folder(tmp_path) -> str:
+    for file_name in SPELL_FILES:
+        shutil.copy(MAGIAS_PATH / "data" / file_name, tmp_path)
+    return f"{tmp_path}/"
+
+
+def edit_spell(spells_folder: str, file_name: str, **values) -> None:
+    path = Path(spells_folder) / file_name
+    spell = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(
+        json.dumps({**spell, **values}, ensure_ascii=False), encoding="utf-8"
+    )
+
+
+def test_snapshot_is_reused(spells_folder, capsys):
+    spells_df = reader.get_spells_df(spells_folder, verbose=True)
+    assert "loaded from snapshot" not in capsys.readouterr().out
+    assert (Path(spells_folder) / reader.SNAPSHOT_FILE_NAME).exists()
+
+    snapshot_df = reader.get_spells_df(spells_folder, verbose=True)
+
+    assert "loaded from snapshot" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(snapshot_df, spells_df)
+
+
+def test_edited_spell_invalidates_the_snapshot(spells_folder, capsys):
+    reader.get_spells_df(spells_folder)
+    edit_spell(spells_folder, "Ajuda.json", mana=123)
+
+    spells_df = reader.get_spells_df(spells_folder, verbose=True)
+
+    assert "loaded from snapshot" not in capsys.readouterr().out
+    assert spells_df.set_index("nome").loc["Ajuda", "mana"] == 123
+
+
+def test_removed_spell_invalidates_the_snapshot(spells_folder):
+    reader.get_spells_df(spells_folder)
+    (Path(spells_folder) / "Ajuda.json").unlink()
+
+    spells_df = reader.get_spells_df(spells_folder)
+
+    assert sorted(spells_df["nome"]) == ["Absorver Elementos", "Alarme"]
+
+
+def test_snapshot_projects_the_columns(spells_folder):
+    spells_df = reader.get_spells_df(spells_folder)
+
+    projected_df = reader.get_spells_df(spells_folder, columns=["nome", "mana"])
+
+    assert list(projected_df.columns) == ["nome", "mana"]
+    pd.testing.assert_frame_equal(projected_df, spells_df[["nome", "mana"]])
@@ -0,0 +1,75 @@
+"""Tests of the exact distribution of the formulas of dice."""
+
+# Third Party Libraries
+from dice.dice_calculator import get_dice_formula_std
+from dice.dice_distribution import (
+    DiceDistribution,
+    get_dice_distribution,
+    parse_dice_formula,
+)
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("dice_formula", ["1d6", "4d10 + 2d6 + 5", "60d20"])
+def test_pmf_sums_to_one(dice_formula):
+    distribution = DiceDistribution(dice_formula)
+
+    assert distribution.pmf.sum() == pytest.approx(1)
+    assert (distribution.pmf >= 0).all()
+
+
+def test_two_dice_pmf_is_exact():
+    distribution = DiceDistribution("2d6")
+
+    assert (distribution.min_value, distribution.max_value) == (2, 12)
+    expected_pmf = np.array([1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1]) / 36
+    np.testing.assert_allclose(distribution.pmf, expected_pmf)
+
+
+@pytest.mark.parametrize(
+    "dice_formula, mean, variance",
+    [
+        ("1d6", 3.5, 35 / 12),
+        ("6d8 + 4", 31, 6 * 63 / 12),
+        ("4d10 + 2d6 + 5", 34, 4 * 99 / 12 + 2 * 35 / 12),
+    ],
+)
+def test_mean_and_variance_are_exact(dice_formula, mean, variance):
+    distribution = DiceDistribution(dice_formula)
+
+    assert distribution.mean == pytest.approx(mean)
+    assert distribution.variance == pytest.approx(variance)
+    assert get_dice_formula_std(dice_formula) == pytest.approx(variance**0.5)
+
+
+def test_subtracted_dice():
+    distribution = DiceDistribution("1d6 - 1d4")
+
+    assert (distribution.min_value, distribution.max_value) == (-3, 5)
+    assert distribution.mean == pytest.approx(1)
+    assert distribution.variance == pytest.approx(35 / 12 + 15 / 12)
+    assert distribution.prob(-3) == pytest.approx(1 / 24)
+    assert distribution.prob_at_least(5) == pytest.approx(1 / 24)
+
+
+def test_tails_and_percentiles():
+    distribution = DiceDistribution("20d6")
+
+    assert distribution.prob_at_least(120) == pytest.approx(6.0**-20)
+    assert distribution.prob_at_most(19) == 0
+    assert distribution.percentile(50) == 70
+    assert list(DiceDistribution("2d6").percentile([0, 100])) == [2, 12]
+
+
+def test_parse_dice_formula():
+    assert parse_dice_formula("d6 + 2d4 - 3") == (((1, 1, 6), (1, 2, 4)), -3)
+    assert get_dice_distribution("2d6 + 1") is get_dice_distribution(
+        "1 + 2d6"
+    )
+
+
+@pytest.mark.parametrize("dice_formula", ["1d8 ou 1d12", "mod", "2d0", ""])
+def test_invalid_formula_raises(dice_formula):
+    with pytest.raises(ValueError):
+        parse_dice_formula(dice_formula)
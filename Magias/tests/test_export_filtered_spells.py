@@ -0,0 +1,30 @@
+"""Tests of the command line script which exports the filtered spells."""
+
+# Python Standard Libraries
+import builtins
+import sys
+
+# Third Party Libraries
+from export_filtered_spells import ImportTimer
+
+
+def test_import_timer_restores_the_import(tmp_path, monkeypatch, capsys):
+    package_path = tmp_path / "timed_package"
+    package_path.mkdir()
+    (package_path / "__init__.py").write_text(
+        "from .timed_module import VALUE\n"
+    )
+    (package_path / "timed_module.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    original_import = builtins.__import__
+
+    with ImportTimer(min_seconds=0) as import_timer:
+        import timed_package  # noqa: F401
+
+    assert builtins.__import__ is original_import
+    imported_modules = [name for _, name, _ in import_timer.imports]
+    assert imported_modules == ["timed_package.timed_module", "timed_package"]
+    assert "timed_package.timed_module" in capsys.readouterr().out
+
+    for module_name in ["timed_package", "timed_package.timed_module"]:
+        del sys.modules[module_name]
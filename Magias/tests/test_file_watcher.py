@@ -0,0 +1,89 @@
+"""Tests of the watcher of the spells files."""
+
+# Python Standard Libraries
+import os
+from pathlib import Path
+import threading
+from typing import Callable
+
+# Third Party Libraries
+from dfs.file_watcher import FileWatcher
+import pytest
+
+
+@pytest.fixture
+def watched_paths(tmp_path) -> tuple[str, str]:
+    spells_folder = tmp_path / "data"
+    spells_folder.mkdir()
+    (spells_folder / "Luz.json").write_text("{}")
+    filter_path = tmp_path / "filter.json"
+    filter_path.write_text("{}")
+    return f"{spells_folder}/", str(filter_path)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher(request, watched_paths) -> FileWatcher:
+    with FileWatcher(
+        list(watched_paths),
+        debounce=0.1,
+        poll_interval=0.02,
+        use_inotify=request.param,
+    ) as watcher:
+        if request.param and not watcher.uses_inotify:
+            pytest.skip("inotify isn't available")
+        yield watcher
+
+
+def wait_for(watcher: FileWatcher, *changes: Callable[[], None]) -> set[str]:
+    """Wait for the changes, which are made by another thread."""
+
+    def make_changes():
+        for change in changes:
+            change()
+
+    thread = threading.Timer(0.1, make_changes)
+    thread.start()
+    try:
+        return watcher.wait()
+    finally:
+        thread.join()
+
+
+def test_edited_spell_changes_its_folder(watcher, watched_paths):
+    spells_folder, _ = watched_paths
+    spell_path = Path(spells_folder) / "Luz.json"
+
+    changed_paths = wait_for(watcher, lambda: spell_path.write_text("{1}"))
+
+    assert changed_paths == {spells_folder}
+
+
+def test_other_files_of_the_folder_are_ignored(watcher, watched_paths):
+    spells_folder, filter_path = watched_paths
+
+    changed_paths = wait_for(
+        watcher,
+        lambda: (Path(spells_folder) / ".cache.pkl").write_text("cache"),
+        lambda: (Path(spells_folder) / "notes.txt").write_text("notes"),
+        lambda: Path(filter_path).write_text('{"nivel": [1]}'),
+    )
+
+    assert changed_paths == {filter_path}
+
+
+def test_burst_of_changes_is_returned_at_once(watcher, watched_paths):
+    spells_folder, filter_path = watched_paths
+    new_filter_path = Path(filter_path).with_suffix(".tmp")
+
+    def replace_filter():
+        # as an editor saves a file
+        new_filter_path.write_text('{"nivel": [2]}')
+        os.replace(new_filter_path, filter_path)
+
+    changed_paths = wait_for(
+        watcher,
+        lambda: (Path(spells_folder) / "Luz.json").unlink(),
+        replace_filter,
+    )
+
+    assert changed_paths == {spells_folder, filter_path}
@@ -0,0 +1,96 @@
+"""Tests of the on disk cache of the LaTeX fragments of the spells."""
+
+# Python Standard Libraries
+from pathlib import Path
+
+# Third Party Libraries
+import pytest
+import spell.fragment_cache as fragment_cache
+from spell.fragment_cache import (
+    FragmentCache,
+    get_fragment_cache_path,
+    get_fragment_key,
+)
+
+SPELL_ROW = {"nome": "Alarme", "nivel": 1, "escola": ["Abjuração"]}
+
+
+@pytest.fixture
+def renderer_source(tmp_path, monkeypatch) -> Path:
+    source_path = tmp_path / "renderer.py"
+    source_path.write_text("VERSION = 1\n")
+    monkeypatch.setattr(fragment_cache, "RENDERER_SOURCES", [source_path])
+    return source_path
+
+
+@pytest.fixture
+def cache_path(tmp_path, renderer_source) -> Path:
+    return get_fragment_cache_path(str(tmp_path / "out" / "book"))
+
+
+def render(spell_row: dict) -> str:
+    return f"\\section{{{spell_row['nome']}}}"
+
+
+def render_fails(spell_row: dict) -> str:
+    raise AssertionError("the fragment should be cached")
+
+
+def test_cache_path_is_next_to_the_file(tmp_path):
+    cache_path = get_fragment_cache_path(str(tmp_path / "out" / "book"))
+
+    assert cache_path == tmp_path / "out" / ".book.fragments.pkl"
+
+
+def test_saved_fragment_is_a_hit(cache_path):
+    cache = FragmentCache(cache_path)
+    assert cache.get_fragment("description", SPELL_ROW, render) == (
+        render(SPELL_ROW)
+    )
+    assert (cache.hits, cache.misses) == (0, 1)
+    cache.save()
+
+    cache = FragmentCache(cache_path)
+    assert cache.get_fragment("description", SPELL_ROW, render_fails) == (
+        render(SPELL_ROW)
+    )
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_renderer_change_invalidates_the_cache(cache_path, renderer_source):
+    cache = FragmentCache(cache_path)
+    cache.get_fragment("description", SPELL_ROW, render)
+    cache.save()
+
+    renderer_source.write_text("VERSION = 2\n")
+
+    cache = FragmentCache(cache_path)
+    assert cache.lookup("description", SPELL_ROW) is None
+
+
+def test_fragments_are_keyed_by_the_row_content():
+    reordered_row = dict(reversed(SPELL_ROW.items()))
+    edited_row = {**SPELL_ROW, "nivel": 2}
+
+    key = get_fragment_key("description", SPELL_ROW)
+    assert get_fragment_key("description", reordered_row) == key
+    assert get_fragment_key("description", edited_row) != key
+    assert get_fragment_key("resume", SPELL_ROW) != key
+
+
+def test_unused_fragments_are_dropped(cache_path):
+    edited_row = {**SPELL_ROW, "nivel": 2}
+    cache = FragmentCache(cache_path)
+    cache.get_fragment("description", SPELL_ROW, render)
+    cache.get_fragment("resume", SPELL_ROW, render)
+    cache.save()
+
+    cache = FragmentCache(cache_path)
+    cache.get_fragment("description", edited_row, render)
+    cache.get_fragment("resume", SPELL_ROW, render_fails)
+    cache.save()
+
+    cache = FragmentCache(cache_path)
+    assert cache.lookup("description", SPELL_ROW) is None
+    assert cache.lookup("description", edited_row) is not None
+    assert cache.lookup("resume", SPELL_ROW) is not None
@@ -0,0 +1,70 @@
+"""Tests of the incremental reader of the spells DataFrame."""
+
+# Python Standard Libraries
+import json
+from pathlib import Path
+import shutil
+
+# Third Party Libraries
+from dfs.incremental_reader import IncrementalSpellsReader
+import pytest
+
+MAGIAS_PATH = Path(__file__).parents[1]
+SPELL_FILES = ["Absorver Elementos.json", "Acalmar Emoções.json"]
+
+
+@pytest.fixture
+def spells_reader(tmp_path) -> IncrementalSpellsReader:
+    # the validation cache is stored next to the config, so it's copied
+    shutil.copy(MAGIAS_PATH / "dfs" / "schema_config.json", tmp_path)
+    (tmp_path / "data").mkdir()
+    for file_name in SPELL_FILES:
+        shutil.copy(MAGIAS_PATH / "data" / file_name, tmp_path / "data")
+    return IncrementalSpellsReader(
+        f"{tmp_path}/data/", tmp_path / "schema_config.json"
+    )
+
+
+def edit_spell(spells_reader: IncrementalSpellsReader, spell: dict) -> None:
+    path = Path(spells_reader.path_prefix) / f"{spell['nome']}.json"
+    with open(path, "w") as file:
+        json.dump(spell, file, ensure_ascii=False)
+
+
+def test_edited_spell_is_reloaded(spells_reader):
+    spells_df = spells_reader.get_asserted_spells_df()
+    spell = spells_df.iloc[0].to_dict()
+    spell["escola"] = spell["escola"][0]
+    spell["mana"] += 1
+    edit_spell(spells_reader, spell)
+
+    new_spells_df = spells_reader.get_asserted_spells_df()
+
+    assert new_spells_df is not spells_df
+    assert len(new_spells_df) == len(spells_df)
+    assert new_spells_df.iloc[0]["mana"] == spell["mana"]
+    assert spells_reader.get_asserted_spells_df() is new_spells_df
+
+
+def test_spell_missing_a_mandatory_key_is_reported(spells_reader, capsys):
+    spells_df = spells_reader.get_asserted_spells_df()
+    spell = spells_df.iloc[0].to_dict()
+    spell["escola"] = spell["escola"][0]
+    del spell["tags"]
+    edit_spell(spells_reader, spell)
+
+    new_spells_df = spells_reader.get_asserted_spells_df()
+
+    assert "Schema errors." in capsys.readouterr().out
+    assert list(new_spells_df.columns) == list(spells_df.columns)
+    assert new_spells_df["tags"].isna().sum() == 1
+
+
+def test_empty_folder_returns_an_empty_df(spells_reader):
+    for file_name in SPELL_FILES:
+        (Path(spells_reader.path_prefix) / file_name).unlink()
+
+    spells_df = spells_reader.get_asserted_spells_df()
+
+    assert spells_df.empty
+    assert "nome" in spells_df.columns
@@ -0,0 +1,59 @@
+"""Tests of the client of the LaTeX build server."""
+
+# Python Standard Libraries
+import socket
+import time
+
+# Third Party Libraries
+import pytest
+import spell.latex_server as latex_server
+import spell.spell_exporter as exporter
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch) -> str:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "latex_compilation").mkdir()
+    return latex_server.SOCKET_PATH
+
+
+@pytest.fixture
+def stuck_server(socket_path):
+    """A server which accepts the jobs, but never answers them."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen()
+        yield server
+
+
+def test_stuck_server_times_out(stuck_server, socket_path, monkeypatch):
+    monkeypatch.setattr(latex_server, "RESPONSE_TIMEOUT", 0.1)
+
+    start_time = time.perf_counter()
+    status = latex_server.submit_job("book", socket_path=socket_path)
+
+    assert status is None
+    assert time.perf_counter() - start_time < 5
+
+
+def test_stale_socket_isnt_used(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+
+    assert latex_server.submit_job("book", socket_path=socket_path) is None
+
+
+def test_compilation_falls_back_to_pdflatex(
+    stuck_server, socket_path, monkeypatch
+):
+    monkeypatch.setattr(latex_server, "RESPONSE_TIMEOUT", 0.1)
+    compiled_files = list()
+
+    def run_pdflatex(filename, verbose=False, timeout=None):
+        compiled_files.append(filename)
+        return 0
+
+    monkeypatch.setattr(latex_server, "run_pdflatex", run_pdflatex)
+
+    assert exporter.compile_tex_file("book") == 0
+    assert compiled_files == ["book"]
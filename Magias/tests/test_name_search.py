@@ -0,0 +1,46 @@
+"""Tests of the fuzzy lookup of spells by their names."""
+
+# Third Party Libraries
+from dfs.name_search import SpellNameIndex
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def spells_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "nome": ["Bola de Fogo", "Raio de Fogo", "Luz", "Santuário"],
+            "name": ["Fireball", "Fire Bolt", "Light", "Sanctuary"],
+        }
+    )
+
+
+@pytest.fixture
+def name_index(spells_df) -> SpellNameIndex:
+    return SpellNameIndex(spells_df)
+
+
+def test_lookup_with_typos(name_index):
+    assert name_index.lookup("bola de fgo")[0][0] == 0
+
+
+def test_lookup_partial_name(name_index):
+    assert name_index.lookup("santu") == [(3, 0.9)]
+
+
+def test_short_queries_are_not_contained(name_index):
+    assert all(score < 0.9 for _, score in name_index.lookup("a"))
+
+
+def test_lookup_spells_df_keeps_every_contained_name(spells_df, name_index):
+    matches_df = name_index.lookup_spells_df(spells_df, "fogo", limit=0)
+
+    assert sorted(matches_df["nome"]) == ["Bola de Fogo", "Raio de Fogo"]
+
+
+def test_lookup_spells_df_suggests_similar_names(spells_df, name_index):
+    matches_df = name_index.lookup_spells_df(spells_df, "raio de fgo")
+
+    assert matches_df["nome"].iloc[0] == "Raio de Fogo"
+    assert "Luz" not in set(matches_df["nome"])
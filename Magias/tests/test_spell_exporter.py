@@ -0,0 +1,111 @@
+"""Tests of the export of the spells into LaTeX and PDF files."""
+
+# Python Standard Libraries
+from pathlib import Path
+
+# Third Party Libraries
+import pandas as pd
+import pytest
+import spell.spell_exporter as exporter
+from spell.spell_format_converter import get_latex_spells
+
+SPELL_FILES = [
+    "Absorver Elementos.json",
+    "Acalmar Emoções.json",
+    "Agarrão da Terra.json",
+    "Amizade.json",
+]
+
+
+@pytest.fixture
+def spells_df(read_data_spells) -> pd.DataFrame:
+    return read_data_spells(SPELL_FILES)
+
+
+@pytest.fixture
+def build_folder(tmp_path, monkeypatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "latex_compilation").mkdir()
+    return tmp_path / "latex_compilation"
+
+
+def fake_compile_tex_file(status: int):
+    def compile_tex_file(filename: str, verbose: bool = False) -> int:
+        if status == 0:
+            Path(f"{filename}.pdf").write_bytes(b"new")
+        return status
+
+    return compile_tex_file
+
+
+def test_standalone_tex_has_the_whole_document(
+    spells_df, build_folder, monkeypatch
+):
+    monkeypatch.setattr(exporter, "compile_tex_file", fake_compile_tex_file(0))
+
+    exporter.export_spells(spells_df, "out/book", use_cache=False)
+
+    standalone_tex = Path("out/book.tex").read_text(encoding="utf-8")
+    assert standalone_tex == exporter.LATEX_TEMPLATE % get_latex_spells(
+        spells_df
+    )
+    assert Path("out/book.pdf").read_bytes() == b"new"
+
+
+def test_failed_compilation_doesnt_copy_a_stale_pdf(
+    spells_df, build_folder, monkeypatch, capsys
+):
+    (build_folder / "book.pdf").write_bytes(b"stale")
+    monkeypatch.setattr(exporter, "compile_tex_file", fake_compile_tex_file(1))
+
+    exporter.export_spells(spells_df, "out/book", use_cache=False)
+
+    assert "couldn't be compiled" in capsys.readouterr().out
+    assert not Path("out/book.pdf").exists()
+
+
+def test_unchanged_parts_are_kept(spells_df, build_folder):
+    filename = str(build_folder / "book")
+    assert exporter.export_tex_parts(spells_df, filename, use_cache=False)
+    parts_folder = build_folder / f"book{exporter.PARTS_FOLDER_SUFFIX}"
+    mtimes = {x: x.stat().st_mtime_ns for x in parts_folder.iterdir()}
+
+    assert not exporter.export_tex_parts(spells_df, filename, use_cache=False)
+    assert {x: x.stat().st_mtime_ns for x in parts_folder.iterdir()} == mtimes
+
+    assert exporter.export_tex_parts(
+        spells_df[spells_df["nivel"] == 0], filename, use_cache=False
+    )
+    assert len(list(parts_folder.iterdir())) == 2
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_tex_file_has_the_whole_document(spells_df, build_folder, use_cache):
+    filename = str(build_folder / "book")
+
+    exporter.export_tex_file(spells_df, filename, use_cache=use_cache)
+    exporter.export_tex_file(spells_df, filename, use_cache=use_cache)
+
+    tex = Path(f"{filename}.tex").read_text(encoding="utf-8")
+    assert tex == exporter.LATEX_TEMPLATE % get_latex_spells(spells_df)
+
+
+def test_tex_file_is_written_while_the_spells_are_converted(
+    spells_df, build_folder, monkeypatch
+):
+    filename = str(build_folder / "book")
+    chunk = "%" * (1 << 16) + "\n"
+    written_sizes = list()
+
+    def iter_latex_spells(*args):
+        for _ in range(4):
+            written_sizes.append(Path(f"{filename}.tex").stat().st_size)
+            yield chunk
+
+    monkeypatch.setattr(exporter, "iter_latex_spells", iter_latex_spells)
+
+    exporter.export_tex_file(spells_df, filename, use_cache=False)
+
+    # each chunk is already in the file when the next one is converted
+    assert written_sizes[1:] == sorted(written_sizes[1:])
+    assert written_sizes[3] - written_sizes[1] >= 2 * len(chunk)
@@ -0,0 +1,54 @@
+"""Tests of the conversion of the spells into LaTeX using many processes."""
+
+# Third Party Libraries
+import pandas as pd
+import pytest
+from spell.fragment_cache import FragmentCache, get_fragment_cache_path
+from spell.spell_format_converter import (
+    get_latex_spells,
+    iter_latex_spells_description_parts,
+)
+
+SPELL_FILES = [
+    "Absorver Elementos.json",
+    "Acalmar Emoções.json",
+    "Agarrão da Terra.json",
+    "Ajuda.json",
+    "Alarme.json",
+    "Alterar-se.json",
+    "Amizade.json",
+    "Arma Espiritual.json",
+    "Bafo de Dragão.json",
+    "Bruxaria.json",
+    "Chama Sagrada.json",
+    "Convocar Montaria.json",
+]
+
+
+@pytest.fixture
+def spells_df(read_data_spells) -> pd.DataFrame:
+    return read_data_spells(SPELL_FILES)
+
+
+@pytest.mark.parametrize("workers", [2, 5])
+def test_parallel_rendering_is_byte_identical(spells_df, workers):
+    serial_latex = get_latex_spells(spells_df)
+
+    assert get_latex_spells(spells_df, workers=workers) == serial_latex
+    assert list(
+        iter_latex_spells_description_parts(spells_df, workers=workers)
+    ) == list(iter_latex_spells_description_parts(spells_df))
+
+
+def test_parallel_rendering_with_some_cached_spells(spells_df, tmp_path):
+    fragment_cache = FragmentCache(get_fragment_cache_path(str(tmp_path)))
+    get_latex_spells(spells_df.iloc[::3], fragment_cache)
+    misses = fragment_cache.misses
+
+    latex = get_latex_spells(spells_df, fragment_cache, workers=3)
+
+    assert latex == get_latex_spells(spells_df)
+    assert fragment_cache.hits == misses
+    # the new fragments rendered by the processes are cached too
+    assert get_latex_spells(spells_df, fragment_cache, workers=3) == latex
+    assert fragment_cache.misses == 2 * len(spells_df)
@@ -0,0 +1,45 @@
+"""Tests of the rendering of the spells into LaTeX."""
+
+# Python Standard Libraries
+from pathlib import Path
+
+# Third Party Libraries
+import pandas as pd
+import pytest
+from spell.spell_format_converter import (
+    get_latex_spell_description,
+    get_latex_spells,
+)
+
+# generated by the Markdown based renderer which preceded `LatexRenderer`
+GOLDEN_PATH = Path(__file__).parent / "data" / "golden_spells.tex"
+SPELL_FILES = [
+    "Absorver Elementos.json",
+    "Alarme.json",
+    "Amizade.json",
+    "Bruxaria.json",
+    "Chama Sagrada.json",
+    "Convocar Montaria.json",
+]
+
+
+@pytest.fixture
+def spells_df(read_data_spells) -> pd.DataFrame:
+    return read_data_spells(SPELL_FILES)
+
+
+def test_latex_matches_the_golden_output(spells_df):
+    golden_latex = GOLDEN_PATH.read_text(encoding="utf-8")
+
+    assert get_latex_spells(spells_df) == golden_latex
+
+
+def test_every_line_break_of_the_description_is_converted(spells_df):
+    spell_series = spells_df.iloc[0].copy()
+    spell_series["descricao"] = "\n".join(f"Linha {i}." for i in range(15))
+
+    latex_description = get_latex_spell_description(spell_series)
+
+    assert "<br>" not in latex_description
+    for i in range(14):
+        assert f"Linha {i}." + r"\\" in latex_description
@@ -0,0 +1,93 @@
+"""Tests of the vectorized checks of the spells schema."""
+
+# Third Party Libraries
+from dfs.spells_schema import (
+    check_list_values_are_valid,
+    check_series_lists_are_valid,
+    get_spells_schema,
+)
+import pandas as pd
+from pandera.errors import SchemaErrors
+import pytest
+
+POSSIBLE_VALUES = ["mago", "bardo", "clérigo"]
+LIST_VALUES = [
+    ["mago"],
+    [],
+    ["mago", "bardo"],
+    ["guerreiro"],
+    ["mago", "guerreiro"],
+    # a single value outside a list
+    "mago",
+    "bardo",
+    # an empty string has no values, like an empty list
+    "",
+]
+
+
+def _get_failure_cases(spells_df: pd.DataFrame, element_wise: bool) -> set:
+    schema = get_spells_schema(element_wise).select_columns(
+        list(spells_df.columns)
+    )
+    with pytest.raises(SchemaErrors) as exc_info:
+        schema.validate(spells_df, lazy=True)
+    failure_cases = exc_info.value.failure_cases
+    return set(zip(failure_cases["column"], failure_cases["index"]))
+
+
+def test_series_lists_check_matches_element_wise_check():
+    series = pd.Series(LIST_VALUES)
+
+    is_valid = check_series_lists_are_valid(series, POSSIBLE_VALUES)
+
+    expected = [
+        check_list_values_are_valid(values, POSSIBLE_VALUES)
+        for values in LIST_VALUES
+    ]
+    assert is_valid.tolist() == expected
+
+
+def test_series_lists_check_rejects_scalars():
+    series = pd.Series(["mago", ["mago"]])
+
+    is_valid = check_series_lists_are_valid(series, POSSIBLE_VALUES)
+
+    assert is_valid.tolist() == [False, True]
+
+
+def test_vectorized_schema_reports_the_element_wise_failures():
+    spells_df = pd.DataFrame(
+        {
+            "classes": [["mago"], "mago", ["guerreiro"], []],
+            "elementos": [["fogo"], ["fogo", "ar"], "fogo", ["madeira"]],
+            "tags": [[], ["xx"], ["xx"], []],
+        }
+    )
+
+    failure_cases = _get_failure_cases(spells_df, element_wise=False)
+
+    assert failure_cases == _get_failure_cases(spells_df, element_wise=True)
+    assert ("classes", 1) in failure_cases
+    assert ("elementos", 2) in failure_cases
+
+
+def test_vectorized_schema_reports_each_value_which_isnt_a_string():
+    spells_df = pd.DataFrame(
+        {
+            "alcance_area": ["toque", 9, "longe"],
+            "classes": [["mago"], 9, ""],
+        }
+    )
+
+    failure_cases = _get_failure_cases(spells_df, element_wise=False)
+
+    # the element-wise checks fail the whole columns with a TypeError
+    assert _get_failure_cases(spells_df, element_wise=True) == {
+        ("alcance_area", None),
+        ("classes", None),
+    }
+    assert failure_cases == {
+        ("alcance_area", 1),
+        ("alcance_area", 2),
+        ("classes", 1),
+    }
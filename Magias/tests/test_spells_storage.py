@@ -0,0 +1,78 @@
+"""Tests of the conversion of the spells between the storage formats."""
+
+# Python Standard Libraries
+from pathlib import Path
+import shutil
+
+# Third Party Libraries
+import dfs.df_reader as reader
+import dfs.spells_storage as storage
+import pandas as pd
+import pytest
+
+MAGIAS_PATH = Path(__file__).parents[1]
+SPELL_FILES = ["Absorver Elementos.json", "Ajuda.json", "Alarme.json"]
+
+
+@pytest.fixture
+def spells_folder(tmp_path) -> str:
+    (tmp_path / "data").mkdir()
+    for file_name in SPELL_FILES:
+        shutil.copy(MAGIAS_PATH / "data" / file_name, tmp_path / "data")
+    return f"{tmp_path}/data/"
+
+
+@pytest.mark.parametrize("bundle_name", ["spells.jsonl", "spells.sqlite"])
+def test_conversion_round_trip_keeps_the_spells(spells_folder, bundle_name):
+    bundle_path = str(Path(spells_folder).parent / bundle_name)
+    copy_folder = str(Path(spells_folder).parent / "copy") + "/"
+    spells, _ = storage.read_spells(spells_folder)
+
+    storage.convert_spells(spells_folder, bundle_path)
+    storage.convert_spells(bundle_path, copy_folder)
+
+    bundled_spells, all_valid = storage.read_spells(bundle_path)
+    assert all_valid
+    assert bundled_spells == spells
+    # the order of the keys of each spell is kept too
+    for file_name, spell in bundled_spells.items():
+        assert list(spell) == list(spells[file_name])
+    assert storage.read_spells(copy_folder) == (spells, True)
+
+
+@pytest.mark.parametrize("bundle_name", ["spells.jsonl", "spells.sqlite"])
+def test_bundle_reads_as_the_folder(spells_folder, bundle_name):
+    bundle_path = str(Path(spells_folder).parent / bundle_name)
+    storage.convert_spells(spells_folder, bundle_path)
+
+    bundle_df = reader.get_spells_df(bundle_path, use_cache=False)
+
+    folder_df = reader.get_spells_df(spells_folder, use_cache=False)
+    pd.testing.assert_frame_equal(bundle_df, folder_df)
+
+
+def test_sqlite_partial_load(spells_folder, tmp_path):
+    bundle_path = str(tmp_path / "spells.sqlite")
+    storage.convert_spells(spells_folder, bundle_path)
+
+    spells, _ = storage.read_spells(
+        bundle_path, where={"nivel": [1]}, columns=["nome"]
+    )
+
+    assert spells == {
+        "Alarme.json": {"nome": "Alarme"},
+        "Absorver Elementos.json": {"nome": "Absorver Elementos"},
+    }
+    with pytest.raises(ValueError):
+        storage.read_spells(spells_folder, where={"nivel": [1]})
+
+
+def test_invalid_jsonl_line_isnt_converted(tmp_path, capsys):
+    bundle_path = tmp_path / "spells.jsonl"
+    bundle_path.write_text('{"file_name": "a.json", "spell": {}}\n{bad\n')
+
+    with pytest.raises(ValueError):
+        storage.convert_spells(str(bundle_path), f"{tmp_path}/data/")
+
+    assert "Line 2" in capsys.readouterr().out
+    assert not (tmp_path / "data").exists()
@@ -0,0 +1,95 @@
+"""Tests of the full-text search over the spells."""
+
+# Python Standard Libraries
+import json
+
+# Third Party Libraries
+from dfs.text_search import SpellsSearchIndex
+import pytest
+
+SPELLS = [
+    {
+        "nome": "Bola de Elemento",
+        "name": "Elemental Ball",
+        "descricao": (
+            "Um brilho de energia parte do seu dedo e explode em um ponto "
+            "que você escolher dentro do alcance."
+        ),
+    },
+    {
+        "nome": "Santuário",
+        "name": "Sanctuary",
+        "descricao": (
+            "Você protege uma criatura contra ataques. Se ela conjurar uma "
+            "bola de fogo, a magia termina."
+        ),
+    },
+    {
+        "nome": "Raio de Fogo",
+        "name": "Fire Bolt",
+        "descricao": "Você arremessa um cisco de fogo em uma criatura.",
+    },
+    {
+        "nome": "Produzir Chama",
+        "name": "Produce Flame",
+        "descricao": "Uma chama de fogo tremeluzente aparece na sua mão.",
+    },
+    {
+        "nome": "Luz",
+        "name": "Light",
+        "descricao": "Você toca um objeto de até 3 metros.",
+    },
+]
+
+
+def write_spell(folder, spell: dict) -> None:
+    with open(folder / f"{spell['name']}.json", "w") as file:
+        json.dump(spell, file)
+
+
+@pytest.fixture
+def search_index(tmp_path) -> SpellsSearchIndex:
+    for spell in SPELLS:
+        write_spell(tmp_path, spell)
+    return SpellsSearchIndex(f"{tmp_path}/", use_cache=False)
+
+
+def test_multi_word_name_is_the_top_hit(search_index):
+    assert search_index.search_names("raio de fogo")[0] == "Raio de Fogo"
+
+
+def test_name_terms_count_more_than_description_terms(search_index):
+    names = search_index.search_names("bola de fogo")
+
+    # only the description of 'Santuário' has all the terms
+    assert names[0] == "Bola de Elemento"
+    assert names.index("Raio de Fogo") < names.index("Santuário")
+
+
+def test_search_is_accent_insensitive(search_index):
+    assert search_index.search_names("santuario") == ["Santuário"]
+
+
+def test_cached_index_is_reused(search_index, capsys):
+    cached_index = SpellsSearchIndex(search_index.path_prefix, verbose=True)
+    assert "5 spells indexed" in capsys.readouterr().out
+
+    loaded_index = SpellsSearchIndex(search_index.path_prefix, verbose=True)
+
+    assert capsys.readouterr().out == ""
+    assert loaded_index.search("fogo") == cached_index.search("fogo")
+
+
+def test_cached_index_reindexes_the_changed_spells(
+    search_index, tmp_path, capsys
+):
+    SpellsSearchIndex(search_index.path_prefix)
+    write_spell(tmp_path, {**SPELLS[4], "descricao": "Uma luz de fogo."})
+    (tmp_path / f"{SPELLS[0]['name']}.json").unlink()
+
+    loaded_index = SpellsSearchIndex(search_index.path_prefix, verbose=True)
+
+    assert "1 spells indexed and 1 removed" in capsys.readouterr().out
+    names = loaded_index.search_names("fogo", limit=None)
+    assert "Luz" in names
+    assert "Bola de Elemento" not in loaded_index.search_names("elemento")
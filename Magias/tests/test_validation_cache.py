@@ -0,0 +1,85 @@
+"""Tests of the cache of the spells which passed the schema validation."""
+
+# Python Standard Libraries
+import json
+from pathlib import Path
+import shutil
+
+# Third Party Libraries
+import dfs.df_reader as reader
+from dfs.validation_cache import VALIDATION_CACHE_FILE_NAME
+import pytest
+
+MAGIAS_PATH = Path(__file__).parents[1]
+# together, they have all the columns of the schema
+SPELL_FILES = ["Ajuda.json", "Amizade.json", "Convocar Montaria.json"]
+
+
+@pytest.fixture
+def config_path(tmp_path) -> Path:
+    # the validation cache is stored next to the config, so it's copied
+    shutil.copy(MAGIAS_PATH / "dfs" / "schema_config.json", tmp_path)
+    (tmp_path / "data").mkdir()
+    for file_name in SPELL_FILES:
+        shutil.copy(MAGIAS_PATH / "data" / file_name, tmp_path / "data")
+    return tmp_path / "schema_config.json"
+
+
+def get_asserted_spells_df(config_path: Path, **kwargs):
+    return reader.get_asserted_spells_df(
+        path_prefix=f"{config_path.parent}/data/",
+        config_path=config_path,
+        verbose=True,
+        **kwargs,
+    )
+
+
+def edit_spell(config_path: Path, file_name: str, **values) -> None:
+    path = config_path.parent / "data" / file_name
+    spell = json.loads(path.read_text(encoding="utf-8"))
+    path.write_text(
+        json.dumps({**spell, **values}, ensure_ascii=False), encoding="utf-8"
+    )
+
+
+def test_validated_spells_arent_validated_again(config_path, capsys):
+    get_asserted_spells_df(config_path)
+    assert "3 spells to validate." in capsys.readouterr().out
+    assert (config_path.parent / VALIDATION_CACHE_FILE_NAME).exists()
+
+    get_asserted_spells_df(config_path)
+
+    assert "0 spells to validate." in capsys.readouterr().out
+
+
+def test_edited_spell_is_validated_again(config_path, capsys):
+    get_asserted_spells_df(config_path)
+    edit_spell(config_path, "Ajuda.json", mana=123)
+    capsys.readouterr()
+
+    get_asserted_spells_df(config_path)
+
+    assert "1 spells to validate." in capsys.readouterr().out
+
+
+def test_config_change_invalidates_the_cache(config_path, capsys):
+    get_asserted_spells_df(config_path)
+    with open(config_path, "a") as file:
+        file.write("\n")
+    capsys.readouterr()
+
+    get_asserted_spells_df(config_path)
+
+    assert "3 spells to validate." in capsys.readouterr().out
+
+
+def test_invalid_spell_isnt_trusted(config_path, capsys):
+    edit_spell(config_path, "Ajuda.json", mana=-1)
+    get_asserted_spells_df(config_path)
+    assert "Schema errors." in capsys.readouterr().out
+
+    get_asserted_spells_df(config_path, validate=False)
+
+    output = capsys.readouterr().out
+    assert "1 spells didn't pass the validation before" in output
+    assert "Ajuda" in output